@@ -0,0 +1,223 @@
+"""
+keyword_engine
+==============
+
+Moteur de règles par mots-clés, compilé en automate d'Aho-Corasick.
+
+Chaque règle associe une intention à des mots-clés, une priorité et
+éventuellement une réponse. Tous les mots-clés de toutes les règles sont
+compilés en un seul automate : le message est parcouru une seule fois,
+quel que soit le nombre de règles.
+
+Règles de correspondance :
+- le message et les mots-clés sont mis en minuscules et les accents sont
+  supprimés ("Épinards" correspond à "epinards") ;
+- un mot-clé ne correspond qu'à des mots entiers ("carte" ne correspond
+  pas à "cartes") ; un astérisque final autorise un suffixe quelconque
+  ("command*" correspond à "commande", "commander", "commandes") ;
+- si plusieurs règles correspondent, la priorité la plus élevée l'emporte,
+  puis la règle déclarée en premier.
+
+Le moteur ne dépend d'aucun modèle : il peut servir de chemin rapide
+devant le classificateur d'intentions de rendu3 (paramètre fast_path de
+classify_intent_with_preprocessing).
+
+Dépendances :
+- unicodedata (bibliothèque standard)
+
+Exemple d'utilisation :
+    >>> engine = KeywordEngine()
+    >>> engine.add_rule('menu', ['menu', 'carte'], priority=2, response="Voici notre menu")
+    >>> engine.add_rule('commande', ['command*'], priority=1)
+    >>> engine.match("Je voudrais la carte avant de commander")
+    'menu'
+    >>> engine.respond("Montrez-moi le MENU")
+    'Voici notre menu'
+"""
+
+import unicodedata
+from collections import deque
+
+
+def fold(text):
+    """
+    Met un texte en minuscules et supprime ses accents.
+
+    Args:
+        text (str): Le texte à normaliser
+
+    Returns:
+        str: Le texte normalisé
+    """
+    decomposed = unicodedata.normalize('NFD', text.lower())
+    return ''.join(char for char in decomposed if unicodedata.category(char) != 'Mn')
+
+
+class KeywordRule:
+    """
+    Règle du moteur.
+
+    Attributs:
+        name (str): Intention associée.
+        keywords (list of str): Mots-clés (astérisque final : préfixe).
+        priority (int): Priorité (la plus élevée l'emporte).
+        response (str): Réponse associée (optionnelle).
+        order (int): Rang de déclaration (départage les priorités égales).
+    """
+
+    def __init__(self, name, keywords, priority=0, response=None, order=0):
+        self.name = name
+        self.keywords = list(keywords)
+        self.priority = priority
+        self.response = response
+        self.order = order
+
+    def __repr__(self):
+        return f"KeywordRule({self.name!r}, {self.keywords!r}, priority={self.priority})"
+
+
+class KeywordEngine:
+    """
+    Moteur de règles par mots-clés (automate d'Aho-Corasick).
+
+    Attributs:
+        rules (list of KeywordRule): Règles, dans l'ordre de déclaration.
+    """
+
+    def __init__(self, rules=()):
+        """
+        Initialise le moteur.
+
+        Args:
+            rules (iterable): Règles initiales, sous forme de dictionnaires
+                {'name', 'keywords', 'priority', 'response'}
+        """
+        self.rules = []
+        self._compiled = False
+        for rule in rules:
+            self.add_rule(**rule)
+
+    def add_rule(self, name, keywords, priority=0, response=None):
+        """
+        Ajoute une règle (l'automate sera recompilé au prochain appel).
+
+        Args:
+            name (str): Intention associée
+            keywords (list of str): Mots-clés ; un astérisque final accepte un suffixe
+            priority (int): Priorité de la règle
+            response (str): Réponse retournée par respond()
+
+        Returns:
+            KeywordRule: La règle ajoutée
+        """
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        rule = KeywordRule(name, keywords, priority, response, order=len(self.rules))
+        self.rules.append(rule)
+        self._compiled = False
+        return rule
+
+    def compile(self):
+        """Construit l'automate (trie, liens d'échec et sorties) à partir des règles."""
+        # Chaque état : transitions, lien d'échec, sorties (longueur, préfixe, règle)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for rule in self.rules:
+            for keyword in rule.keywords:
+                prefix = keyword.endswith('*')
+                pattern = fold(keyword.rstrip('*')).strip()
+                if not pattern:
+                    raise ValueError(f"Mot-clé vide dans la règle {rule.name!r}")
+                state = 0
+                for char in pattern:
+                    following = self._goto[state].get(char)
+                    if following is None:
+                        following = len(self._goto)
+                        self._goto[state][char] = following
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._output.append([])
+                    state = following
+                self._output[state].append((len(pattern), prefix, rule))
+
+        # Parcours en largeur : lien d'échec = plus long suffixe propre présent dans le trie
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in self._goto[state].items():
+                queue.append(following)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[following] = self._goto[fallback].get(char, 0)
+                self._output[following] = self._output[following] + self._output[self._fail[following]]
+        self._compiled = True
+
+    def find_all(self, message):
+        """
+        Trouve toutes les occurrences de mots-clés, en un seul parcours.
+
+        Args:
+            message (str): Le message utilisateur
+
+        Returns:
+            list of tuple: (début, fin, règle) dans le message normalisé
+        """
+        if not self._compiled:
+            self.compile()
+        text = fold(message)
+        goto, fail, output = self._goto, self._fail, self._output
+        matches = []
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, prefix, rule in output[state]:
+                start = end - length
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if not prefix and end < len(text) and text[end].isalnum():
+                    continue
+                matches.append((start, end, rule))
+        return matches
+
+    def best_rule(self, message):
+        """
+        Retourne la règle retenue pour un message.
+
+        Returns:
+            KeywordRule: Règle de plus haute priorité (None si aucune ne correspond)
+        """
+        best = None
+        for _, _, rule in self.find_all(message):
+            if best is None or (rule.priority, -rule.order) > (best.priority, -best.order):
+                best = rule
+        return best
+
+    def match(self, message):
+        """
+        Retourne l'intention retenue pour un message.
+
+        Args:
+            message (str): Le message utilisateur
+
+        Returns:
+            str: Nom de la règle (None si aucune ne correspond)
+        """
+        rule = self.best_rule(message)
+        return rule.name if rule is not None else None
+
+    def respond(self, message):
+        """
+        Retourne la réponse de la règle retenue.
+
+        Args:
+            message (str): Le message utilisateur
+
+        Returns:
+            str: Réponse (None si aucune règle ne correspond)
+        """
+        rule = self.best_rule(message)
+        return rule.response if rule is not None else None
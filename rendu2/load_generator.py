@@ -0,0 +1,130 @@
+"""
+load_generator
+==============
+
+Générateur de charge pour le serveur TCP du Pizza Bot (server.py).
+
+Ouvre --sessions sessions, dont au plus --concurrency simultanées. Chaque
+session lit le message d'accueil, envoie --messages messages tirés d'une
+liste de phrases types, puis 'quit'. Le script affiche le débit (sessions
+et messages par seconde) et les percentiles de latence des réponses.
+
+Si --port n'est pas fourni, un serveur est lancé dans le même processus.
+
+Exemple d'utilisation :
+    $ python load_generator.py --sessions 5000 --concurrency 1000 --messages 5
+    $ python load_generator.py --port 8765 --sessions 20000 --concurrency 2000
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import time
+
+PHRASES = [
+    "Bonjour !",
+    "Je voudrais voir la carte",
+    "Quels sont vos horaires d'ouverture ?",
+    "Je veux commander une pizza",
+    "Vous avez un menu enfant ?",
+    "C'est ouvert le dimanche ?",
+    "Une Regina s'il vous plaît",
+    "salut",
+]
+
+
+def percentile(values, q):
+    """Percentile `q` (0-100) d'une liste triée (interpolation linéaire)."""
+    if not values:
+        return float('nan')
+    rank = (len(values) - 1) * q / 100.0
+    low, high = math.floor(rank), math.ceil(rank)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+async def run_session(host, port, messages, rng, latencies):
+    """Déroule une session complète ; les latences (secondes) sont ajoutées à `latencies`."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await reader.readline()
+        for message in [rng.choice(PHRASES) for _ in range(messages)] + ['quit']:
+            start = time.perf_counter()
+            writer.write((message + "\n").encode('utf-8'))
+            await writer.drain()
+            response = await reader.readline()
+            if not response:
+                raise ConnectionError("Connexion fermée par le serveur")
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run(host, port, sessions, concurrency, messages, seed):
+    """
+    Lance la charge.
+
+    Returns:
+        tuple: (durée totale, latences triées, nombre d'erreurs)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def worker(index):
+        nonlocal errors
+        async with semaphore:
+            try:
+                await run_session(host, port, messages, random.Random(seed + index), latencies)
+            except (OSError, asyncio.IncompleteReadError):
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(sessions)))
+    return time.perf_counter() - start, sorted(latencies), errors
+
+
+async def main_async(args):
+    server = chat = None
+    host, port = args.host, args.port
+    if port is None:
+        from server import ChatServer
+        chat = ChatServer(max_sessions=args.concurrency * 2)
+        server = await chat.start(host, 0)
+        port = server.sockets[0].getsockname()[1]
+    try:
+        elapsed, latencies, errors = await run(host, port, args.sessions, args.concurrency,
+                                               args.messages, args.seed)
+    finally:
+        if server is not None:
+            server.close()
+            await chat.stop()
+
+    completed = args.sessions - errors
+    print(f"\n⏱️  {args.sessions} sessions ({args.concurrency} simultanées, "
+          f"{args.messages} messages + quit) sur {host}:{port}")
+    print("-" * 60)
+    print(f"  Durée totale      : {elapsed:8.2f} s")
+    print(f"  Sessions/s        : {completed / elapsed:8.1f}")
+    print(f"  Messages/s        : {len(latencies) / elapsed:8.1f}")
+    print(f"  Erreurs           : {errors:8d}")
+    for q in (50, 95, 99):
+        print(f"  {f'Latence p{q}':18}: {percentile(latencies, q) * 1000:8.2f} ms")
+    if latencies:
+        print(f"  Latence max       : {latencies[-1] * 1000:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=None, help="Port du serveur (défaut: serveur intégré)")
+    parser.add_argument('--sessions', type=int, default=2000, help="Nombre total de sessions")
+    parser.add_argument('--concurrency', type=int, default=500, help="Sessions simultanées")
+    parser.add_argument('--messages', type=int, default=5, help="Messages par session (hors 'quit')")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from keyword_engine import KeywordEngine
+
 def interface_chatbot():
     """Interface interactive pour le chatbot pizzeria"""
     print("=" * 50)
@@ -31,20 +33,23 @@ def interface_chatbot():
         except Exception as e:
             print(f"Bot: Désolé, une erreur s'est produite : {e}")
 
+# Règles du chatbot : la priorité la plus élevée l'emporte quand plusieurs règles correspondent
+REGLES_PIZZERIA = [
+    {'name': 'salutation', 'keywords': ['bonjour', 'salut'], 'priority': 4,
+     'response': "Bonjour ! Bienvenue chez Pizza Bot. Comment puis-je vous aider ?"},
+    {'name': 'menu', 'keywords': ['menu', 'menus', 'carte', 'cartes'], 'priority': 3,
+     'response': "Voici notre menu : Margherita (12€), Regina (14€), Calzone (16€)..."},
+    {'name': 'horaires', 'keywords': ['horaire*', 'ouverture*'], 'priority': 2,
+     'response': "Nous sommes ouverts du lundi au samedi de 11h à 22h."},
+    {'name': 'commande', 'keywords': ['command*'], 'priority': 1,
+     'response': "Pour passer une commande, veuillez nous appeler au 01 23 45 67 89."},
+]
+
+moteur = KeywordEngine(REGLES_PIZZERIA)
+
 def chatbot_pizzeria(message):
-    message = message.lower()
-    
-    if "bonjour" in message or "salut" in message:
-        return "Bonjour ! Bienvenue chez Pizza Bot. Comment puis-je vous aider ?"
-    
-    elif "menu" in message or "carte" in message:
-        return "Voici notre menu : Margherita (12€), Regina (14€), Calzone (16€)..."
-    elif "horraire" in message or "ouverture" in message:
-        return "Nous sommes ouverts du lundi au samedi de 11h à 22h."
-    elif "commande" in message or "commander" in message:
-        return "Pour passer une commande, veuillez nous appeler au 01 23 45 67 89."
-    elif "menu" in message:
-        return "Notre menu comprend : Margherita (12€), Regina (14€), Calzone (16€)..."
+    """Retourne la réponse de la règle correspondant au message (None si aucune)"""
+    return moteur.respond(message)
 
 # Lancer l'interface interactive si le script est exécuté directement
 if __name__ == "__main__":
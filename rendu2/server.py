@@ -0,0 +1,248 @@
+"""
+server
+======
+
+Mode serveur du Pizza Bot : sessions concurrentes sur un protocole TCP ligne à ligne.
+
+Chaque connexion est une session : le client envoie une ligne UTF-8 par
+message et reçoit une ligne de réponse, celle de la règle retenue par le
+moteur de chatbot_pizzeria (un seul parcours de l'automate par message).
+Comme dans interface_chatbot, 'quit', 'exit', 'quitter' ou 'sortir'
+terminent la session.
+
+Le serveur est conçu pour des milliers de sessions simultanées :
+- état par session (Session) : nombre de messages, dernière intention,
+  dates de début et de dernière activité ;
+- contre-pression : chaque réponse attend writer.drain(), un client qui ne
+  lit pas ses réponses suspend donc sa propre session sans accumuler de
+  données en mémoire ; les lignes trop longues et les connexions au-delà
+  de --max-sessions sont refusées ;
+- éviction : une tâche de fond ferme les sessions inactives depuis plus de
+  --idle-timeout secondes.
+
+Dépendances :
+- asyncio (bibliothèque standard)
+- rendu2, keyword_engine
+
+Exemple d'utilisation :
+    $ python server.py --port 8765
+    $ nc 127.0.0.1 8765
+    $ python load_generator.py --sessions 5000 --concurrency 1000
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import time
+
+from rendu2 import moteur
+
+logger = logging.getLogger(__name__)
+
+COMMANDES_SORTIE = ('quit', 'exit', 'quitter', 'sortir')
+
+MESSAGE_ACCUEIL = "Bienvenue chez Pizza Bot ! 🍕 Tapez 'quit' pour quitter."
+MESSAGE_VIDE = "Pouvez-vous répéter ? Je n'ai rien entendu."
+MESSAGE_INCOMPRIS = "Désolé, je n'ai pas compris. Essayez : menu, horaires, commande."
+MESSAGE_AU_REVOIR = "Merci de votre visite ! À bientôt chez Pizza Bot ! 🍕"
+MESSAGE_COMPLET = "Serveur complet, veuillez réessayer plus tard."
+MESSAGE_TROP_LONG = "Message trop long, session fermée."
+MESSAGE_EXPIRE = "Session expirée après inactivité. À bientôt !"
+
+
+class Session:
+    """
+    État d'une session client.
+
+    Attributs:
+        id (int): Identifiant de la session.
+        messages (int): Nombre de messages reçus.
+        last_intent (str): Dernière intention reconnue (None si aucune).
+        started_at (float): Début de la session (time.monotonic).
+        last_seen (float): Dernière activité (time.monotonic).
+    """
+
+    __slots__ = ('id', 'writer', 'messages', 'last_intent', 'started_at', 'last_seen', 'evicted')
+
+    def __init__(self, session_id, writer):
+        self.id = session_id
+        self.writer = writer
+        self.messages = 0
+        self.last_intent = None
+        self.started_at = self.last_seen = time.monotonic()
+        self.evicted = False
+
+    def reply(self, message):
+        """
+        Calcule la réponse à un message et met à jour l'état de la session.
+
+        Args:
+            message (str): Message reçu (sans fin de ligne)
+
+        Returns:
+            tuple: (réponse, True si la session doit être fermée)
+        """
+        self.messages += 1
+        self.last_seen = time.monotonic()
+        if message.lower() in COMMANDES_SORTIE:
+            return MESSAGE_AU_REVOIR, True
+        if not message:
+            return MESSAGE_VIDE, False
+        # Un seul parcours de l'automate : intention et réponse viennent de la même règle
+        rule = moteur.best_rule(message)
+        if rule is None:
+            self.last_intent = None
+            return MESSAGE_INCOMPRIS, False
+        self.last_intent = rule.name
+        return rule.response or MESSAGE_INCOMPRIS, False
+
+
+class ChatServer:
+    """
+    Serveur de sessions Pizza Bot.
+
+    Attributs:
+        sessions (dict): Sessions ouvertes, par identifiant.
+        stats (dict): Compteurs (sessions acceptées, refusées, expirées, messages).
+    """
+
+    def __init__(self, max_sessions=10000, idle_timeout=300.0, max_line_length=1024):
+        """
+        Initialise le serveur.
+
+        Args:
+            max_sessions (int): Nombre maximal de sessions simultanées
+            idle_timeout (float): Inactivité (secondes) avant éviction d'une session
+            max_line_length (int): Longueur maximale d'une ligne (octets)
+        """
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.max_line_length = max_line_length
+        self.sessions = {}
+        self.stats = dict.fromkeys(('accepted', 'rejected', 'evicted', 'messages'), 0)
+        self._ids = itertools.count(1)
+        self._reaper = None
+
+    async def _send(self, writer, line):
+        writer.write((line + "\n").encode('utf-8'))
+        await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        """Boucle d'une session : une ligne reçue, une ligne de réponse."""
+        if len(self.sessions) >= self.max_sessions:
+            self.stats['rejected'] += 1
+            try:
+                await self._send(writer, MESSAGE_COMPLET)
+            except ConnectionError:
+                pass
+            writer.close()
+            return
+
+        session = Session(next(self._ids), writer)
+        self.sessions[session.id] = session
+        self.stats['accepted'] += 1
+        try:
+            await self._send(writer, MESSAGE_ACCUEIL)
+            while True:
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError as e:
+                    # Dernière ligne sans fin de ligne, ou connexion fermée
+                    if not e.partial:
+                        break
+                    line = e.partial
+                except asyncio.LimitOverrunError:
+                    await self._send(writer, MESSAGE_TROP_LONG)
+                    break
+                message = line.decode('utf-8', errors='replace').strip()
+                response, close = session.reply(message)
+                self.stats['messages'] += 1
+                await self._send(writer, response)
+                if close:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions.pop(session.id, None)
+            writer.close()
+
+    async def _evict_idle(self):
+        """Ferme périodiquement les sessions inactives depuis plus de idle_timeout."""
+        interval = max(0.05, self.idle_timeout / 4)
+        while True:
+            await asyncio.sleep(interval)
+            deadline = time.monotonic() - self.idle_timeout
+            for session in list(self.sessions.values()):
+                if session.last_seen < deadline and not session.evicted:
+                    session.evicted = True
+                    self.stats['evicted'] += 1
+                    # Pas de drain : un client inactif n'est pas attendu
+                    session.writer.write((MESSAGE_EXPIRE + "\n").encode('utf-8'))
+                    session.writer.close()
+
+    async def start(self, host='127.0.0.1', port=8765, backlog=1024):
+        """
+        Ouvre le port d'écoute et lance la tâche d'éviction.
+
+        Returns:
+            asyncio.Server: Le serveur asyncio
+        """
+        self._reaper = asyncio.create_task(self._evict_idle())
+        return await asyncio.start_server(self.handle_connection, host, port,
+                                          limit=self.max_line_length, backlog=backlog)
+
+    async def stop(self):
+        """Arrête la tâche d'éviction."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            try:
+                await self._reaper
+            except asyncio.CancelledError:
+                pass
+            self._reaper = None
+
+
+async def serve(host='127.0.0.1', port=8765, backlog=1024, **server_options):
+    """
+    Lance le serveur jusqu'à interruption.
+
+    Args:
+        host (str): Adresse d'écoute
+        port (int): Port d'écoute
+        backlog (int): File d'attente des connexions entrantes
+        **server_options: Options de ChatServer
+    """
+    chat = ChatServer(**server_options)
+    server = await chat.start(host, port, backlog)
+    logger.info("[ChatServer] En écoute sur %s:%d (max %d sessions)", host, port, chat.max_sessions)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await chat.stop()
+        logger.info("[ChatServer] Arrêt : %s", chat.stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur TCP multi-sessions du Pizza Bot (rendu2)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-sessions', type=int, default=10000, help="Sessions simultanées maximales")
+    parser.add_argument('--idle-timeout', type=float, default=300.0, help="Inactivité avant éviction (s)")
+    parser.add_argument('--max-line', type=int, default=1024, help="Longueur maximale d'un message (octets)")
+    parser.add_argument('--backlog', type=int, default=1024, help="File d'attente des connexions")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    try:
+        asyncio.run(serve(args.host, args.port, args.backlog,
+                          max_sessions=args.max_sessions,
+                          idle_timeout=args.idle_timeout,
+                          max_line_length=args.max_line))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -4,24 +4,36 @@ IntentClassifierEvaluator
 
 Module d'évaluation pour classificateur d'intentions de chatbot.
 
-Ce module fournit la classe IntentClassifierEvaluator, qui permet d'évaluer un modèle de classification d'intentions (scikit-learn compatible) sur un jeu de données français, avec split train/test ou Leave-One-Out, et tests obligatoires.
+Ce module fournit la classe IntentClassifierEvaluator, qui permet d'évaluer un modèle de classification d'intentions (scikit-learn compatible) sur un jeu de données français, avec split train/test, Leave-One-Out ou validation croisée
+stratifiée (éventuellement répétée), et tests obligatoires. Les plis de validation croisée
+peuvent être exécutés en parallèle (n_jobs) et les sorties du vectoriseur mises en cache
+sur disque (cache_dir, ou un dossier temporaire supprimé après l'évaluation).
 
 Dépendances :
 - scikit-learn
 - numpy
 - collections
+- joblib (cache du vectoriseur, via scikit-learn)
 
 Exemple d'utilisation :
     >>> evaluator = IntentClassifierEvaluator(clf, texts, labels)
     >>> evaluator.evaluate()
+    >>> evaluator.evaluate(cv='stratified', n_splits=5, n_jobs=-1)
     >>> evaluator.test_obligatoires()
 """
 
 from collections import Counter
+import contextlib
+import tempfile
 import numpy as np
-from sklearn.model_selection import train_test_split, LeaveOneOut, cross_val_score
+from sklearn.base import clone
+from sklearn.model_selection import (train_test_split, LeaveOneOut, StratifiedKFold,
+                                     RepeatedStratifiedKFold, cross_val_score)
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, classification_report, confusion_matrix
 
+# Stratégies de validation acceptées par evaluate()
+CV_STRATEGIES = ('auto', 'split', 'loo', 'stratified', 'repeated')
+
 class IntentClassifierEvaluator:
     """
     Classe utilitaire pour évaluer un classificateur d'intentions (IntentClassifier)
@@ -42,7 +54,29 @@ class IntentClassifierEvaluator:
         self.texts = texts
         self.labels = labels
 
-    def evaluate(self):
+    def evaluate(self, cv='auto', n_splits=5, n_repeats=3, n_jobs=None, cache_dir=None, random_state=42):
+        """
+        Évalue le classificateur sur le dataset.
+
+        Args:
+            cv (str): Stratégie de validation :
+                - 'auto' : split 80/20 si le dataset le permet, sinon validation
+                  croisée stratifiée si chaque classe a au moins `n_splits`
+                  exemples, sinon Leave-One-Out ;
+                - 'split' : split train/test stratifié 80/20 ;
+                - 'loo' : Leave-One-Out ;
+                - 'stratified' : StratifiedKFold à `n_splits` plis ;
+                - 'repeated' : RepeatedStratifiedKFold (`n_splits` x `n_repeats`).
+            n_splits (int): Nombre de plis pour 'stratified' et 'repeated'
+            n_repeats (int): Nombre de répétitions pour 'repeated'
+            n_jobs (int): Nombre de plis évalués en parallèle (-1 : tous les cœurs)
+            cache_dir (str): Dossier de cache joblib des sorties du vectoriseur
+                par pli, conservé entre les appels (None : dossier temporaire
+                supprimé à la fin de l'évaluation)
+            random_state (int): Graine des découpages
+        """
+        if cv not in CV_STRATEGIES:
+            raise ValueError(f"Stratégie de validation inconnue: {cv!r} (attendu: {', '.join(CV_STRATEGIES)})")
         print("\n[IntentClassifierEvaluator] Début de l'évaluation...")
         print(f"[IntentClassifierEvaluator] Nombre total d'exemples: {len(self.texts)}")
         print(f"[IntentClassifierEvaluator] Nombre d'intentions: {len(set(self.labels))}")
@@ -64,18 +98,40 @@ class IntentClassifierEvaluator:
             print("❌ Aucune donnée d'entraînement trouvée dans le dataset!")
             return
 
-        if test_size < total_classes or min_samples_per_class < 2:
+        if cv == 'auto' and (test_size < total_classes or min_samples_per_class < 2):
             print("\n⚠️  Dataset trop petit ou test set trop petit pour un split train/test stratifié.")
             print(f"   - Total d'exemples: {len(self.texts)}")
             print(f"   - Nombre de classes: {total_classes}")
             print(f"   - Minimum d'exemples par classe: {min_samples_per_class}")
             print(f"   - Taille du test set calculée: {test_size}")
-            print(f"   - Utilisation de validation croisée Leave-One-Out.")
-            loo = LeaveOneOut()
-            print("[IntentClassifierEvaluator] Lancement de la validation croisée Leave-One-Out...")
-            scores = cross_val_score(self.classifier.pipeline, np.array(self.texts), np.array(self.labels), cv=loo, scoring='accuracy')
-            print(f"[IntentClassifierEvaluator] Résultats Leave-One-Out: scores={scores}")
-            print(f"Précision Leave-One-Out: {scores.mean():.2f} ± {scores.std():.2f}")
+            if min_samples_per_class >= n_splits:
+                print(f"   - Utilisation de validation croisée stratifiée ({n_splits} plis).")
+                cv = 'stratified'
+            else:
+                print(f"   - Utilisation de validation croisée Leave-One-Out.")
+                cv = 'loo'
+
+        if cv in ('loo', 'stratified', 'repeated'):
+            if cv == 'loo':
+                name = "Leave-One-Out"
+                splitter = LeaveOneOut()
+            elif cv == 'stratified':
+                name = f"StratifiedKFold ({n_splits} plis)"
+                splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+            else:
+                name = f"RepeatedStratifiedKFold ({n_splits} plis x {n_repeats})"
+                splitter = RepeatedStratifiedKFold(n_splits=n_splits, n_repeats=n_repeats, random_state=random_state)
+            print(f"[IntentClassifierEvaluator] Lancement de la validation croisée {name} (n_jobs={n_jobs})...")
+            if cache_dir is None:
+                cache = tempfile.TemporaryDirectory(prefix='intent_cv_', ignore_cleanup_errors=True)
+            else:
+                cache = contextlib.nullcontext(cache_dir)
+            with cache as memory_dir:
+                scores = cross_val_score(self._cv_estimator(memory_dir),
+                                         np.array(self.texts), np.array(self.labels),
+                                         cv=splitter, scoring='accuracy', n_jobs=n_jobs)
+            print(f"[IntentClassifierEvaluator] Résultats {name}: scores={scores}")
+            print(f"Précision {name}: {scores.mean():.2f} ± {scores.std():.2f}")
             if scores.mean() > 0.8:
                 print(f"🎯 Objectif atteint ! Précision > 80%")
             else:
@@ -85,9 +141,12 @@ class IntentClassifierEvaluator:
             X_train, X_test, y_train, y_test = train_test_split(
                 self.texts, self.labels, test_size=0.2, random_state=42, stratify=self.labels)
             print(f"[IntentClassifierEvaluator] Taille train: {len(X_train)}, test: {len(X_test)}")
-            self.classifier.train(X_train, y_train)
+            # Entraîner une copie : le classificateur évalué (éventuellement
+            # chargé depuis le disque) n'est pas modifié
+            model = clone(self.classifier.pipeline)
+            model.fit(X_train, y_train)
             print("[IntentClassifierEvaluator] Prédiction sur le test set...")
-            y_pred = self.classifier.pipeline.predict(X_test)
+            y_pred = model.predict(X_test)
             acc = accuracy_score(y_test, y_pred)
             prec = precision_score(y_test, y_pred, average='weighted', zero_division=0)
             rec = recall_score(y_test, y_pred, average='weighted', zero_division=0)
@@ -107,13 +166,46 @@ class IntentClassifierEvaluator:
         print("\n[IntentClassifierEvaluator] Évaluation terminée!")
         print("=" * 60)
 
-    def test_obligatoires(self):
+    def _cv_estimator(self, cache_dir=None):
+        """
+        Prépare une copie non entraînée du pipeline pour la validation croisée.
+
+        Le score d'exactitude n'utilise que predict : la calibration des
+        probabilités de SVC (probability=True, une validation croisée interne
+        par entraînement) est désactivée sur la copie. Avec `cache_dir`, les
+        sorties du vectoriseur sont mises en cache par pli (Pipeline.memory).
+
+        Args:
+            cache_dir (str): Dossier de cache joblib (None : pas de cache)
+
+        Returns:
+            Pipeline: Copie du pipeline à évaluer
+        """
+        model = clone(self.classifier.pipeline)
+        if 'classifier__probability' in model.get_params():
+            model.set_params(classifier__probability=False)
+        if cache_dir is not None:
+            model.set_params(memory=cache_dir)
+        return model
+
+    def test_obligatoires(self, retrain=True):
+        """
+        Exécute les tests obligatoires sur des phrases personnalisées.
+        
+        Args:
+            retrain (bool): Réentraîner le classificateur sur tout le dataset
+                avant les tests. False réutilise le modèle déjà entraîné ou
+                chargé (il est tout de même entraîné s'il ne l'est pas).
+        """
         print("\n[IntentClassifierEvaluator] Lancement des tests obligatoires...")
         print(f"[IntentClassifierEvaluator] Nombre d'exemples d'entraînement: {len(self.texts)}")
         print(f"[IntentClassifierEvaluator] Nombre d'intentions: {len(set(self.labels))}")
-        # Toujours entraîner sur tout le dataset avant les tests obligatoires
-        self.classifier.train(self.texts, self.labels)
-        print("[IntentClassifierEvaluator] Classifieur entraîné sur tout le dataset pour les tests obligatoires.")
+        # Entraîner sur tout le dataset avant les tests obligatoires
+        if retrain or not self.classifier.is_fitted:
+            self.classifier.train(self.texts, self.labels)
+            print("[IntentClassifierEvaluator] Classifieur entraîné sur tout le dataset pour les tests obligatoires.")
+        else:
+            print("[IntentClassifierEvaluator] Utilisation du classifieur déjà entraîné pour les tests obligatoires.")
         print("\n🧪 Tests obligatoires sur des phrases personnalisées :")
         test_phrases = [
             # salutation
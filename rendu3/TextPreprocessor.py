@@ -8,8 +8,8 @@ Ce module fournit la classe TextPreprocessor, qui permet de nettoyer, normaliser
 
 Dépendances :
 - nltk
-- re
-- string
+- text_normalizer
+- instrumentation
 
 Exemple d'utilisation :
     >>> preproc = TextPreprocessor(language='french')
@@ -17,12 +17,24 @@ Exemple d'utilisation :
     >>> print(result['stemmed_tokens'])
 
 """
-import nltk
-import re
-import string
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import SnowballStemmer
+import collections
+import functools
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import instrumentation
+from model_registry import ensure_nltk_resources, get_stemmer, get_stopwords
+from text_normalizer import TextNormalizer
+
+logger = logging.getLogger(__name__)
+
+# Préprocesseur propre à chaque processus worker de iter_batch(n_jobs > 1)
+_worker_preprocessor = None
+
+# Étapes disponibles dans preprocess_message, dans l'ordre du pipeline
+STAGES = ('original', 'tokens', 'normalized', 'normalized_tokens', 'filtered_tokens', 'stemmed_tokens')
 
 class TextPreprocessor:
     """
@@ -34,49 +46,75 @@ class TextPreprocessor:
     Attributs:
         language (str): Langue utilisée pour le traitement.
         stemmer (SnowballStemmer): Stemmer NLTK pour la langue choisie.
-        stop_words (set): Ensemble des mots vides pour la langue.
+        stop_words (frozenset): Ensemble des mots vides pour la langue.
+        normalizer (TextNormalizer): Normaliseur précompilé du texte.
+        stem_cache_size (int): Taille maximale du cache LRU de stemming.
+    
+    Le stemmer et les mots vides proviennent de model_registry et sont
+    partagés par toutes les instances d'un même processus. NLTK n'est
+    importé qu'à la première étape qui en a besoin (tokenisation, mots
+    vides, stemming) : normalize_text seul ne le charge jamais.
     """
     
-    def __init__(self, language='french', download_resources=True):
+    def __init__(self, language='french', download_resources=True, fold_accents=False,
+                 stem_cache_size=4096):
         """
         Initialise le preprocesseur de texte.
         
         Args:
             language (str): Langue pour le traitement (défaut: 'french')
             download_resources (bool): Télécharger automatiquement les ressources NLTK
+                (vérifiées à la première étape qui les utilise)
+            fold_accents (bool): Supprimer les accents lors de la normalisation
+            stem_cache_size (int): Nombre maximal de racines gardées en cache
+                (0 désactive le cache)
         """
-        print(f"[TextPreprocessor] Initialisation pour la langue: {language}")
+        logger.info("[TextPreprocessor] Initialisation pour la langue: %s", language)
         self.language = language
-        self.stemmer = SnowballStemmer(language)
-        self.stop_words = None
-        
-        if download_resources:
-            print("[TextPreprocessor] Téléchargement des ressources NLTK si nécessaire...")
-            self._download_nltk_resources()
-            
-        # Charger les stop words
-        try:
-            self.stop_words = set(stopwords.words(language))
-            print(f"[TextPreprocessor] Stop words chargés: {len(self.stop_words)} mots.")
-        except LookupError:
-            print(f"Attention: Stop words pour '{language}' non disponibles")
-            self.stop_words = set()
+        self.download_resources = download_resources
+        self.normalizer = TextNormalizer(fold_accents=fold_accents)
+        self.stem_cache_size = stem_cache_size
+        # Ressources NLTK chargées à la première utilisation
+        self._stemmer = None
+        self._stem_cache = None
+        self._stop_words = None
     
     def _download_nltk_resources(self):
         """
         Télécharge les ressources NLTK nécessaires (tokenizer, stopwords).
+        La vérification n'est faite qu'une fois par processus.
         """
-        resources = ['punkt', 'stopwords']
-        
-        for resource in resources:
+        if self.download_resources:
+            ensure_nltk_resources()
+    
+    @property
+    def stemmer(self):
+        """SnowballStemmer NLTK, chargé à la première utilisation."""
+        if self._stemmer is None:
+            self._stemmer = get_stemmer(self.language)
+        return self._stemmer
+    
+    @property
+    def _stem(self):
+        """Fonction de stemming avec cache LRU."""
+        if self._stem_cache is None:
+            # Le vocabulaire d'un chatbot est très répétitif : le stemming
+            # d'un mot déjà vu devient une simple recherche dans le cache.
+            self._stem_cache = functools.lru_cache(maxsize=self.stem_cache_size)(self.stemmer.stem)
+        return self._stem_cache
+    
+    @property
+    def stop_words(self):
+        """Mots vides de la langue, chargés à la première utilisation."""
+        if self._stop_words is None:
+            self._download_nltk_resources()
             try:
-                if resource == 'punkt':
-                    nltk.data.find('tokenizers/punkt')
-                elif resource == 'stopwords':
-                    nltk.data.find('corpora/stopwords')
+                self._stop_words = get_stopwords(self.language)
+                logger.info("[TextPreprocessor] Stop words chargés: %d mots.", len(self._stop_words))
             except LookupError:
-                print(f"Téléchargement de la ressource '{resource}'...")
-                nltk.download(resource)
+                logger.warning("Attention: Stop words pour '%s' non disponibles", self.language)
+                self._stop_words = frozenset()
+        return self._stop_words
     
     def tokenize_message(self, text):
         """
@@ -88,11 +126,13 @@ class TextPreprocessor:
         Returns:
             dict: Dictionnaire contenant les tokens de mots et phrases
         """
-        print(f"[TextPreprocessor] Tokenisation du message: '{text}'")
+        logger.debug("[TextPreprocessor] Tokenisation du message: '%s'", text)
+        self._download_nltk_resources()
+        from nltk.tokenize import sent_tokenize, word_tokenize
         words = word_tokenize(text, language=self.language)
         sentences = sent_tokenize(text, language=self.language)
-        print(f"[TextPreprocessor] Tokens (mots): {words}")
-        print(f"[TextPreprocessor] Tokens (phrases): {sentences}")
+        logger.debug("[TextPreprocessor] Tokens (mots): %s", words)
+        logger.debug("[TextPreprocessor] Tokens (phrases): %s", sentences)
         
         return {
             'words': words,
@@ -103,8 +143,9 @@ class TextPreprocessor:
         """
         Normalise le texte selon les consignes :
         - Conversion en minuscules
-        - Suppression de la ponctuation
-        - Suppression des espaces multiples
+        - Suppression de la ponctuation (ASCII et Unicode)
+        - Suppression des espaces multiples (y compris insécables)
+        - Suppression des accents si fold_accents est activé
         
         Args:
             text (str): Le texte à normaliser
@@ -112,21 +153,25 @@ class TextPreprocessor:
         Returns:
             str: Le texte normalisé
         """
-        print(f"[TextPreprocessor] Normalisation du texte: '{text}'")
-        # Conversion en minuscules
-        text = text.lower()
-        
-        # Suppression de la ponctuation
-        text = text.translate(str.maketrans('', '', string.punctuation))
+        logger.debug("[TextPreprocessor] Normalisation du texte: '%s'", text)
+        text = self.normalizer.normalize(text)
+        logger.debug("[TextPreprocessor] Texte normalisé: '%s'", text)
         
-        # Suppression des espaces multiples
-        text = re.sub(r'\s+', ' ', text)
+        return text
+    
+    def normalize_batch(self, texts):
+        """
+        Normalise une liste de textes en un seul passage.
         
-        # Suppression des espaces en début et fin
-        text = text.strip()
-        print(f"[TextPreprocessor] Texte normalisé: '{text}'")
+        Args:
+            texts (list): Liste des textes à normaliser
         
-        return text
+        Returns:
+            list: Liste des textes normalisés, dans le même ordre
+        """
+        texts = list(texts)
+        logger.debug("[TextPreprocessor] Normalisation batch de %d textes", len(texts))
+        return self.normalizer.normalize_many(texts)
     
     def remove_stopwords(self, tokens):
         """
@@ -138,13 +183,13 @@ class TextPreprocessor:
         Returns:
             list: Liste des tokens sans les mots vides
         """
-        print(f"[TextPreprocessor] Suppression des stopwords sur: {tokens}")
+        logger.debug("[TextPreprocessor] Suppression des stopwords sur: %s", tokens)
         if not self.stop_words:
             return tokens
             
         # Filtrer les tokens qui ne sont pas des mots vides
         filtered_tokens = [token for token in tokens if token.lower() not in self.stop_words]
-        print(f"[TextPreprocessor] Tokens sans stopwords: {filtered_tokens}")
+        logger.debug("[TextPreprocessor] Tokens sans stopwords: %s", filtered_tokens)
         
         return filtered_tokens
     
@@ -158,79 +203,243 @@ class TextPreprocessor:
         Returns:
             list: Liste des tokens racinés
         """
-        print(f"[TextPreprocessor] Stemming des tokens: {tokens}")
-        # Appliquer le stemming à chaque token
-        stemmed_tokens = [self.stemmer.stem(token) for token in tokens]
-        print(f"[TextPreprocessor] Tokens après stemming: {stemmed_tokens}")
+        logger.debug("[TextPreprocessor] Stemming des tokens: %s", tokens)
+        # Appliquer le stemming à chaque token (via le cache LRU)
+        stem = self._stem
+        stemmed_tokens = [stem(token) for token in tokens]
+        logger.debug("[TextPreprocessor] Tokens après stemming: %s", stemmed_tokens)
         
         return stemmed_tokens
     
-    def preprocess_message(self, text, verbose=True):
+    def warm_stem_cache(self, texts):
+        """
+        Préremplit le cache de stemming à partir d'un vocabulaire.
+        
+        Les textes sont normalisés et découpés, les mots vides sont
+        ignorés, puis chaque mot est raciné une fois.
+        
+        Args:
+            texts (iterable): Textes du dataset (ex. exemples de dataset.yaml)
+        
+        Returns:
+            int: Nombre de mots distincts racinés
+        """
+        vocabulary = set()
+        for normalized in self.normalize_batch(texts):
+            vocabulary.update(normalized.split())
+        vocabulary -= self.stop_words
+        stem = self._stem
+        for token in vocabulary:
+            stem(token)
+        logger.info("[TextPreprocessor] Cache de stemming préchargé: %d mots.", len(vocabulary))
+        return len(vocabulary)
+    
+    def stem_cache_info(self):
+        """
+        Retourne les statistiques du cache de stemming.
+        
+        Returns:
+            dict: hits, misses, taille maximale, taille courante et taux de succès
+        """
+        info = self._stem.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'maxsize': info.maxsize,
+            'currsize': info.currsize,
+            'hit_ratio': info.hits / lookups if lookups else 0.0
+        }
+    
+    def clear_stem_cache(self):
+        """Vide le cache de stemming et remet ses compteurs à zéro."""
+        self._stem.cache_clear()
+    
+    def preprocess_message(self, text, verbose=True, stages=None):
         """
         Fonction principale qui applique tout le preprocessing :
         tokenisation, normalisation, suppression des stopwords, stemming.
         
+        Seules les étapes nécessaires aux `stages` demandés sont exécutées :
+        par exemple stages=('stemmed_tokens',) ne fait ni découpage en
+        phrases ni tokenisation du texte brut, et une seule tokenisation
+        (celle du texte normalisé).
+        
         Args:
             text (str): Le message à préprocesser
             verbose (bool): Afficher les étapes de preprocessing
+            stages (iterable): Étapes à retourner, parmi STAGES
+                (None : toutes les étapes)
         
         Returns:
-            dict: Dictionnaire contenant toutes les étapes du preprocessing
+            dict: Dictionnaire contenant les étapes demandées du preprocessing
         """
+        if stages is None:
+            stages = STAGES
+        else:
+            stages = frozenset(stages)
+            unknown = stages.difference(STAGES)
+            if unknown:
+                raise ValueError(f"Étapes inconnues: {sorted(unknown)} (disponibles: {STAGES})")
+        # Dernière étape du pipeline à exécuter
+        last = max(STAGES.index(stage) for stage in stages) if stages else -1
+        result = {}
+        instrumentation.count('preprocess.messages')
+        
         if verbose:
             print(f"\n📝 Message original: '{text}'")
+        if 'original' in stages:
+            result['original'] = text
         
-        # 1. Tokenisation
-        tokens_data = self.tokenize_message(text)
-        if verbose:
-            print(f"🔤 Tokens (mots): {tokens_data['words']}")
-            print(f"📄 Tokens (phrases): {tokens_data['sentences']}")
+        # 1. Tokenisation (texte brut), uniquement si demandée
+        if 'tokens' in stages:
+            with instrumentation.span('preprocess.tokenize'):
+                tokens_data = self.tokenize_message(text)
+            if verbose:
+                print(f"🔤 Tokens (mots): {tokens_data['words']}")
+                print(f"📄 Tokens (phrases): {tokens_data['sentences']}")
+            result['tokens'] = tokens_data
         
         # 2. Normalisation
-        normalized_text = self.normalize_text(text)
-        if verbose:
-            print(f"🔄 Texte normalisé: '{normalized_text}'")
+        if last >= STAGES.index('normalized'):
+            with instrumentation.span('preprocess.normalize'):
+                normalized_text = self.normalize_text(text)
+            if verbose:
+                print(f"🔄 Texte normalisé: '{normalized_text}'")
+            if 'normalized' in stages:
+                result['normalized'] = normalized_text
         
         # 3. Tokenisation du texte normalisé
-        normalized_tokens = word_tokenize(normalized_text, language=self.language)
-        if verbose:
-            print(f"🔤 Tokens normalisés: {normalized_tokens}")
+        if last >= STAGES.index('normalized_tokens'):
+            with instrumentation.span('preprocess.normalized_tokens'):
+                self._download_nltk_resources()
+                from nltk.tokenize import word_tokenize
+                normalized_tokens = word_tokenize(normalized_text, language=self.language)
+            if verbose:
+                print(f"🔤 Tokens normalisés: {normalized_tokens}")
+            if 'normalized_tokens' in stages:
+                result['normalized_tokens'] = normalized_tokens
         
         # 4. Suppression des mots vides
-        filtered_tokens = self.remove_stopwords(normalized_tokens)
-        if verbose:
-            print(f"🚫 Sans mots vides: {filtered_tokens}")
+        if last >= STAGES.index('filtered_tokens'):
+            with instrumentation.span('preprocess.stopwords'):
+                filtered_tokens = self.remove_stopwords(normalized_tokens)
+            if verbose:
+                print(f"🚫 Sans mots vides: {filtered_tokens}")
+            if 'filtered_tokens' in stages:
+                result['filtered_tokens'] = filtered_tokens
         
         # 5. Stemming
-        stemmed_tokens = self.stem_tokens(filtered_tokens)
-        if verbose:
-            print(f"🌱 Après stemming: {stemmed_tokens}")
+        if last >= STAGES.index('stemmed_tokens'):
+            with instrumentation.span('preprocess.stem'):
+                stemmed_tokens = self.stem_tokens(filtered_tokens)
+            if verbose:
+                print(f"🌱 Après stemming: {stemmed_tokens}")
+            result['stemmed_tokens'] = stemmed_tokens
         
-        print(f"[TextPreprocessor] Préprocessing terminé pour: '{text}'")
-        return {
-            'original': text,
-            'tokens': tokens_data,
-            'normalized': normalized_text,
-            'normalized_tokens': normalized_tokens,
-            'filtered_tokens': filtered_tokens,
-            'stemmed_tokens': stemmed_tokens
-        }
+        logger.debug("[TextPreprocessor] Préprocessing terminé pour: '%s'", text)
+        return result
+    
+    def iter_batch(self, texts, minimal=False, n_jobs=1, chunksize=256, stages=None):
+        """
+        Traite un flux de textes et produit les résultats au fur et à mesure.
+        
+        La mémoire reste constante quelle que soit la taille de l'entrée :
+        les textes sont lus par morceaux et, en mode parallèle, seuls
+        2 * n_jobs morceaux sont en cours de traitement à la fois.
+        
+        Args:
+            texts (iterable): Textes à traiter (liste, fichier, générateur…)
+            minimal (bool): Ne retourner que les tokens racinés
+                (équivalent à stages=('stemmed_tokens',))
+            n_jobs (int): Nombre de processus (-1 ou None : tous les cœurs)
+            chunksize (int): Nombre de textes envoyés à un worker à la fois
+            stages (iterable): Étapes à retourner, parmi STAGES
+        
+        Yields:
+            dict: Résultat de preprocessing, dans l'ordre d'entrée
+        
+        Raises:
+            ValueError: Si n_jobs n'est ni un entier positif, ni -1, ni None
+                (levée dès l'appel, avant l'itération)
+        """
+        if minimal:
+            stages = ('stemmed_tokens',)
+        # Validation immédiate : le générateur ne s'exécute qu'à la première itération
+        return self._iter_batch(texts, _resolve_n_jobs(n_jobs), chunksize, stages)
+    
+    def _iter_batch(self, texts, n_jobs, chunksize, stages):
+        if n_jobs == 1:
+            for text in texts:
+                yield self.preprocess_message(text, verbose=False, stages=stages)
+            return
+        
+        initargs = (self.language, self.normalizer.fold_accents, self.stem_cache_size)
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=initargs) as executor:
+            pending = collections.deque()
+            for chunk in _chunks(texts, chunksize):
+                pending.append(executor.submit(_preprocess_chunk, chunk, stages))
+                if len(pending) >= 2 * n_jobs:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
     
-    def process_batch(self, texts, verbose=False):
+    def process_batch(self, texts, verbose=False, minimal=False, n_jobs=1, chunksize=256, stages=None):
         """
         Traite une liste de textes en lot (batch).
         
         Args:
             texts (list): Liste des textes à traiter
             verbose (bool): Afficher les détails pour chaque texte
+                (uniquement en mode séquentiel)
+            minimal (bool): Ne retourner que les tokens racinés
+            n_jobs (int): Nombre de processus (-1 ou None : tous les cœurs)
+            chunksize (int): Nombre de textes envoyés à un worker à la fois
+            stages (iterable): Étapes à retourner, parmi STAGES
         
         Returns:
             list: Liste des résultats de preprocessing
         """
-        print(f"[TextPreprocessor] Traitement batch de {len(texts)} textes...")
-        results = []
-        for text in texts:
-            result = self.preprocess_message(text, verbose=verbose)
-            results.append(result)
-        print(f"[TextPreprocessor] Batch terminé.")
+        logger.info("[TextPreprocessor] Traitement batch de %d textes...", len(texts))
+        n_jobs = _resolve_n_jobs(n_jobs)
+        if verbose and n_jobs == 1:
+            if minimal:
+                stages = ('stemmed_tokens',)
+            results = [self.preprocess_message(text, verbose=True, stages=stages) for text in texts]
+        else:
+            results = list(self.iter_batch(texts, minimal=minimal, n_jobs=n_jobs,
+                                           chunksize=chunksize, stages=stages))
+        logger.info("[TextPreprocessor] Batch terminé.")
         return results
+
+
+def _resolve_n_jobs(n_jobs):
+    """Convertit n_jobs en nombre de processus (-1 ou None : tous les cœurs)."""
+    if n_jobs is None or n_jobs == -1:
+        return os.cpu_count() or 1
+    if isinstance(n_jobs, bool) or not isinstance(n_jobs, int) or n_jobs < 1:
+        raise ValueError(f"n_jobs invalide: {n_jobs!r} (entier positif, -1 ou None attendu)")
+    return n_jobs
+
+
+def _chunks(iterable, size):
+    """Découpe un itérable en listes de `size` éléments au plus."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _init_worker(language, fold_accents, stem_cache_size):
+    """Crée le préprocesseur d'un processus worker."""
+    global _worker_preprocessor
+    _worker_preprocessor = TextPreprocessor(language, download_resources=False,
+                                            fold_accents=fold_accents,
+                                            stem_cache_size=stem_cache_size)
+
+
+def _preprocess_chunk(chunk, stages):
+    """Traite un morceau de textes dans un processus worker."""
+    return [_worker_preprocessor.preprocess_message(text, verbose=False, stages=stages) for text in chunk]
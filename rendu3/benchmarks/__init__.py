@@ -0,0 +1,9 @@
+"""
+benchmarks
+==========
+
+Scripts de mesure de performance du pipeline rendu3.
+
+Chaque script s'exécute depuis le dossier rendu3 :
+    $ python -m benchmarks.nlp_batch
+"""
@@ -0,0 +1,58 @@
+"""
+backends
+========
+
+Compare les classificateurs disponibles pour IntentClassifier sur
+dataset.yaml (split stratifié 80/20) :
+- temps d'entraînement ;
+- latence de prédiction d'un message (p50 / p99, predict_proba) ;
+- précision (accuracy) sur le test set.
+
+Exemple d'utilisation :
+    $ python -m benchmarks.backends
+"""
+
+import argparse
+import time
+
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+
+from benchmarks.common import load_corpus, measure, percentile
+from intent_classifier import CLASSIFIER_BACKENDS, IntentClassifier
+
+
+def predict_latencies(classifier, texts, repeat):
+    values = []
+    for _ in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            classifier.predict_proba(text)
+            values.append(time.perf_counter() - start)
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20, help="Passages sur le test set pour la latence")
+    parser.add_argument('--backends', nargs='*', default=sorted(CLASSIFIER_BACKENDS))
+    args = parser.parse_args()
+
+    texts, labels = load_corpus()
+    X_train, X_test, y_train, y_test = train_test_split(
+        texts, labels, test_size=0.2, random_state=42, stratify=labels)
+
+    print(f"\n⏱️  Backends IntentClassifier (train: {len(X_train)}, test: {len(X_test)})")
+    print("-" * 80)
+    print(f"  {'backend':12} | {'fit (ms)':>10} | {'p50 (µs)':>10} | {'p99 (µs)':>10} | {'accuracy':>8}")
+    for backend in args.backends:
+        classifier = IntentClassifier(backend=backend)
+        _, fit_time = measure(classifier.train, X_train, y_train)
+        latencies = predict_latencies(classifier, X_test, args.repeat)
+        accuracy = accuracy_score(y_test, classifier.predict_batch(X_test))
+        print(f"  {backend:12} | {fit_time * 1e3:10.1f} | {percentile(latencies, 50) * 1e6:10.1f} | "
+              f"{percentile(latencies, 99) * 1e6:10.1f} | {accuracy:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
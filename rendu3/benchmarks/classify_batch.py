@@ -0,0 +1,54 @@
+"""
+classify_batch
+==============
+
+Débit de IntentClassifier.classify_batch selon la taille de lot (1 à 4096),
+comparé à la boucle historique predict + predict_proba message par message
+(deux passages TF-IDF par message).
+
+Exemple d'utilisation :
+    $ python -m benchmarks.classify_batch --size 8192
+"""
+
+import argparse
+
+from benchmarks.common import load_corpus, measure, print_throughput, scale_corpus
+from intent_classifier import IntentClassifier
+
+BATCH_SIZES = (1, 4, 16, 64, 256, 1024, 4096)
+
+
+def run_loop(classifier, texts):
+    for text in texts:
+        classifier.predict(text)
+        classifier.predict_proba(text)
+    return len(texts)
+
+
+def run_batches(classifier, texts, batch_size):
+    for start in range(0, len(texts), batch_size):
+        classifier.classify_batch(texts[start:start + batch_size])
+    return len(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=8192, help="Nombre de messages classés")
+    args = parser.parse_args()
+
+    base_texts, labels = load_corpus()
+    texts = scale_corpus(base_texts, args.size)
+    classifier = IntentClassifier()
+    classifier.train(base_texts, labels)
+
+    print(f"\n⏱️  Classification de {len(texts)} messages")
+    print("-" * 80)
+    count, elapsed = measure(run_loop, classifier, texts)
+    print_throughput("predict + predict_proba", count, elapsed)
+    for batch_size in BATCH_SIZES:
+        count, elapsed = measure(run_batches, classifier, texts, batch_size)
+        print_throughput(f"classify_batch (lot={batch_size})", count, elapsed)
+
+
+if __name__ == "__main__":
+    main()
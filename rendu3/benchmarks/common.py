@@ -0,0 +1,99 @@
+"""
+common
+======
+
+Utilitaires partagés par les scripts de benchmark : chargement du corpus
+dataset.yaml, mise à l'échelle et calcul de statistiques de latence.
+"""
+
+import math
+import os
+import sys
+import time
+
+import yaml
+
+RENDU3_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_PATH = os.path.join(RENDU3_DIR, 'dataset.yaml')
+
+# Permet d'importer les modules de rendu3 quel que soit le dossier courant
+if RENDU3_DIR not in sys.path:
+    sys.path.insert(0, RENDU3_DIR)
+
+
+def load_corpus(path=DATASET_PATH):
+    """
+    Charge le corpus d'entraînement depuis le fichier YAML.
+
+    Args:
+        path (str): Chemin du dataset YAML
+
+    Returns:
+        tuple: (textes, labels)
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        data = yaml.safe_load(file) or {}
+    texts = []
+    labels = []
+    for intention, examples in data.get('intentions', {}).items():
+        for example in examples:
+            texts.append(example)
+            labels.append(intention)
+    return texts, labels
+
+
+def scale_corpus(texts, size):
+    """
+    Répète le corpus jusqu'à obtenir `size` textes.
+
+    Args:
+        texts (list of str): Corpus de base
+        size (int): Nombre de textes souhaité
+
+    Returns:
+        list of str: Corpus mis à l'échelle
+    """
+    if not texts:
+        return []
+    repeats = math.ceil(size / len(texts))
+    return (texts * repeats)[:size]
+
+
+def percentile(values, q):
+    """
+    Calcule le percentile `q` (0-100) d'une liste de valeurs.
+
+    Args:
+        values (list of float): Valeurs mesurées
+        q (float): Percentile souhaité
+
+    Returns:
+        float: Valeur du percentile (interpolation linéaire)
+    """
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return ordered[int(rank)]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def measure(func, *args, **kwargs):
+    """
+    Exécute une fonction et mesure sa durée.
+
+    Returns:
+        tuple: (résultat, durée en secondes)
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def print_throughput(name, count, elapsed):
+    """Affiche le débit d'une mesure."""
+    rate = count / elapsed if elapsed > 0 else float('inf')
+    print(f"  {name:30} | {count:8d} textes | {elapsed:8.3f} s | {rate:10.1f} textes/s")
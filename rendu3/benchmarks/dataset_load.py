@@ -0,0 +1,86 @@
+"""
+dataset_load
+============
+
+Compare le chargement des données d'entraînement depuis le YAML
+(yaml.safe_load puis dataset_to_training_data) et depuis le format compilé
+memory-mappé de dataset_store.
+
+Un corpus de --per-intent phrases par intention est généré avec
+enrich_dataset.generate_dataset dans un dossier temporaire, puis compilé.
+Pour chaque méthode sont mesurés la durée (meilleur de --repeat essais) et
+le pic d'allocations Python (tracemalloc).
+
+Exemple d'utilisation :
+    $ python -m benchmarks.dataset_load --per-intent 5000
+"""
+
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+import yaml
+
+from benchmarks.common import DATASET_PATH, measure
+from dataset_store import CompiledDataset, compile_dataset
+from enrich_dataset import generate_dataset
+from rendu3 import dataset_to_training_data
+
+
+def load_yaml(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        return dataset_to_training_data(yaml.safe_load(file))
+
+
+def load_compiled(path):
+    with CompiledDataset(path) as dataset:
+        return dataset.texts(), dataset.labels()
+
+
+def peak_allocations(func, *args):
+    """Pic d'allocations Python (octets) pendant l'appel."""
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--per-intent', type=int, default=2000, help="Phrases générées par intention")
+    parser.add_argument('--repeat', type=int, default=3, help="Nombre d'essais par méthode")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with open(DATASET_PATH, 'r', encoding='utf-8') as file:
+        base = yaml.safe_load(file)['intentions']
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'dataset.yaml')
+        generate_dataset(source, list(base), args.per_intent, seed=args.seed, base=base)
+        _, compile_time = measure(compile_dataset, source)
+        compiled = os.path.join(directory, 'dataset.r3ds')
+
+        yaml_result = load_yaml(source)
+        assert load_compiled(compiled) == yaml_result, "Le format compilé diffère du YAML"
+
+        print(f"\n⏱️  Chargement de {len(yaml_result[0])} exemples "
+              f"(YAML {os.path.getsize(source) / 1024:.0f} Ko, "
+              f"compilé {os.path.getsize(compiled) / 1024:.0f} Ko, compilation {compile_time:.2f} s)")
+        print("-" * 70)
+        results = {}
+        for name, func, path in (("yaml.safe_load", load_yaml, source),
+                                 ("CompiledDataset (mmap)", load_compiled, compiled)):
+            elapsed = min(measure(func, path)[1] for _ in range(args.repeat))
+            peak = peak_allocations(func, path)
+            results[name] = elapsed
+            print(f"  {name:25} | {elapsed * 1000:10.1f} ms | pic {peak / 1024 / 1024:8.1f} Mo")
+        speedup = results["yaml.safe_load"] / results["CompiledDataset (mmap)"]
+        print(f"\n  Accélération : x{speedup:.0f}")
+
+
+if __name__ == "__main__":
+    main()
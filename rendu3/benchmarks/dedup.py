@@ -0,0 +1,58 @@
+"""
+dedup
+=====
+
+Mesure la durée de NearDuplicateIndex (signatures MinHash, LSH, groupes)
+et de l'élagage sur un corpus généré par enrich_dataset.generate_dataset.
+
+Exemple d'utilisation :
+    $ python -m benchmarks.dedup --per-intent 50000
+"""
+
+import argparse
+import os
+import tempfile
+
+import yaml
+
+from benchmarks.common import DATASET_PATH, measure
+from dataset_store import iter_examples
+from dedup_index import NearDuplicateIndex, minhash_signatures
+from enrich_dataset import generate_dataset
+from text_normalizer import TextNormalizer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--per-intent', type=int, default=20000, help="Phrases générées par intention")
+    parser.add_argument('--threshold', type=float, default=0.7)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with open(DATASET_PATH, 'r', encoding='utf-8') as file:
+        base = yaml.safe_load(file)['intentions']
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = os.path.join(directory, 'corpus.jsonl')
+        generate_dataset(corpus, list(base), args.per_intent, seed=args.seed, base=base)
+        examples = list(iter_examples(corpus))
+    texts = [text for text, _ in examples]
+    labels = [label for _, label in examples]
+
+    normalized = TextNormalizer(fold_accents=True).normalize_many(texts)
+    _, signature_time = measure(minhash_signatures, normalized)
+    index = NearDuplicateIndex(threshold=args.threshold)
+    _, fit_time = measure(index.fit, texts, labels)
+    kept, prune_time = measure(index.prune)
+    summary = index.summary()
+
+    print(f"\n⏱️  Quasi-doublons sur {len(texts)} textes (seuil {args.threshold})")
+    print("-" * 60)
+    print(f"  {'signatures MinHash':25} | {signature_time:8.2f} s")
+    print(f"  {'fit (signatures + LSH)':25} | {fit_time:8.2f} s | {len(texts) / fit_time:10.0f} textes/s")
+    print(f"  {'prune':25} | {prune_time:8.2f} s")
+    print(f"\n  Groupes : {summary['clusters']} | gardés : {len(kept)} "
+          f"| collisions entre intentions : {summary['collisions']}")
+
+
+if __name__ == "__main__":
+    main()
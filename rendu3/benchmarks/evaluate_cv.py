@@ -0,0 +1,66 @@
+"""
+evaluate_cv
+===========
+
+Compare la durée de IntentClassifierEvaluator.evaluate selon la stratégie
+de validation : Leave-One-Out série (comportement historique sur les petits
+datasets), puis validation croisée stratifiée parallèle, avec et sans
+cache du vectoriseur.
+
+Exemple d'utilisation :
+    $ python -m benchmarks.evaluate_cv --size 2000 --n-jobs -1
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+
+from benchmarks.common import load_corpus, measure, scale_corpus
+from intent_classifier import IntentClassifier
+from IntentClassifierEvaluator import IntentClassifierEvaluator
+
+
+def run(evaluator, **options):
+    with contextlib.redirect_stdout(io.StringIO()):
+        evaluator.evaluate(**options)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=1000, help="Taille du dataset évalué")
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    parser.add_argument('--skip-loo', action='store_true', help="Ne pas mesurer Leave-One-Out (lent)")
+    args = parser.parse_args()
+
+    base_texts, base_labels = load_corpus()
+    indices = scale_corpus(list(range(len(base_texts))), args.size)
+    texts = [base_texts[i] for i in indices]
+    labels = [base_labels[i] for i in indices]
+    evaluator = IntentClassifierEvaluator(IntentClassifier(), texts, labels)
+
+    scenarios = []
+    if not args.skip_loo:
+        scenarios.append(("loo, n_jobs=1", dict(cv='loo')))
+    scenarios += [
+        ("stratified, n_jobs=1", dict(cv='stratified')),
+        (f"stratified, n_jobs={args.n_jobs}", dict(cv='stratified', n_jobs=args.n_jobs)),
+        (f"repeated, n_jobs={args.n_jobs}", dict(cv='repeated', n_jobs=args.n_jobs)),
+    ]
+
+    print(f"\n⏱️  IntentClassifierEvaluator.evaluate ({len(texts)} exemples)")
+    print("-" * 60)
+    for name, options in scenarios:
+        _, elapsed = measure(run, evaluator, **options)
+        print(f"  {name:35} | {elapsed:8.2f} s")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        options = dict(cv='repeated', n_jobs=args.n_jobs, cache_dir=cache_dir)
+        _, cold = measure(run, evaluator, **options)
+        _, warm = measure(run, evaluator, **options)
+    print(f"  {'repeated + cache (froid)':35} | {cold:8.2f} s")
+    print(f"  {'repeated + cache (chaud)':35} | {warm:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
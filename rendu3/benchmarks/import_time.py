@@ -0,0 +1,122 @@
+"""
+import_time
+===========
+
+Vérifie le budget de démarrage des points d'entrée de rendu3.
+
+Chaque module est importé dans un interpréteur neuf (meilleur temps sur
+plusieurs essais) et deux règles sont contrôlées :
+- la durée d'import ne dépasse pas le budget du module ;
+- aucun module lourd interdit (spaCy, NLTK, scikit-learn…) n'est chargé
+  par l'import : ces dépendances doivent rester différées.
+
+Le script se termine avec le code 1 si une règle n'est pas respectée, ou
+si une durée dépasse de plus de --threshold celle d'une référence JSON
+(--compare), ce qui permet de l'utiliser en intégration continue.
+
+Exemple d'utilisation :
+    $ python -m benchmarks.import_time
+    $ python -m benchmarks.import_time --save-baseline benchmarks/import_baseline.json
+    $ python -m benchmarks.import_time --compare benchmarks/import_baseline.json --threshold 0.25
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from benchmarks.common import RENDU3_DIR
+
+# Budget d'import (millisecondes) et modules interdits par point d'entrée
+ENTRY_POINTS = {
+    'rendu3': (250, ('spacy', 'nltk', 'sklearn', 'yaml')),
+    'TextPreprocessor': (250, ('spacy', 'nltk', 'sklearn')),
+    'nlp_processor': (300, ('spacy', 'nltk', 'sklearn')),
+    'inference_server': (300, ('spacy', 'nltk', 'sklearn')),
+    'intent_classifier': (4000, ('spacy', 'nltk', 'sklearn.calibration')),
+}
+
+# Code exécuté dans l'interpréteur neuf : durée d'import et modules chargés
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'modules': sorted(sys.modules)}}))
+"""
+
+
+def probe(module):
+    """
+    Importe un module dans un interpréteur neuf.
+
+    Returns:
+        tuple: (durée d'import en secondes, ensemble des modules chargés)
+    """
+    output = subprocess.run([sys.executable, '-c', _PROBE.format(module=module)], cwd=RENDU3_DIR,
+                            capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    return result['seconds'], set(result['modules'])
+
+
+def measure(module, repeat):
+    """Meilleure durée d'import (secondes) sur `repeat` essais et modules chargés."""
+    best = float('inf')
+    modules = set()
+    for _ in range(repeat):
+        seconds, modules = probe(module)
+        best = min(best, seconds)
+    return best, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help="Nombre d'essais par module")
+    parser.add_argument('--budget-scale', type=float, default=1.0,
+                        help="Multiplicateur des budgets (machines lentes)")
+    parser.add_argument('--save-baseline', help="Enregistrer les durées comme référence JSON")
+    parser.add_argument('--compare', help="Référence JSON à comparer")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Hausse tolérée (0.25 = 25 %%)")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+
+    failures = []
+    timings = {}
+    print(f"\n⏱️  Durée d'import des points d'entrée (meilleur de {args.repeat})")
+    print("-" * 70)
+    for module, (budget_ms, forbidden) in ENTRY_POINTS.items():
+        seconds, modules = measure(module, args.repeat)
+        elapsed_ms = seconds * 1000
+        timings[module] = elapsed_ms
+        budget_ms *= args.budget_scale
+        status = "✅" if elapsed_ms <= budget_ms else "❌"
+        print(f"  {status} {module:20} | {elapsed_ms:8.1f} ms | budget {budget_ms:8.1f} ms")
+        if elapsed_ms > budget_ms:
+            failures.append(f"{module}: {elapsed_ms:.1f} ms > budget {budget_ms:.1f} ms")
+        loaded = sorted(name for name in forbidden if name in modules)
+        if loaded:
+            failures.append(f"{module}: import de {', '.join(loaded)} (doit être différé)")
+        reference = baseline.get(module)
+        if reference and elapsed_ms > reference * (1 + args.threshold):
+            failures.append(f"{module}: {reference:.1f} ms → {elapsed_ms:.1f} ms "
+                            f"({(elapsed_ms / reference - 1) * 100:+.1f} %)")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as file:
+            json.dump(timings, file, indent=2)
+        print(f"\n💾 Référence enregistrée dans '{args.save_baseline}'")
+
+    if failures:
+        print("\n❌ Budget de démarrage non respecté :")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n✅ Budget de démarrage respecté")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+instrumentation_overhead
+========================
+
+Mesure le coût par message de l'instrumentation dans
+classify_intent_with_preprocessing :
+- désactivée : span() et count() ne font rien ;
+- activée : durées et compteurs agrégés ;
+- activée avec profilage cProfile des requêtes les plus lentes.
+
+Exemple d'utilisation :
+    $ python -m benchmarks.instrumentation_overhead --size 5000
+"""
+
+import argparse
+
+import instrumentation
+from benchmarks.common import load_corpus, measure, scale_corpus
+from intent_classifier import IntentClassifier
+from rendu3 import classify_intent_with_preprocessing
+from TextPreprocessor import TextPreprocessor
+
+
+def run(preprocessor, classifier, texts):
+    for text in texts:
+        classify_intent_with_preprocessing(text, preprocessor, classifier)
+    return len(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=5000, help="Nombre de messages traités")
+    parser.add_argument('--profile-slowest', type=int, default=5)
+    args = parser.parse_args()
+
+    base_texts, labels = load_corpus()
+    texts = scale_corpus(base_texts, args.size)
+    preprocessor = TextPreprocessor(download_resources=False)
+    classifier = IntentClassifier()
+    classifier.train(base_texts, labels)
+
+    results = {}
+    for name, options in (("désactivée", None), ("activée", 0), ("activée + cProfile", args.profile_slowest)):
+        instrumentation.reset()
+        if options is None:
+            instrumentation.disable()
+        else:
+            instrumentation.enable(profile_slowest=options)
+        count, elapsed = measure(run, preprocessor, classifier, texts)
+        results[name] = elapsed / count
+    instrumentation.disable()
+
+    print(f"\n⏱️  Coût par message ({len(texts)} messages)")
+    print("-" * 60)
+    for name, per_message in results.items():
+        print(f"  {name:20} | {per_message * 1e6:10.1f} µs/message")
+    print(f"\n{instrumentation.export_prometheus()}")
+    slowest = instrumentation.slowest_profiles(limit=10)
+    if slowest:
+        print(f"Requête la plus lente ({slowest[0]['duration_seconds'] * 1e3:.2f} ms) :\n{slowest[0]['profile']}")
+
+
+if __name__ == "__main__":
+    main()
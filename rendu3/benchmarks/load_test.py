@@ -0,0 +1,110 @@
+"""
+load_test
+=========
+
+Test de charge local du serveur d'inférence (inference_server) : plusieurs
+connexions keep-alive concurrentes envoient des requêtes POST /classify.
+Le script mesure le débit et les latences p50/p99.
+
+Exemple d'utilisation :
+    $ python inference_server.py --port 8080 --no-nlp &
+    $ python -m benchmarks.load_test --url http://127.0.0.1:8080 --concurrency 32 --requests 5000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+from benchmarks.common import load_corpus, percentile
+
+
+async def wait_ready(host, port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(f"GET /ready HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode('ascii'))
+            await writer.drain()
+            status_line = await reader.readline()
+            writer.close()
+            if b' 200 ' in status_line:
+                return True
+        except ConnectionError:
+            pass
+        await asyncio.sleep(0.2)
+    return False
+
+
+async def send(reader, writer, host, path, payload):
+    body = json.dumps(payload).encode('utf-8')
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: {host}\r\n"
+                 f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode('ascii') + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def worker(host, port, path, texts, counter, total, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while counter[0] < total:
+            index = counter[0]
+            counter[0] += 1
+            start = time.perf_counter()
+            status = await send(reader, writer, host, path, {'text': texts[index % len(texts)]})
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run(url, concurrency, total, path, ready_timeout):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    if not await wait_ready(host, port, ready_timeout):
+        raise SystemExit(f"Le serveur {url} n'est pas prêt après {ready_timeout} s")
+
+    texts, _ = load_corpus()
+    latencies = []
+    errors = []
+    counter = [0]
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(host, port, path, texts, counter, total, latencies, errors)
+                           for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:8080')
+    parser.add_argument('--path', default='/classify')
+    parser.add_argument('--concurrency', type=int, default=32, help="Connexions simultanées")
+    parser.add_argument('--requests', type=int, default=5000, help="Nombre total de requêtes")
+    parser.add_argument('--ready-timeout', type=float, default=60.0)
+    args = parser.parse_args()
+
+    latencies, errors, elapsed = asyncio.run(
+        run(args.url, args.concurrency, args.requests, args.path, args.ready_timeout))
+
+    print(f"\n⏱️  Test de charge {args.path} ({len(latencies)} requêtes, {args.concurrency} connexions)")
+    print("-" * 60)
+    print(f"  Débit   : {len(latencies) / elapsed:10.1f} req/s")
+    print(f"  p50     : {percentile(latencies, 50) * 1000:10.2f} ms")
+    print(f"  p99     : {percentile(latencies, 99) * 1000:10.2f} ms")
+    print(f"  Erreurs : {len(errors)}")
+
+
+if __name__ == "__main__":
+    main()
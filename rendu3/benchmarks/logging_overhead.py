@@ -0,0 +1,71 @@
+"""
+logging_overhead
+================
+
+Mesure le coût par message des traces de TextPreprocessor et
+IntentClassifier selon le niveau de logging :
+- désactivé (WARNING) : aucun formatage de chaîne n'est effectué ;
+- activé (DEBUG) : chaque étape est formatée et écrite dans /dev/null.
+
+Exemple d'utilisation :
+    $ python -m benchmarks.logging_overhead --size 5000
+"""
+
+import argparse
+import logging
+import os
+
+from benchmarks.common import load_corpus, measure, scale_corpus
+from TextPreprocessor import TextPreprocessor
+from intent_classifier import IntentClassifier
+
+LOGGERS = ('TextPreprocessor', 'intent_classifier')
+
+
+def configure(level, handler):
+    for name in LOGGERS:
+        logger = logging.getLogger(name)
+        logger.handlers[:] = [handler]
+        logger.setLevel(level)
+        logger.propagate = False
+
+
+def run(preprocessor, classifier, texts):
+    for text in texts:
+        preprocessor.preprocess_message(text, verbose=False)
+        classifier.predict(text)
+    return len(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=5000, help="Nombre de messages traités")
+    args = parser.parse_args()
+
+    base_texts, labels = load_corpus()
+    texts = scale_corpus(base_texts, args.size)
+
+    with open(os.devnull, 'w') as devnull:
+        handler = logging.StreamHandler(devnull)
+        configure(logging.WARNING, handler)
+        preprocessor = TextPreprocessor()
+        classifier = IntentClassifier()
+        classifier.train(base_texts, labels)
+
+        results = {}
+        for name, level in (("logging désactivé", logging.WARNING), ("logging DEBUG", logging.DEBUG)):
+            configure(level, handler)
+            count, elapsed = measure(run, preprocessor, classifier, texts)
+            results[name] = elapsed / count
+
+    print(f"\n⏱️  Coût par message ({len(texts)} messages)")
+    print("-" * 60)
+    for name, per_message in results.items():
+        print(f"  {name:20} | {per_message * 1e6:10.1f} µs/message")
+    off = results["logging désactivé"]
+    on = results["logging DEBUG"]
+    print(f"\n  Surcoût du logging actif : {(on - off) * 1e6:.1f} µs/message ({(on / off - 1) * 100:.1f} %)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+nlp_batch
+=========
+
+Compare le débit de NLPProcessor.analyze_many (nlp.pipe) avec la boucle
+historique d'appels à full_analysis, un texte à la fois.
+
+Exemple d'utilisation :
+    $ python -m benchmarks.nlp_batch --size 2000 --batch-size 128 --n-process 2
+"""
+
+import argparse
+
+from benchmarks.common import load_corpus, measure, print_throughput, scale_corpus
+from nlp_processor import NLPProcessor
+
+
+def run_loop(processor, texts):
+    count = 0
+    for text in texts:
+        processor.full_analysis(text, verbose=False)
+        count += 1
+    return count
+
+
+def run_batched(processor, texts, batch_size, n_process):
+    count = 0
+    for _ in processor.analyze_many(texts, batch_size=batch_size, n_process=n_process):
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=2000, help="Nombre de textes analysés")
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--n-process', type=int, default=1)
+    parser.add_argument('--model', default='fr_core_news_sm')
+    args = parser.parse_args()
+
+    base_texts, _ = load_corpus()
+    texts = scale_corpus(base_texts, args.size)
+
+    processor = NLPProcessor(args.model)
+    loop_count, loop_time = measure(run_loop, processor, texts)
+    batch_count, batch_time = measure(run_batched, processor, texts, args.batch_size, args.n_process)
+
+    print(f"\n⏱️  NLPProcessor : boucle full_analysis vs analyze_many ({len(texts)} textes)")
+    print("-" * 80)
+    print_throughput("full_analysis (boucle)", loop_count, loop_time)
+    print_throughput(f"analyze_many (bs={args.batch_size}, np={args.n_process})", batch_count, batch_time)
+    if batch_time > 0:
+        print(f"\n  Accélération : x{loop_time / batch_time:.2f}")
+
+
+if __name__ == "__main__":
+    main()
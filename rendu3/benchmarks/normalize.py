@@ -0,0 +1,66 @@
+"""
+normalize
+=========
+
+Micro-benchmark de la normalisation de texte sur le corpus dataset.yaml :
+- implémentation historique (maketrans + re.sub à chaque appel) ;
+- TextNormalizer.normalize (table précompilée) ;
+- TextNormalizer.normalize_many (lot entier en un passage) ;
+- TextNormalizer avec suppression des accents.
+
+Exemple d'utilisation :
+    $ python -m benchmarks.normalize --repeat 200
+"""
+
+import argparse
+import re
+import string
+
+from benchmarks.common import load_corpus, measure, print_throughput
+from text_normalizer import TextNormalizer
+
+
+def legacy_normalize(text):
+    """Implémentation historique de TextPreprocessor.normalize_text."""
+    text = text.lower()
+    text = text.translate(str.maketrans('', '', string.punctuation))
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def run_single(func, texts, repeat):
+    for _ in range(repeat):
+        for text in texts:
+            func(text)
+    return len(texts) * repeat
+
+
+def run_many(normalizer, texts, repeat):
+    for _ in range(repeat):
+        normalizer.normalize_many(texts)
+    return len(texts) * repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200, help="Nombre de passages sur le corpus")
+    args = parser.parse_args()
+
+    texts, _ = load_corpus()
+    normalizer = TextNormalizer()
+    folding = TextNormalizer(fold_accents=True)
+
+    print(f"\n⏱️  Normalisation ({len(texts)} textes x {args.repeat})")
+    print("-" * 80)
+    count, elapsed = measure(run_single, legacy_normalize, texts, args.repeat)
+    print_throughput("historique", count, elapsed)
+    count, elapsed = measure(run_single, normalizer.normalize, texts, args.repeat)
+    print_throughput("TextNormalizer.normalize", count, elapsed)
+    count, elapsed = measure(run_many, normalizer, texts, args.repeat)
+    print_throughput("TextNormalizer.normalize_many", count, elapsed)
+    count, elapsed = measure(run_single, folding.normalize, texts, args.repeat)
+    print_throughput("normalize (sans accents)", count, elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+preprocess_stages
+=================
+
+Compare la latence de TextPreprocessor.preprocess_message :
+- pipeline complet (double tokenisation : texte brut + texte normalisé) ;
+- stages=('stemmed_tokens',) (une seule tokenisation, pas de découpage en phrases).
+
+Exemple d'utilisation :
+    $ python -m benchmarks.preprocess_stages --repeat 50
+"""
+
+import argparse
+import time
+
+from benchmarks.common import load_corpus, percentile
+from TextPreprocessor import TextPreprocessor
+
+
+def latencies(preprocessor, texts, repeat, stages):
+    values = []
+    for _ in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            preprocessor.preprocess_message(text, verbose=False, stages=stages)
+            values.append(time.perf_counter() - start)
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=50, help="Nombre de passages sur le corpus")
+    args = parser.parse_args()
+
+    texts, _ = load_corpus()
+    preprocessor = TextPreprocessor()
+    preprocessor.warm_stem_cache(texts)
+
+    print(f"\n⏱️  preprocess_message ({len(texts)} textes x {args.repeat})")
+    print("-" * 70)
+    results = {}
+    for name, stages in (("complet", None), ("stemmed_tokens seul", ('stemmed_tokens',))):
+        values = latencies(preprocessor, texts, args.repeat, stages)
+        results[name] = sum(values) / len(values)
+        print(f"  {name:22} | moyenne {results[name] * 1e6:8.1f} µs | "
+              f"p50 {percentile(values, 50) * 1e6:8.1f} µs | p99 {percentile(values, 99) * 1e6:8.1f} µs")
+    gain = 1 - results["stemmed_tokens seul"] / results["complet"]
+    print(f"\n  Gain de latence moyen : {gain * 100:.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+suite
+=====
+
+Suite de benchmarks reproductible de tout le pipeline rendu3.
+
+Chaque étape est mesurée séparément, sur le corpus dataset.yaml ('base')
+et sur une version agrandie par enrich_dataset.py ('enrichi', générée
+dans un dossier temporaire avec une graine fixe) :
+- preprocess.<étape> : TextPreprocessor.preprocess_message limité à une étape ;
+- nlp.<analyse> : analyses de NLPProcessor ;
+- classifier.fit / classifier.predict / classifier.classify_batch ;
+- evaluator.evaluate : IntentClassifierEvaluator.evaluate (stratifié).
+
+Pour chaque mesure : p50/p95/p99, moyenne, débit et pic de mémoire (RSS)
+du processus. Les résultats peuvent être enregistrés comme référence
+(JSON) puis comparés : une hausse de latence ou une baisse de débit
+au-delà du seuil est signalée comme régression (code de sortie 1).
+Les étapes dont les ressources manquent (modèle spaCy, données NLTK)
+sont ignorées et signalées.
+
+Exemple d'utilisation :
+    $ python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+    $ python -m benchmarks.suite --compare benchmarks/baseline.json --threshold 0.15
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+import sklearn
+
+from benchmarks.common import DATASET_PATH, load_corpus, percentile
+
+# Métriques comparées à la référence : sens d'une amélioration
+LOWER_IS_BETTER = ('p50_ms', 'p95_ms', 'p99_ms')
+HIGHER_IS_BETTER = ('throughput_per_s',)
+
+
+def peak_rss_kb():
+    """Pic de mémoire résidente du processus en Ko (ru_maxrss est en octets sous macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def time_calls(func, items, repeat=1):
+    """
+    Mesure la latence de `func` sur chaque élément.
+
+    Returns:
+        list of float: Latences en secondes
+    """
+    values = []
+    for _ in range(repeat):
+        for item in items:
+            start = time.perf_counter()
+            func(item)
+            values.append(time.perf_counter() - start)
+    return values
+
+
+def summarize(values, items_per_call=1):
+    """
+    Calcule les statistiques d'une série de latences.
+
+    Args:
+        values (list of float): Latences en secondes
+        items_per_call (int): Nombre de textes traités par appel (débit)
+
+    Returns:
+        dict: calls, mean_ms, p50_ms, p95_ms, p99_ms, throughput_per_s, peak_rss_kb
+    """
+    total = sum(values)
+    return {
+        'calls': len(values),
+        'mean_ms': total / len(values) * 1000,
+        'p50_ms': percentile(values, 50) * 1000,
+        'p95_ms': percentile(values, 95) * 1000,
+        'p99_ms': percentile(values, 99) * 1000,
+        'throughput_per_s': len(values) * items_per_call / total if total > 0 else float('inf'),
+        'peak_rss_kb': peak_rss_kb(),
+    }
+
+
+def enriched_corpus(n_variants, seed):
+    """
+    Génère un corpus agrandi avec enrich_dataset sur une copie temporaire de dataset.yaml.
+
+    Args:
+        n_variants (int): Nombre d'exemples visés par intention
+        seed (int): Graine de la génération
+
+    Returns:
+        tuple: (textes, labels)
+    """
+    import enrich_dataset
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'dataset.yaml')
+        shutil.copyfile(DATASET_PATH, path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            enrich_dataset.enrich_dataset(path, n_variants=n_variants, seed=seed)
+        return load_corpus(path)
+
+
+def bench_preprocess(texts, labels, repeat):
+    from TextPreprocessor import STAGES, TextPreprocessor
+
+    preprocessor = TextPreprocessor()
+    results = {}
+    for stage in STAGES[1:]:
+        results[f'preprocess.{stage}'] = summarize(time_calls(
+            lambda text: preprocessor.preprocess_message(text, verbose=False, stages=(stage,)), texts, repeat))
+    return results
+
+
+def bench_nlp(texts, labels, repeat):
+    from nlp_processor import NLPProcessor
+
+    processor = NLPProcessor()
+    analyses = {
+        'pos': processor.analyze_pos,
+        'entities': processor.extract_entities,
+        'dependencies': processor.analyze_dependencies,
+        'full_analysis': lambda text: processor.full_analysis(text, verbose=False),
+    }
+    return {f'nlp.{name}': summarize(time_calls(func, texts, repeat)) for name, func in analyses.items()}
+
+
+def bench_classifier(texts, labels, repeat):
+    from intent_classifier import IntentClassifier
+
+    classifier = IntentClassifier()
+    results = {'classifier.fit': summarize(time_calls(lambda _: classifier.train(texts, labels), range(repeat)),
+                                           items_per_call=len(texts))}
+    results['classifier.predict'] = summarize(time_calls(classifier.predict, texts, repeat))
+    results['classifier.classify_batch'] = summarize(
+        time_calls(classifier.classify_batch, [texts] * repeat), items_per_call=len(texts))
+    return results
+
+
+def bench_evaluator(texts, labels, repeat):
+    from intent_classifier import IntentClassifier
+    from IntentClassifierEvaluator import IntentClassifierEvaluator
+
+    evaluator = IntentClassifierEvaluator(IntentClassifier(), texts, labels)
+
+    def evaluate(_):
+        with contextlib.redirect_stdout(io.StringIO()):
+            evaluator.evaluate(cv='stratified')
+
+    return {'evaluator.evaluate': summarize(time_calls(evaluate, range(repeat)), items_per_call=len(texts))}
+
+
+# Groupes de mesures, dans l'ordre d'exécution
+BENCHMARKS = {
+    'preprocess': bench_preprocess,
+    'nlp': bench_nlp,
+    'classifier': bench_classifier,
+    'evaluator': bench_evaluator,
+}
+
+
+def run_suite(corpora, groups, repeat):
+    """
+    Exécute les groupes de mesures sur chaque corpus.
+
+    Returns:
+        dict: {'meta': ..., 'results': {corpus: {mesure: statistiques}}, 'skipped': ...}
+    """
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sklearn': sklearn.__version__,
+            'repeat': repeat,
+            'corpora': {name: len(texts) for name, (texts, _) in corpora.items()},
+        },
+        'results': {},
+        'skipped': {},
+    }
+    for corpus, (texts, labels) in corpora.items():
+        results = report['results'].setdefault(corpus, {})
+        for group in groups:
+            try:
+                results.update(BENCHMARKS[group](texts, labels, repeat))
+            except (LookupError, OSError, ImportError) as e:
+                # Ressource absente (données NLTK, modèle spaCy) : mesure ignorée
+                reason = [line.strip() for line in str(e).splitlines() if any(c.isalnum() for c in line)]
+                report['skipped'][f'{corpus}/{group}'] = f"{type(e).__name__}: {reason[0] if reason else ''}"
+    return report
+
+
+def compare(report, baseline, threshold):
+    """
+    Compare un rapport à une référence.
+
+    Args:
+        report (dict): Rapport courant
+        baseline (dict): Rapport de référence
+        threshold (float): Variation relative tolérée (0.10 = 10 %)
+
+    Returns:
+        list of tuple: Régressions (corpus, mesure, métrique, référence, valeur, variation)
+    """
+    regressions = []
+    for corpus, results in report['results'].items():
+        for name, stats in results.items():
+            reference = baseline.get('results', {}).get(corpus, {}).get(name)
+            if reference is None:
+                continue
+            for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+                before, after = reference[metric], stats[metric]
+                if not before:
+                    continue
+                change = (after - before) / before
+                worse = change > threshold if metric in LOWER_IS_BETTER else change < -threshold
+                if worse:
+                    regressions.append((corpus, name, metric, before, after, change))
+    return regressions
+
+
+def print_report(report):
+    for corpus, results in report['results'].items():
+        print(f"\n⏱️  Corpus '{corpus}' ({report['meta']['corpora'][corpus]} textes)")
+        print("-" * 100)
+        print(f"  {'mesure':28} | {'p50 ms':>9} | {'p95 ms':>9} | {'p99 ms':>9} | {'débit/s':>11} | {'RSS Mo':>8}")
+        for name, stats in results.items():
+            print(f"  {name:28} | {stats['p50_ms']:9.3f} | {stats['p95_ms']:9.3f} | {stats['p99_ms']:9.3f} | "
+                  f"{stats['throughput_per_s']:11.1f} | {stats['peak_rss_kb'] / 1024:8.1f}")
+    for key, reason in report['skipped'].items():
+        print(f"\n⚠️  {key} ignoré : {reason}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--groups', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument('--repeat', type=int, default=3, help="Nombre de passages par mesure")
+    parser.add_argument('--scale', type=int, default=200,
+                        help="Exemples par intention du corpus enrichi (0 : corpus de base seul)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Fichier JSON du rapport")
+    parser.add_argument('--save-baseline', help="Enregistrer le rapport comme référence")
+    parser.add_argument('--compare', help="Référence JSON à comparer")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Variation tolérée (0.10 = 10 %%)")
+    args = parser.parse_args()
+
+    corpora = {'base': load_corpus()}
+    if args.scale:
+        corpora['enrichi'] = enriched_corpus(args.scale, args.seed)
+
+    report = run_suite(corpora, args.groups, args.repeat)
+    print_report(report)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump(report, file, indent=2, ensure_ascii=False)
+            print(f"\n💾 Rapport enregistré dans '{path}'")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} régression(s) au-delà de {args.threshold * 100:.0f} % :")
+            for corpus, name, metric, before, after, change in regressions:
+                print(f"  {corpus}/{name} {metric}: {before:.3f} → {after:.3f} ({change * 100:+.1f} %)")
+            sys.exit(1)
+        print(f"\n✅ Aucune régression au-delà de {args.threshold * 100:.0f} % par rapport à '{args.compare}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""
+dataset_store
+=============
+
+Format compilé (binaire, memory-mappé) des données d'entraînement.
+
+dataset.yaml reste la source éditable ; ce module le compile en un fichier
+.r3ds lu sans analyse YAML :
+
+    en-tête   magic 'R3DS', version, largeur des identifiants de label,
+              nombre d'exemples et de labels, empreinte SHA-256 de la
+              source, positions des sections
+    labels    table des labels internés : (longueur u32, UTF-8) par label
+    offsets   uint64[n + 1] : début de chaque texte dans la zone de textes
+    label_ids uint16 ou uint32[n] : label de chaque exemple
+    textes    textes UTF-8 concaténés
+
+Les tableaux sont alignés sur 8 octets et lus avec numpy.frombuffer
+directement sur le mmap du fichier : rien n'est copié avant l'accès.
+L'empreinte de la source permet de détecter un .r3ds périmé.
+
+Dépendances :
+- numpy
+- pyyaml (compilation depuis le YAML uniquement)
+
+Exemple d'utilisation :
+    $ python dataset_store.py dataset.yaml            # écrit dataset.r3ds
+    $ python dataset_store.py corpus.jsonl -o corpus.r3ds
+    >>> with CompiledDataset("dataset.r3ds") as dataset:
+    ...     texts, labels = dataset.texts(), dataset.labels()
+"""
+
+import argparse
+import array
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+
+import numpy as np
+
+MAGIC = b'R3DS'
+FORMAT_VERSION = 1
+EXTENSION = '.r3ds'
+
+# magic, version, largeur des label_ids (octets), nombre d'exemples, nombre de
+# labels, empreinte de la source, positions des labels / offsets / label_ids / textes
+_HEADER = struct.Struct('<4sHHQI32sQQQQ')
+_LABEL_LENGTH = struct.Struct('<I')
+
+
+class DatasetFormatError(ValueError):
+    """Fichier compilé invalide ou d'une version non supportée."""
+
+
+def source_hash(path, chunk_size=1 << 20):
+    """
+    Calcule l'empreinte SHA-256 d'un fichier source.
+
+    Args:
+        path (str): Fichier à hacher
+
+    Returns:
+        bytes: Empreinte (32 octets)
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(chunk_size), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def compiled_path(source_path):
+    """Chemin du fichier compilé associé à une source (dataset.yaml -> dataset.r3ds)."""
+    return os.path.splitext(source_path)[0] + EXTENSION
+
+
+def _align(file):
+    padding = -file.tell() % 8
+    if padding:
+        file.write(b'\0' * padding)
+    return file.tell()
+
+
+def write_dataset(path, examples, digest=b'\0' * 32):
+    """
+    Écrit un fichier compilé à partir d'un flux d'exemples.
+
+    Les textes sont écrits au fil de l'eau dans un fichier temporaire ; seuls
+    les offsets (8 octets) et identifiants de label (4 octets) de chaque
+    exemple sont gardés en mémoire.
+
+    Args:
+        path (str): Fichier de sortie
+        examples (iterable): Couples (texte, label)
+        digest (bytes): Empreinte de la source (32 octets)
+
+    Returns:
+        int: Nombre d'exemples écrits
+    """
+    label_index = {}
+    offsets = array.array('Q', [0])
+    label_ids = array.array('I')
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.TemporaryFile(dir=directory) as blob:
+        position = 0
+        for text, label in examples:
+            encoded = text.encode('utf-8')
+            blob.write(encoded)
+            position += len(encoded)
+            offsets.append(position)
+            label_ids.append(label_index.setdefault(label, len(label_index)))
+        blob.seek(0)
+
+        width = 2 if len(label_index) <= 0xFFFF else 4
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=EXTENSION)
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                out.write(b'\0' * _HEADER.size)
+                labels_at = _align(out)
+                for label in label_index:
+                    encoded = str(label).encode('utf-8')
+                    out.write(_LABEL_LENGTH.pack(len(encoded)))
+                    out.write(encoded)
+                offsets_at = _align(out)
+                out.write(offsets.tobytes())
+                label_ids_at = _align(out)
+                out.write(np.frombuffer(label_ids, dtype=np.uint32).astype(f'<u{width}').tobytes())
+                texts_at = _align(out)
+                shutil.copyfileobj(blob, out, 1 << 20)
+                out.seek(0)
+                out.write(_HEADER.pack(MAGIC, FORMAT_VERSION, width, len(label_ids), len(label_index),
+                                       digest, labels_at, offsets_at, label_ids_at, texts_at))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    return len(label_ids)
+
+
+def _iter_yaml(path):
+    import yaml
+    with open(path, 'r', encoding='utf-8') as file:
+        data = yaml.safe_load(file) or {}
+    for intention, examples in (data.get('intentions') or {}).items():
+        for example in examples or []:
+            yield example, intention
+
+
+def _iter_jsonl(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                yield record['text'], record['intent']
+
+
+def iter_examples(source_path):
+    """
+    Parcourt les exemples d'un dataset YAML (format dataset.yaml) ou JSONL ({"text", "intent"}).
+
+    Args:
+        source_path (str): Fichier source
+
+    Returns:
+        iterator: Couples (texte, label)
+    """
+    reader = _iter_jsonl if source_path.endswith('.jsonl') else _iter_yaml
+    return reader(source_path)
+
+
+def compile_dataset(source_path, output_path=None):
+    """
+    Compile un dataset YAML (format dataset.yaml) ou JSONL ({"text", "intent"}).
+
+    Args:
+        source_path (str): Fichier source
+        output_path (str): Fichier compilé (None : même nom, extension .r3ds)
+
+    Returns:
+        str: Chemin du fichier compilé
+    """
+    output_path = output_path or compiled_path(source_path)
+    write_dataset(output_path, iter_examples(source_path), source_hash(source_path))
+    return output_path
+
+
+class CompiledDataset:
+    """
+    Lecture memory-mappée d'un fichier compilé.
+
+    Attributs:
+        label_names (list of str): Table des labels internés.
+        label_ids (numpy.ndarray): Identifiant de label de chaque exemple (vue sur le mmap).
+        source_hash (bytes): Empreinte de la source compilée.
+    """
+
+    def __init__(self, path):
+        """
+        Ouvre un fichier compilé.
+
+        Args:
+            path (str): Fichier .r3ds
+
+        Raises:
+            DatasetFormatError: Si le fichier n'est pas un dataset compilé supporté
+        """
+        self.path = path
+        self._mmap = None
+        with open(path, 'rb') as file:
+            # mmap refuse les fichiers vides (ValueError)
+            if os.fstat(file.fileno()).st_size < _HEADER.size:
+                raise DatasetFormatError(f"Fichier vide ou trop court: {path}")
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._mmap)
+        (magic, version, width, count, n_labels, digest,
+         labels_at, offsets_at, label_ids_at, texts_at) = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != FORMAT_VERSION or width not in (2, 4):
+            self._invalid("Format de dataset non supporté")
+        # Chaque section doit tenir dans le fichier (fichier tronqué sinon)
+        if (offsets_at + (count + 1) * 8 > size or label_ids_at + count * width > size
+                or labels_at > size or texts_at > size):
+            self._invalid("Fichier tronqué")
+        self.source_hash = digest
+        self.label_names = []
+        position = labels_at
+        try:
+            for _ in range(n_labels):
+                if position + _LABEL_LENGTH.size > size:
+                    self._invalid("Table des labels tronquée")
+                (length,) = _LABEL_LENGTH.unpack_from(self._mmap, position)
+                position += _LABEL_LENGTH.size
+                if position + length > size:
+                    self._invalid("Table des labels tronquée")
+                self.label_names.append(self._mmap[position:position + length].decode('utf-8'))
+                position += length
+        except UnicodeDecodeError:
+            self._invalid("Label invalide")
+        self.offsets = np.frombuffer(self._mmap, dtype='<u8', count=count + 1, offset=offsets_at)
+        self.label_ids = np.frombuffer(self._mmap, dtype=f'<u{width}', count=count, offset=label_ids_at)
+        if texts_at + int(self.offsets[-1]) > size:
+            self._invalid("Zone de textes tronquée")
+        if count and int(self.label_ids.max()) >= n_labels:
+            self._invalid("Identifiant de label invalide")
+        self._texts_at = texts_at
+
+    def _invalid(self, reason):
+        """Ferme le fichier et lève DatasetFormatError."""
+        self.close()
+        raise DatasetFormatError(f"{reason}: {self.path}")
+
+    def __len__(self):
+        return len(self.label_ids)
+
+    def text(self, index):
+        """Texte de l'exemple `index`."""
+        start = self._texts_at + int(self.offsets[index])
+        end = self._texts_at + int(self.offsets[index + 1])
+        return self._mmap[start:end].decode('utf-8')
+
+    def __getitem__(self, index):
+        return self.text(index), self.label_names[self.label_ids[index]]
+
+    def texts(self):
+        """
+        Décode tous les textes.
+
+        Returns:
+            list of str: Textes, dans l'ordre du fichier
+        """
+        blob = self._mmap[self._texts_at:self._texts_at + int(self.offsets[-1])]
+        bounds = self.offsets.tolist()
+        return [blob[start:end].decode('utf-8') for start, end in zip(bounds, bounds[1:])]
+
+    def labels(self):
+        """
+        Labels de tous les exemples.
+
+        Returns:
+            list of str: Labels (objets str partagés de la table internée)
+        """
+        names = self.label_names
+        return [names[label] for label in self.label_ids.tolist()]
+
+    def is_stale(self, source_path):
+        """Indique si la source a changé depuis la compilation."""
+        return source_hash(source_path) != self.source_hash
+
+    def close(self):
+        """Libère le mmap (les vues numpy ne doivent plus être utilisées)."""
+        self.offsets = self.label_ids = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Des vues numpy sont encore référencées : libéré par le ramasse-miettes
+                pass
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile un dataset YAML/JSONL au format binaire .r3ds")
+    parser.add_argument('source', help="dataset.yaml ou corpus .jsonl")
+    parser.add_argument('-o', '--output', help="Fichier compilé (défaut: extension .r3ds)")
+    args = parser.parse_args()
+
+    output = compile_dataset(args.source, args.output)
+    with CompiledDataset(output) as dataset:
+        print(f"✅ {len(dataset)} exemples, {len(dataset.label_names)} intentions → {output} "
+              f"({os.path.getsize(output) / 1024:.1f} Ko)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""
+dedup_index
+===========
+
+Détection des quasi-doublons dans les données d'entraînement.
+
+enrich_dataset n'écarte que les doublons exacts ; les variantes presque
+identiques ("bonjour à tous à tous", "bonjour à tous tout le monde")
+allongent l'entraînement et l'évaluation sans apporter d'information.
+
+Chaque texte est normalisé (TextNormalizer, accents supprimés) puis
+découpé en n-grammes de caractères, hachés avec crc32. Une signature
+MinHash (num_perm valeurs) estime la similarité de Jaccard entre deux
+ensembles de n-grammes : c'est la proportion de valeurs égales. Les
+signatures sont calculées par lots avec numpy.
+
+Les paires candidates sont trouvées par LSH : la signature est découpée
+en `bands` bandes, et deux textes dont une bande est identique tombent
+dans le même seau. Chaque texte d'un seau est comparé au premier texte du
+seau ; les paires dont la similarité estimée atteint `threshold` sont
+reliées, et les composantes connexes forment les groupes de quasi-doublons.
+Le coût est linéaire en nombre de textes (un tri par bande).
+
+À partir des groupes, l'index :
+- signale les collisions entre intentions (un même groupe porte plusieurs labels) ;
+- élague le corpus : un représentant par groupe et par intention, puis
+  complète ou réduit jusqu'à la taille cible en équilibrant les intentions.
+
+Dépendances :
+- numpy
+- scipy (installé avec scikit-learn)
+- text_normalizer
+
+Exemple d'utilisation :
+    $ python dedup_index.py dataset.yaml
+    $ python dedup_index.py corpus.jsonl --prune-to 50000 --output corpus_pruned.jsonl
+    >>> index = NearDuplicateIndex(threshold=0.7).fit(texts, labels)
+    >>> index.collisions()[:5]
+    >>> kept = index.prune(target_size=1000)
+"""
+
+import argparse
+import itertools
+import json
+import time
+import zlib
+from collections import Counter
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from text_normalizer import TextNormalizer
+
+
+def shingle_hashes(text, ngram=3):
+    """
+    Hache les n-grammes de caractères distincts d'un texte normalisé.
+
+    Le texte est entouré d'espaces pour que les débuts et fins de mots
+    forment leurs propres n-grammes.
+
+    Args:
+        text (str): Texte normalisé
+        ngram (int): Taille des n-grammes
+
+    Returns:
+        list of int: Empreintes crc32 (au moins une)
+    """
+    padded = f" {text} "
+    if len(padded) <= ngram:
+        return [zlib.crc32(padded.encode('utf-8'))]
+    grams = {padded[i:i + ngram] for i in range(len(padded) - ngram + 1)}
+    return [zlib.crc32(gram.encode('utf-8')) for gram in grams]
+
+
+def minhash_signatures(texts, num_perm=64, ngram=3, seed=0, batch_size=2048):
+    """
+    Calcule les signatures MinHash d'une liste de textes normalisés.
+
+    Les num_perm fonctions de hachage sont des bijections de l'espace 32 bits
+    (xor, multiplication impaire, décalage), appliquées à tout un lot de
+    n-grammes à la fois ; np.minimum.reduceat donne ensuite le minimum par texte.
+
+    Args:
+        texts (list of str): Textes normalisés
+        num_perm (int): Nombre de fonctions de hachage
+        ngram (int): Taille des n-grammes
+        seed (int): Graine des fonctions de hachage
+        batch_size (int): Nombre de textes traités par lot
+
+    Returns:
+        numpy.ndarray: Signatures uint32, de forme (len(texts), num_perm)
+    """
+    rng = np.random.default_rng(seed)
+    salts = rng.integers(0, 2 ** 32, size=(num_perm, 1), dtype=np.uint32)
+    multipliers = rng.integers(0, 2 ** 31, size=(num_perm, 1), dtype=np.uint32) * np.uint32(2) + np.uint32(1)
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint32)
+    for start in range(0, len(texts), batch_size):
+        hashed = [shingle_hashes(text, ngram) for text in texts[start:start + batch_size]]
+        lengths = np.fromiter(map(len, hashed), dtype=np.int64, count=len(hashed))
+        flat = np.fromiter(itertools.chain.from_iterable(hashed), dtype=np.uint32, count=int(lengths.sum()))
+        mixed = (flat ^ salts) * multipliers
+        mixed ^= mixed >> np.uint32(15)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        signatures[start:start + len(hashed)] = np.minimum.reduceat(mixed, starts, axis=1).T
+    return signatures
+
+
+class NearDuplicateIndex:
+    """
+    Index de quasi-doublons (MinHash + LSH).
+
+    Attributs:
+        texts (list of str): Textes indexés (originaux).
+        labels (list): Label de chaque texte (None si non fourni).
+        signatures (numpy.ndarray): Signatures MinHash.
+        cluster_ids (numpy.ndarray): Groupe de chaque texte.
+    """
+
+    def __init__(self, threshold=0.7, ngram=3, num_perm=64, bands=16, seed=0):
+        """
+        Initialise l'index.
+
+        Args:
+            threshold (float): Similarité de Jaccard estimée à partir de
+                laquelle deux textes sont des quasi-doublons
+            ngram (int): Taille des n-grammes de caractères
+            num_perm (int): Taille des signatures MinHash
+            bands (int): Nombre de bandes LSH (doit diviser num_perm) ; plus
+                il y en a, plus les paires peu similaires sont examinées
+            seed (int): Graine des fonctions de hachage
+        """
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) doit diviser num_perm ({num_perm})")
+        self.threshold = threshold
+        self.ngram = ngram
+        self.num_perm = num_perm
+        self.bands = bands
+        self.seed = seed
+        self.texts = []
+        self.labels = []
+        self.signatures = None
+        self.cluster_ids = None
+
+    def fit(self, texts, labels=None):
+        """
+        Indexe un corpus et calcule les groupes de quasi-doublons.
+
+        Args:
+            texts (list of str): Textes
+            labels (list): Label de chaque texte (optionnel)
+
+        Returns:
+            NearDuplicateIndex: self
+        """
+        self.texts = list(texts)
+        self.labels = list(labels) if labels is not None else [None] * len(self.texts)
+        normalized = TextNormalizer(fold_accents=True).normalize_many(self.texts)
+        self.signatures = minhash_signatures(normalized, self.num_perm, self.ngram, self.seed)
+        n = len(self.texts)
+        sources, targets = self._candidate_edges()
+        graph = coo_matrix((np.ones(len(sources), dtype=np.int8), (sources, targets)), shape=(n, n))
+        _, self.cluster_ids = connected_components(graph, directed=False)
+        return self
+
+    def _candidate_edges(self):
+        """Paires (texte, premier texte du seau) retenues par LSH et vérifiées."""
+        n = len(self.texts)
+        rows = self.num_perm // self.bands
+        positions = np.arange(n)
+        sources, targets = [], []
+        for band in range(self.bands):
+            block = np.ascontiguousarray(self.signatures[:, band * rows:(band + 1) * rows])
+            keys = block.view(np.dtype((np.void, block.itemsize * rows))).ravel()
+            _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            representatives = first[inverse.ravel()]
+            candidates = positions[representatives != positions]
+            if not len(candidates):
+                continue
+            heads = representatives[candidates]
+            similarity = (self.signatures[candidates] == self.signatures[heads]).mean(axis=1)
+            keep = similarity >= self.threshold
+            sources.append(candidates[keep])
+            targets.append(heads[keep])
+        if not sources:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(sources), np.concatenate(targets)
+
+    def similarity(self, i, j):
+        """Similarité de Jaccard estimée entre les textes i et j."""
+        return float((self.signatures[i] == self.signatures[j]).mean())
+
+    def clusters(self, min_size=2):
+        """
+        Groupes de quasi-doublons, du plus grand au plus petit.
+
+        Args:
+            min_size (int): Taille minimale des groupes retournés
+
+        Returns:
+            list of list of int: Indices des textes de chaque groupe
+        """
+        order = np.argsort(self.cluster_ids, kind='stable')
+        sizes = np.bincount(self.cluster_ids)
+        groups = np.split(order, np.cumsum(sizes)[:-1])
+        groups = [group.tolist() for group in groups if len(group) >= min_size]
+        groups.sort(key=len, reverse=True)
+        return groups
+
+    def collisions(self):
+        """
+        Groupes de quasi-doublons portant plusieurs labels.
+
+        Returns:
+            list of dict: {'indices': [...], 'labels': {label: nombre}}, du
+                plus grand groupe au plus petit
+        """
+        report = []
+        for group in self.clusters():
+            labels = Counter(self.labels[i] for i in group)
+            if len(labels) > 1:
+                report.append({'indices': group, 'labels': dict(labels.most_common())})
+        return report
+
+    def prune(self, target_size=None):
+        """
+        Sélectionne un sous-corpus sans quasi-doublons superflus.
+
+        Les textes sont classés par rang dans leur groupe (par intention :
+        une collision entre intentions n'est jamais résolue ici), puis à
+        tour de rôle entre intentions pour garder le corpus équilibré. Sans
+        taille cible, un représentant par groupe et par intention est gardé ;
+        au-delà, les doublons suivants complètent la sélection.
+
+        Args:
+            target_size (int): Nombre de textes à garder (None : un par groupe)
+
+        Returns:
+            list of int: Indices gardés, dans l'ordre du corpus
+        """
+        n = len(self.texts)
+        if not n:
+            return []
+        _, label_ids = np.unique(np.array(self.labels, dtype=object).astype(str), return_inverse=True)
+        label_ids = label_ids.ravel()
+        n_labels = int(label_ids.max()) + 1
+        rank = _rank_within(self.cluster_ids.astype(np.int64) * n_labels + label_ids)
+        turn = _rank_within(rank * n_labels + label_ids)
+        if target_size is None:
+            target_size = int((rank == 0).sum())
+        order = np.lexsort((np.arange(n), turn, rank))
+        return np.sort(order[:target_size]).tolist()
+
+    def summary(self):
+        """
+        Statistiques de l'index.
+
+        Returns:
+            dict: Nombre de textes, de groupes, de quasi-doublons et de collisions
+        """
+        n_clusters = int(self.cluster_ids.max()) + 1 if len(self.texts) else 0
+        return {
+            'texts': len(self.texts),
+            'clusters': n_clusters,
+            'duplicates': len(self.texts) - n_clusters,
+            'collisions': len(self.collisions()),
+        }
+
+
+def _rank_within(groups):
+    """Position de chaque élément parmi ceux de son groupe, dans l'ordre du tableau."""
+    order = np.argsort(groups, kind='stable')
+    sorted_groups = groups[order]
+    starts = np.concatenate(([0], np.nonzero(np.diff(sorted_groups))[0] + 1))
+    lengths = np.diff(np.concatenate((starts, [len(groups)])))
+    rank = np.empty(len(groups), dtype=np.int64)
+    rank[order] = np.arange(len(groups)) - np.repeat(starts, lengths)
+    return rank
+
+
+def write_examples(path, texts, labels):
+    """Écrit des exemples en JSONL ({"text", "intent"}) ou au format de dataset.yaml."""
+    with open(path, 'w', encoding='utf-8') as file:
+        if path.endswith('.jsonl'):
+            for text, label in zip(texts, labels):
+                file.write(json.dumps({'text': text, 'intent': label}, ensure_ascii=False) + "\n")
+            return
+        import yaml
+        intentions = {}
+        for text, label in zip(texts, labels):
+            intentions.setdefault(label, []).append(text)
+        yaml.safe_dump({'intentions': intentions}, file, allow_unicode=True, sort_keys=False,
+                       default_flow_style=False, width=float('inf'))
+
+
+def main():
+    from dataset_store import iter_examples
+
+    parser = argparse.ArgumentParser(description="Détecte et élague les quasi-doublons d'un dataset YAML/JSONL")
+    parser.add_argument('source', help="dataset.yaml ou corpus .jsonl")
+    parser.add_argument('--threshold', type=float, default=0.7, help="Similarité de Jaccard minimale")
+    parser.add_argument('--ngram', type=int, default=3)
+    parser.add_argument('--num-perm', type=int, default=64)
+    parser.add_argument('--bands', type=int, default=16)
+    parser.add_argument('--show', type=int, default=10, help="Nombre de collisions affichées")
+    parser.add_argument('--prune-to', type=int, help="Taille du corpus élagué (défaut: un texte par groupe)")
+    parser.add_argument('--output', help="Fichier élagué (.jsonl ou .yaml)")
+    args = parser.parse_args()
+
+    examples = list(iter_examples(args.source))
+    texts = [text for text, _ in examples]
+    labels = [label for _, label in examples]
+    start = time.perf_counter()
+    index = NearDuplicateIndex(args.threshold, args.ngram, args.num_perm, args.bands).fit(texts, labels)
+    elapsed = time.perf_counter() - start
+
+    summary = index.summary()
+    print(f"\n🔎 {summary['texts']} textes indexés en {elapsed:.2f} s")
+    print(f"  Groupes : {summary['clusters']} | quasi-doublons : {summary['duplicates']} "
+          f"| collisions entre intentions : {summary['collisions']}")
+
+    collisions = index.collisions()
+    if collisions and args.show:
+        print(f"\n⚠️  Collisions entre intentions ({min(args.show, len(collisions))} sur {len(collisions)})")
+        print("-" * 60)
+        for collision in collisions[:args.show]:
+            labels_desc = ", ".join(f"{label} ×{n}" for label, n in collision['labels'].items())
+            print(f"  [{labels_desc}]")
+            for i in collision['indices'][:5]:
+                print(f"    - {texts[i]!r} ({labels[i]})")
+
+    if args.output:
+        kept = index.prune(args.prune_to)
+        write_examples(args.output, [texts[i] for i in kept], [labels[i] for i in kept])
+        print(f"\n✅ {len(kept)} textes gardés sur {len(texts)} → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
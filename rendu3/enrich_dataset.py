@@ -1,146 +1,460 @@
-import yaml
+"""
+enrich_dataset
+==============
+
+Génération de phrases d'entraînement pour le dataset du chatbot.
+
+Chaque intention définit un espace de phrases énumérable :
+- des templates fixes (enrich_templates) et des templates à emplacements
+  (slot_templates, ex. "{first_name} commande {qty} {plat}") ;
+- des suffixes (suffixes, ex. " s'il vous plaît") ;
+- des réservoirs de valeurs par emplacement (prénoms, villes, dates,
+  heures, plats, quantités), générés par Faker avec une graine fixe.
+
+L'espace complet (templates x suffixes x valeurs) est indexé par un
+entier, décodé en base mixte. Les indices sont parcourus selon une
+permutation pseudo-aléatoire (réseau de Feistel) : le tirage est sans
+remise, aucun essai n'est perdu et la mémoire ne dépend pas de la taille
+de l'espace. Les doublons éventuels (deux templates produisant le même
+texte, exemples déjà présents) sont écartés par un ensemble d'empreintes.
+
+Les phrases sont écrites au fil de l'eau, par morceaux, en JSONL
+({"text", "intent"}) ou en YAML (format de dataset.yaml). Chaque intention
+peut être générée dans un processus séparé (fichiers partiels concaténés
+dans l'ordre des intentions). À graine égale, le résultat est identique
+quel que soit le nombre de processus.
+
+Dépendances :
+- faker
+- pyyaml
+
+Exemple d'utilisation :
+    $ python enrich_dataset.py                      # enrichit dataset.yaml (10 à 30 exemples/intention)
+    $ python enrich_dataset.py --output corpus.jsonl --per-intent 1000000 --jobs 6 --seed 42
+    >>> enrich_dataset("dataset.yaml", n_variants=50, seed=42)
+"""
+
+import argparse
+import bisect
+import datetime
+import hashlib
+import json
+import os
 import random
-from faker import Faker
+import string
+import tempfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 
-fake = Faker('fr_FR')
+import yaml
 
-# Synonymes et templates par intention (avec Faker)
+# Synonymes et templates fixes par intention
 enrich_templates = {
     "salutation": [
         "bonjour", "salut", "hello", "coucou", "bien le bonjour", "hey", "yo", "salutations",
         "bonsoir", "salut à tous", "bonjour tout le monde", "salut les amis", "bienvenue", "bonne journée", "bonne soirée",
         "salut à vous", "bonjour à tous", "salut tout le monde", "bonjour la compagnie", "salut la team", "bonjour à vous tous", "salut les copains", "bonjour à toutes et à tous", "salut la famille", "bonjour à la team", "salut à toi", "bonjour cher ami", "salut cher ami", "bonjour à tous et à toutes", "salut à toutes et à tous", "bonjour à toutes", "salut à toutes",
-        f"Bonjour {fake.first_name()}", f"Salut à {fake.city()}", f"Coucou {fake.first_name()} et {fake.first_name()} !", f"Hey la team {fake.city()} !"
     ],
     "menu": [
         "je veux voir le menu", "affichez la carte", "montrez-moi le menu", "quels sont vos plats", "que proposez-vous", "qu'est-ce qu'il y a à manger", "vos plats", "carte",
         "pouvez-vous me montrer la carte ?", "je voudrais consulter le menu", "qu'avez-vous à proposer ?", "quels sont les menus disponibles ?", "je souhaite voir la carte", "montrez-moi vos spécialités", "quels plats recommandez-vous ?",
         "je peux avoir la carte ?", "je veux voir ce que vous servez", "je souhaite voir vos plats", "montrez-moi la carte s'il vous plaît", "je veux consulter la carte", "je veux voir la liste des plats", "pouvez-vous afficher le menu ?", "je veux connaître vos menus", "je veux voir la carte du jour", "quels sont les plats du jour ?", "je veux voir la carte complète", "je veux voir la carte des boissons", "je veux voir la carte des desserts", "je veux voir la carte spéciale", "je veux voir la carte enfant",
-        f"{fake.first_name()} veut voir le menu", f"Quels plats à {fake.city()} ?", f"Menu spécial pour {fake.date(pattern='%d/%m/%Y')} ?"
     ],
     "commande": [
         "je veux commander une pizza", "je commande une pizza", "j'aimerais commander", "je voudrais commander", "puis-je passer une commande", "je passe commande", "commande pour deux personnes", "je souhaite commander un menu",
         "je voudrais commander à emporter", "je veux passer commande", "je souhaite réserver une commande", "je commande pour ce soir", "je veux commander une boisson", "je passe une commande groupée", "je veux commander un dessert",
         "je veux commander une salade", "je veux commander une entrée", "je veux commander un plat principal", "je veux commander un menu enfant", "je veux commander une pizza à emporter", "je veux commander pour ce midi", "je veux commander pour ce soir", "je veux commander pour demain", "je veux commander pour une fête", "je veux commander pour un anniversaire", "je veux commander pour un événement", "je veux commander pour une réunion", "je veux commander pour une soirée", "je veux commander pour un déjeuner", "je veux commander pour un dîner",
-        f"{fake.first_name()} commande {random.randint(1, 5)} pizza(s)", f"Commande de {random.randint(1, 5)} pizza(s) à {fake.time(pattern='%H:%M')}"
     ],
     "horaires": [
         "quels sont vos horaires", "à quelle heure ouvrez-vous", "quand fermez-vous", "heures d'ouverture", "c'est ouvert le dimanche", "vos horaires", "à quelle heure fermez-vous le soir",
         "êtes-vous ouverts aujourd'hui ?", "vos horaires d'ouverture le week-end ?", "à quelle heure fermez-vous le samedi ?", "quand puis-je venir ?", "êtes-vous ouverts ce soir ?", "vos heures d'ouverture ?", "à quelle heure commencez-vous à servir ?",
         "quels sont vos horaires d'ouverture ?", "quels sont vos horaires de fermeture ?", "à quelle heure puis-je venir ?", "à quelle heure puis-je commander ?", "à quelle heure commence le service ?", "à quelle heure se termine le service ?", "êtes-vous ouverts en semaine ?", "êtes-vous ouverts le soir ?", "êtes-vous ouverts le midi ?", "êtes-vous ouverts les jours fériés ?", "êtes-vous ouverts pendant les vacances ?", "vos horaires pendant les vacances ?", "vos horaires spéciaux ?", "vos horaires exceptionnels ?", "vos horaires pour les fêtes ?",
-        f"À quelle heure ouvrez-vous le {fake.date(pattern='%d/%m/%Y')} ?", f"Êtes-vous ouverts à {fake.time(pattern='%H:%M')} ?"
     ],
     "prix": [
         "combien coûte une pizza", "quel est le prix", "c'est combien", "prix d'une pizza", "tarif", "combien ça coûte", "coût",
         "quel est le tarif d'un menu ?", "combien pour une boisson ?", "c'est combien la livraison ?", "quel est le prix d'un dessert ?", "combien dois-je payer ?", "quel est le prix total ?", "combien pour deux menus ?",
         "combien coûte un menu enfant ?", "combien coûte un menu complet ?", "combien coûte une entrée ?", "combien coûte un plat principal ?", "combien coûte un dessert ?", "combien coûte une boisson ?", "combien coûte une pizza spéciale ?", "combien coûte une pizza margherita ?", "combien coûte une pizza 4 fromages ?", "combien coûte une pizza royale ?", "combien coûte une pizza végétarienne ?", "combien coûte une pizza napolitaine ?", "combien coûte une pizza calzone ?", "combien coûte une pizza pepperoni ?", "combien coûte une pizza hawaïenne ?",
-        f"Quel est le prix d'une pizza {random.choice(['margherita', 'royale', 'calzone', 'pepperoni'])} ?", f"Combien pour {random.randint(1, 5)} pizzas ?"
     ],
     "au_revoir": [
         "au revoir", "bye", "merci", "bonne journée", "à bientôt", "à la prochaine", "bonne soirée",
         "merci beaucoup", "bonne continuation", "à plus tard", "à la prochaine fois", "bonne fin de journée", "merci et au revoir", "à plus",
         "bonne nuit", "à tout à l'heure", "à une prochaine fois", "merci pour tout", "merci et bonne journée", "merci et bonne soirée", "merci et à bientôt", "merci et à la prochaine", "merci et bonne continuation", "merci et à plus tard", "merci et à plus", "merci et bonne fin de journée", "merci et à une prochaine fois", "merci et à tout à l'heure", "merci et bonne nuit",
-        f"Merci {fake.first_name()} !", f"Bonne journée à {fake.city()} !"
     ]
 }
 
-def faker_phrase(intent):
-    """Génère une phrase réaliste avec Faker selon l'intention."""
-    plats = [
-        "pizza margherita", "pizza 4 fromages", "pizza royale", "pizza végétarienne", "pizza napolitaine", "pizza calzone", "pizza pepperoni", "pizza hawaïenne", "salade César", "tarte aux pommes", "tiramisu", "coca-cola", "jus d'orange", "eau minérale", "menu enfant", "menu complet", "entrée du jour", "plat du jour", "dessert du jour"
+# Templates à emplacements par intention (valeurs tirées des réservoirs de slot_pools)
+slot_templates = {
+    "salutation": [
+        "Bonjour {first_name}", "Salut à {city}", "Coucou {first_name} et {first_name} !", "Hey la team {city} !"
+    ],
+    "menu": [
+        "{first_name} veut voir le menu", "Quels plats à {city} ?", "Menu spécial pour {date} ?"
+    ],
+    "commande": [
+        "{first_name} commande {qty} {plat}", "Commande de {qty} {plat} à {time}"
+    ],
+    "horaires": [
+        "À quelle heure ouvrez-vous le {date} ?", "Êtes-vous ouverts à {time} ?"
+    ],
+    "prix": [
+        "Quel est le prix d'une {plat} ?", "Combien pour {qty} {plat} ?"
+    ],
+    "au_revoir": [
+        "Merci {first_name} !", "Bonne journée à {city} !"
     ]
-    if intent == "salutation":
-        return random.choice([
-            f"Bonjour {fake.first_name()}",
-            f"Salut à {fake.city()}",
-            f"Coucou {fake.first_name()} et {fake.first_name()} !",
-            f"Hey la team {fake.city()} !"
-        ])
-    if intent == "menu":
-        return random.choice([
-            f"{fake.first_name()} veut voir le menu",
-            f"Quels plats à {fake.city()} ?",
-            f"Menu spécial pour {fake.date(pattern='%d/%m/%Y')} ?"
-        ])
-    if intent == "commande":
-        return random.choice([
-            f"{fake.first_name()} commande {random.randint(1, 5)} {random.choice(plats)}",
-            f"Commande de {random.randint(1, 5)} {random.choice(plats)} à {fake.time(pattern='%H:%M')}"
-        ])
-    if intent == "horaires":
-        return random.choice([
-            f"À quelle heure ouvrez-vous le {fake.date(pattern='%d/%m/%Y')} ?",
-            f"Êtes-vous ouverts à {fake.time(pattern='%H:%M')} ?"
-        ])
-    if intent == "prix":
-        return random.choice([
-            f"Quel est le prix d'une {random.choice(plats)} ?",
-            f"Combien pour {random.randint(1, 5)} {random.choice(plats)} ?"
-        ])
-    if intent == "au_revoir":
-        return random.choice([
-            f"Merci {fake.first_name()} !",
-            f"Bonne journée à {fake.city()} !"
-        ])
-    return ""
-
-def enrich_dataset(yaml_path, n_variants=12, max_attempts_per_intent=1000):
+}
+
+# Suffixes ajoutés aux phrases ("" : phrase telle quelle)
+suffixes = {
+    "commande": ["", " s'il vous plaît", " pour emporter", " pour ce soir"],
+    "salutation": ["", " à tous", " tout le monde"],
+    "menu": ["", " s'il vous plaît"],
+}
+
+plats = [
+    "pizza margherita", "pizza 4 fromages", "pizza royale", "pizza végétarienne", "pizza napolitaine", "pizza calzone", "pizza pepperoni", "pizza hawaïenne", "salade César", "tarte aux pommes", "tiramisu", "coca-cola", "jus d'orange", "eau minérale", "menu enfant", "menu complet", "entrée du jour", "plat du jour", "dessert du jour"
+]
+
+
+def slot_pools(seed=0, pool_size=500):
+    """
+    Construit les réservoirs de valeurs des emplacements.
+
+    Args:
+        seed (int): Graine de Faker
+        pool_size (int): Nombre maximal de valeurs distinctes pour les
+            prénoms, villes et dates
+
+    Returns:
+        dict: {emplacement: liste de valeurs distinctes}
+    """
+    from faker import Faker
+
+    generator = Faker('fr_FR')
+    generator.seed_instance(seed)
+
+    def unique(factory):
+        values = dict.fromkeys(factory() for _ in range(pool_size * 4))
+        return list(values)[:pool_size]
+
+    start = datetime.date(2024, 1, 1)
+    return {
+        'first_name': unique(generator.first_name),
+        'city': unique(generator.city),
+        'date': [(start + datetime.timedelta(days=day)).strftime('%d/%m/%Y') for day in range(pool_size)],
+        'time': [f"{hour:02d}:{minute:02d}" for hour in range(24) for minute in range(60)],
+        'plat': list(plats),
+        'qty': [str(qty) for qty in range(1, 6)],
+    }
+
+
+class TemplateSpace:
+    """
+    Espace énumérable des phrases d'une intention.
+
+    L'indice i ∈ [0, len(space)) désigne un template (par décalages
+    cumulés), puis un suffixe et une valeur par emplacement (base mixte).
+    """
+
+    def __init__(self, templates, suffix_list, pools):
+        """
+        Args:
+            templates (list of str): Templates fixes ou à emplacements
+            suffix_list (list of str): Suffixes possibles
+            pools (dict): Réservoirs de valeurs (voir slot_pools)
+        """
+        self.suffixes = list(suffix_list) or [""]
+        self.templates = []
+        self.offsets = []
+        size = 0
+        for template in templates:
+            literals, slots = [], []
+            for literal, field, _, _ in string.Formatter().parse(template):
+                literals.append(literal)
+                if field is not None:
+                    slots.append(field)
+            # Un template qui se termine par un emplacement n'a pas de littéral
+            # final : chaque emplacement doit être suivi d'un littéral (éventuellement vide)
+            literals += [''] * (len(slots) + 1 - len(literals))
+            radices = [len(pools[slot]) for slot in slots]
+            count = len(self.suffixes)
+            for radix in radices:
+                count *= radix
+            self.templates.append((literals, [pools[slot] for slot in slots], radices))
+            self.offsets.append(size)
+            size += count
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        position = bisect.bisect_right(self.offsets, index) - 1
+        literals, values, radices = self.templates[position]
+        index -= self.offsets[position]
+        index, suffix = divmod(index, len(self.suffixes))
+        parts = [literals[0]]
+        for pool, radix, literal in zip(values, radices, literals[1:]):
+            index, digit = divmod(index, radix)
+            parts.append(pool[digit])
+            parts.append(literal)
+        parts.append(self.suffixes[suffix])
+        return "".join(parts)
+
+
+class IndexPermutation:
+    """
+    Permutation pseudo-aléatoire de range(n) sans table en mémoire.
+
+    Réseau de Feistel sur le plus petit domaine 4^k >= n, avec « cycle
+    walking » : les valeurs hors de [0, n) sont rechiffrées jusqu'à
+    retomber dans l'intervalle (au plus quelques tours en moyenne).
+    """
+
+    def __init__(self, n, seed=0, rounds=4):
+        self.n = n
+        bits = max(2, (n - 1).bit_length())
+        self.half = (bits + 1) // 2
+        self.mask = (1 << self.half) - 1
+        rng = random.Random(seed)
+        self.keys = [rng.getrandbits(64) for _ in range(rounds)]
+
+    def _round(self, value, key):
+        value = ((value ^ key) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        return (value ^ (value >> 31)) & self.mask
+
+    def __getitem__(self, index):
+        value = index
+        while True:
+            left, right = value >> self.half, value & self.mask
+            for key in self.keys:
+                left, right = right, left ^ self._round(right, key)
+            value = (left << self.half) | right
+            if value < self.n:
+                return value
+
+    def __iter__(self):
+        for index in range(self.n):
+            yield self[index]
+
+
+def intent_seed(seed, intent):
+    """Graine propre à une intention, stable d'un processus à l'autre."""
+    return (seed * 1_000_003 + zlib.crc32(intent.encode('utf-8'))) & 0xFFFFFFFF
+
+
+def _fingerprint(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+
+
+def intent_space(intent, seed=0, pool_size=500):
+    """Retourne l'espace de phrases d'une intention."""
+    templates = enrich_templates.get(intent, []) + slot_templates.get(intent, [])
+    return TemplateSpace(templates, suffixes.get(intent, [""]), slot_pools(seed, pool_size))
+
+
+def generate_intent(intent, count, seed=0, exclude=(), pool_size=500, max_candidates=None):
+    """
+    Génère jusqu'à `count` phrases distinctes pour une intention.
+
+    Args:
+        intent (str): Intention
+        count (int): Nombre de phrases souhaité
+        seed (int): Graine (réservoirs et ordre de parcours)
+        exclude (iterable of str): Phrases à ne pas produire (exemples existants)
+        pool_size (int): Taille des réservoirs de valeurs
+        max_candidates (int): Nombre maximal d'indices parcourus (None : tout l'espace)
+
+    Yields:
+        str: Phrases, dans un ordre pseudo-aléatoire reproductible
+    """
+    seed = intent_seed(seed, intent)
+    space = intent_space(intent, seed, pool_size)
+    seen = {_fingerprint(text) for text in exclude}
+    produced = 0
+    if count <= 0 or len(space) == 0:
+        return
+    for candidates, index in enumerate(IndexPermutation(len(space), seed)):
+        if produced >= count or (max_candidates is not None and candidates >= max_candidates):
+            return
+        text = space[index]
+        fingerprint = _fingerprint(text)
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        produced += 1
+        yield text
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _format_chunk(intent, chunk, fmt):
+    if fmt == 'jsonl':
+        return "".join(json.dumps({'text': text, 'intent': intent}, ensure_ascii=False) + "\n" for text in chunk)
+    dumped = yaml.safe_dump(chunk, allow_unicode=True, default_flow_style=False, width=float('inf'))
+    return "".join("  " + line + "\n" for line in dumped.splitlines())
+
+
+def _write_intent(intent, texts, path, fmt, chunk_size):
+    """Écrit les phrases d'une intention dans un fichier partiel ; retourne leur nombre."""
+    written = 0
+    with open(path, 'w', encoding='utf-8') as file:
+        for chunk in _chunked(texts, chunk_size):
+            file.write(_format_chunk(intent, chunk, fmt))
+            written += len(chunk)
+    return written
+
+
+def _generate_part(intent, base, count, seed, path, fmt, chunk_size, pool_size, max_candidates):
+    """Tâche d'un worker : exemples existants puis phrases générées d'une intention."""
+    def texts():
+        yield from base
+        yield from generate_intent(intent, count, seed, exclude=base, pool_size=pool_size,
+                                   max_candidates=max_candidates)
+    return _write_intent(intent, texts(), path, fmt, chunk_size)
+
+
+def generate_dataset(output, intents, per_intent, seed=0, fmt=None, base=None, jobs=1,
+                     chunk_size=10000, pool_size=500, max_candidates=None):
+    """
+    Génère un corpus et l'écrit au fil de l'eau.
+
+    Args:
+        output (str): Fichier de sortie (.jsonl ou .yaml)
+        intents (list of str): Intentions à générer, dans l'ordre d'écriture
+        per_intent (int | dict): Nombre de phrases générées par intention
+            (ou dictionnaire {intention: nombre})
+        seed (int): Graine globale
+        fmt (str): 'jsonl' ou 'yaml' (None : déduit de l'extension)
+        base (dict): Exemples existants par intention, écrits en premier et
+            exclus de la génération
+        jobs (int): Nombre de processus (une intention par tâche)
+        chunk_size (int): Nombre de phrases par écriture
+        pool_size (int): Taille des réservoirs de valeurs
+        max_candidates (int): Indices parcourus au plus par intention
+
+    Returns:
+        dict: Nombre de phrases écrites par intention
+    """
+    fmt = fmt or ('jsonl' if output.endswith('.jsonl') else 'yaml')
+    if fmt not in ('jsonl', 'yaml'):
+        raise ValueError(f"Format inconnu: {fmt!r} (attendu: 'jsonl' ou 'yaml')")
+    base = base or {}
+    if not isinstance(per_intent, dict):
+        per_intent = dict.fromkeys(intents, per_intent)
+    directory = os.path.dirname(os.path.abspath(output))
+    with tempfile.TemporaryDirectory(dir=directory) as parts_dir:
+        tasks = [(intent, list(base.get(intent, [])), per_intent.get(intent, 0), seed,
+                  os.path.join(parts_dir, f"{position:04d}.part"), fmt, chunk_size, pool_size, max_candidates)
+                 for position, intent in enumerate(intents)]
+        if jobs > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                counts = list(executor.map(_generate_part, *zip(*tasks)))
+        else:
+            counts = [_generate_part(*task) for task in tasks]
+
+        # Concaténation des fichiers partiels dans l'ordre des intentions
+        tmp_output = os.path.join(parts_dir, 'output')
+        with open(tmp_output, 'w', encoding='utf-8') as out:
+            if fmt == 'yaml':
+                out.write("intentions:\n")
+            for (intent, _, _, _, task_path, *_), count in zip(tasks, counts):
+                if fmt == 'yaml':
+                    # Une intention sans exemple est écrite comme liste vide (et non null)
+                    key = yaml.safe_dump(intent, allow_unicode=True).splitlines()[0]
+                    out.write(f"  {key}:{'' if count else ' []'}\n")
+                with open(task_path, 'r', encoding='utf-8') as part:
+                    while True:
+                        block = part.read(1 << 20)
+                        if not block:
+                            break
+                        out.write(block)
+        os.replace(tmp_output, output)
+    return dict(zip(intents, counts))
+
+
+def enrich_dataset(yaml_path, n_variants=12, max_attempts_per_intent=1000, seed=None, jobs=1):
+    """
+    Complète chaque intention du dataset jusqu'à `n_variants` exemples distincts.
+
+    Args:
+        yaml_path (str): Dataset YAML, réécrit en place
+        n_variants (int): Nombre d'exemples visé par intention
+        max_attempts_per_intent (int): Indices de l'espace parcourus au plus par intention
+        seed (int): Graine (None : tirage aléatoire)
+        jobs (int): Nombre de processus
+
+    Returns:
+        dict: Nombre d'exemples par intention après enrichissement
+    """
     print(f"\n📥 Lecture du dataset depuis {yaml_path} ...")
     with open(yaml_path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-
-    print(f"\n🚀 Début de l'enrichissement pour chaque intention...")
-    for intent, variants in enrich_templates.items():
-        print(f"\n➡️  Intention : '{intent}'")
-        if "intentions" not in data:
-            data["intentions"] = {}
-        if intent not in data["intentions"]:
-            data["intentions"][intent] = []
-        current = set(data["intentions"][intent])
-        print(f"   - Exemples existants : {len(current)}")
-        attempts = 0
-        while len(current) < n_variants and attempts < max_attempts_per_intent:
-            if random.random() < 0.25:
-                phrase = faker_phrase(intent)
-                print(f"   [Faker] {phrase}")
-            else:
-                phrase = random.choice(variants)
-                print(f"   [Template] {phrase}")
-            if intent == "commande":
-                phrase = random.choice([
-                    phrase,
-                    f"{phrase} s'il vous plaît",
-                    f"{phrase} pour emporter",
-                    f"{phrase} pour ce soir"
-                ])
-            elif intent == "salutation":
-                phrase = random.choice([
-                    phrase,
-                    f"{phrase} à tous",
-                    f"{phrase} tout le monde"
-                ])
-            elif intent == "menu":
-                phrase = random.choice([
-                    phrase,
-                    f"{phrase} s'il vous plaît"
-                ])
-            if phrase not in current:
-                print(f"   + Ajouté : {phrase}")
-            current.add(phrase)
-            attempts += 1
-        print(f"   → Total généré pour '{intent}' : {len(current)} exemples")
-        if len(current) < n_variants:
-            print(f"⚠️  Impossible de générer {n_variants} variantes uniques pour l'intention '{intent}'. Uniquement {len(current)} générées.")
-        data["intentions"][intent] = list(current)
-
-    print("\n💾 Enrichissement terminé, sauvegarde du dataset...")
-    with open(yaml_path, "w", encoding="utf-8") as f:
-        yaml.dump(data, f, allow_unicode=True, sort_keys=False)
+        data = yaml.safe_load(f) or {}
+    existing = {intent: list(dict.fromkeys(examples or []))
+                for intent, examples in (data.get("intentions") or {}).items()}
+    intents = list(existing) + [intent for intent in enrich_templates if intent not in existing]
+    missing = {intent: max(0, n_variants - len(existing.get(intent, []))) for intent in intents}
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+
+    print(f"\n🚀 Début de l'enrichissement pour chaque intention (graine {seed})...")
+    counts = generate_dataset(yaml_path, intents, missing, seed=seed, fmt='yaml', base=existing,
+                              jobs=jobs, max_candidates=max_attempts_per_intent)
+    for intent in intents:
+        current = len(existing.get(intent, []))
+        print(f"➡️  Intention '{intent}' : {current} existants + {counts[intent] - current} générés")
+        if counts[intent] < n_variants:
+            print(f"⚠️  Impossible de générer {n_variants} variantes uniques pour l'intention '{intent}'. "
+                  f"Uniquement {counts[intent]} générées.")
     print("✅ Dataset enrichi et sauvegardé !")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génération de phrases d'entraînement pour le chatbot")
+    parser.add_argument('--input', default="dataset.yaml", help="Dataset YAML de départ")
+    parser.add_argument('--output', help="Fichier généré (.jsonl ou .yaml) ; sans --output, "
+                                         "le dataset d'entrée est enrichi en place")
+    parser.add_argument('--per-intent', type=int, help="Phrases générées par intention (avec --output)")
+    parser.add_argument('--n-variants', type=int, help="Exemples visés par intention (enrichissement en place, "
+                                                       "défaut : entre 10 et 30)")
+    parser.add_argument('--no-base', action='store_true', help="Ne pas recopier les exemples existants")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--jobs', type=int, default=1, help="Processus (une intention par tâche)")
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--pool-size', type=int, default=500, help="Valeurs distinctes par emplacement Faker")
+    args = parser.parse_args()
+
+    if args.output is None:
+        variants = args.n_variants or random.randrange(10, 30)
+        print(f"\n==============================")
+        print(f"Enrichissement du dataset avec {variants} variantes par intention...")
+        print(f"==============================\n")
+        enrich_dataset(args.input, n_variants=variants, seed=args.seed, jobs=args.jobs)
+        return
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        existing = (yaml.safe_load(f) or {}).get("intentions") or {}
+    intents = list(existing) + [intent for intent in enrich_templates if intent not in existing]
+    seed = random.randrange(2 ** 32) if args.seed is None else args.seed
+    per_intent = args.per_intent if args.per_intent is not None else 1000
+    print(f"🚀 Génération de {per_intent} phrases x {len(intents)} intentions vers {args.output} (graine {seed})...")
+    counts = generate_dataset(args.output, intents, per_intent, seed=seed,
+                              base=None if args.no_base else existing, jobs=args.jobs,
+                              chunk_size=args.chunk_size, pool_size=args.pool_size)
+    for intent, count in counts.items():
+        print(f"   - {intent}: {count} phrases")
+    print(f"✅ {sum(counts.values())} phrases écrites dans {args.output}")
+
 
 if __name__ == "__main__":
-    variants = random.randrange(10, 30)
-    print(f"\n==============================")
-    print(f"Enrichissement du dataset avec {variants} variantes par intention...")
-    print(f"==============================\n")
-    enrich_dataset("dataset.yaml", n_variants=variants)
\ No newline at end of file
+    main()
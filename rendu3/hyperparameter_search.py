@@ -0,0 +1,326 @@
+"""
+hyperparameter_search
+=====================
+
+Recherche d'hyperparamètres pour le pipeline d'IntentClassifier.
+
+Ce module explore les paramètres du vectoriseur (n-grammes, taille du
+vocabulaire, sublinear_tf) et du classificateur (backends de
+CLASSIFIER_BACKENDS, régularisation) par recherche exhaustive
+(GridSearchCV) ou par divisions successives (HalvingGridSearchCV) :
+- les plis sont évalués en parallèle (n_jobs) ;
+- le pipeline utilise Pipeline(memory=...) : un vectoriseur de même
+  configuration n'est entraîné qu'une fois par pli, quel que soit le
+  nombre de classificateurs testés derrière lui ;
+- chaque configuration est ensuite réentraînée sur tout le dataset (en
+  parallèle) pour mesurer la taille du modèle sérialisé et sa latence par
+  message : predict([texte]) est chronométré message par message sur un
+  échantillon (médiane et 95e percentile), comme une requête isolée.
+
+Le tableau de résultats (CSV) contient l'exactitude, la latence et la
+taille de chaque configuration, et signale celles du front de Pareto
+(aucune autre configuration n'est à la fois plus précise, plus rapide et
+plus légère).
+
+Comme dans IntentClassifierEvaluator, la calibration des probabilités de
+SVC est désactivée pendant la recherche : l'exactitude n'utilise que predict.
+Les paramètres retenus doivent donc passer par deployable_params avant
+d'être appliqués à IntentClassifier, sinon predict_proba est indisponible.
+
+Dépendances :
+- scikit-learn
+- joblib
+- numpy
+
+Exemple d'utilisation :
+    $ python hyperparameter_search.py --strategy halving --n-jobs -1 --output search_results.csv
+
+    >>> search, rows = run_search(texts, labels)
+    >>> clf = IntentClassifier()
+    >>> clf.pipeline.set_params(**deployable_params(rows[0]['params']))  # réactive probability
+"""
+
+import argparse
+import csv
+import json
+import logging
+import pickle
+import tempfile
+import time
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import BaseEstimator, clone
+from sklearn.model_selection import GridSearchCV, StratifiedKFold
+
+from intent_classifier import CLASSIFIER_BACKENDS, IntentClassifier
+
+logger = logging.getLogger(__name__)
+
+# Stratégies de recherche disponibles
+STRATEGIES = ('grid', 'halving')
+
+# Colonnes du tableau de résultats
+RESULT_COLUMNS = ('rank', 'accuracy', 'accuracy_std', 'fit_time_s', 'latency_p50_us',
+                  'latency_p95_us', 'model_size_bytes', 'pareto', 'params')
+
+
+def default_param_grid():
+    """
+    Construit la grille de paramètres par défaut.
+
+    Returns:
+        list of dict: Grille au format de GridSearchCV (préfixes 'tfidf__' et 'classifier')
+    """
+    vectorizer = {
+        'tfidf__ngram_range': [(1, 1), (1, 2), (1, 3)],
+        'tfidf__max_features': [1000, 5000, None],
+        'tfidf__sublinear_tf': [False, True],
+    }
+    svc = CLASSIFIER_BACKENDS['svc']().set_params(probability=False)
+    return [
+        dict(vectorizer, classifier=[svc], classifier__C=[0.5, 1.0, 2.0]),
+        dict(vectorizer, classifier=[CLASSIFIER_BACKENDS['linear_svc']()]),
+        dict(vectorizer, classifier=[CLASSIFIER_BACKENDS['sgd']()], classifier__alpha=[1e-5, 1e-4, 1e-3]),
+        dict(vectorizer, classifier=[CLASSIFIER_BACKENDS['naive_bayes']()], classifier__alpha=[0.01, 0.1, 1.0]),
+    ]
+
+
+def base_pipeline(cache_dir):
+    """
+    Retourne le pipeline TF-IDF d'IntentClassifier, non entraîné, avec cache du vectoriseur.
+
+    Args:
+        cache_dir (str): Dossier de cache joblib
+
+    Returns:
+        Pipeline: Pipeline à explorer
+    """
+    pipeline = clone(IntentClassifier(vectorizer='tfidf').pipeline)
+    if 'classifier__probability' in pipeline.get_params():
+        pipeline.set_params(classifier__probability=False)
+    return pipeline.set_params(memory=cache_dir)
+
+
+def _make_search(estimator, param_grid, strategy, cv, n_jobs, random_state):
+    if strategy == 'grid':
+        return GridSearchCV(estimator, param_grid, scoring='accuracy', cv=cv, n_jobs=n_jobs)
+    # Import pour son effet de bord : active HalvingGridSearchCV dans sklearn.model_selection
+    from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+    from sklearn.model_selection import HalvingGridSearchCV
+    return HalvingGridSearchCV(estimator, param_grid, scoring='accuracy', cv=cv, n_jobs=n_jobs,
+                               factor=3, random_state=random_state)
+
+
+def _clone_params(params):
+    # Les estimateurs de la grille sont partagés : les cloner avant set_params
+    return {name: clone(value) if isinstance(value, BaseEstimator) else value
+            for name, value in params.items()}
+
+
+def deployable_params(params):
+    """
+    Prépare des paramètres issus de la recherche pour IntentClassifier.
+
+    La recherche désactive la calibration de SVC (probability=False) ; elle
+    est réactivée ici pour que predict_proba reste disponible.
+
+    Args:
+        params (dict): Paramètres d'une configuration (rows[i]['params'])
+
+    Returns:
+        dict: Paramètres applicables à IntentClassifier().pipeline
+    """
+    params = _clone_params(params)
+    for value in params.values():
+        if isinstance(value, BaseEstimator) and 'probability' in value.get_params():
+            value.set_params(probability=True)
+    return params
+
+
+def fit_candidate(estimator, params, texts, labels):
+    """
+    Entraîne une configuration sur tout le dataset.
+
+    Args:
+        estimator (Pipeline): Pipeline de base
+        params (dict): Paramètres de la configuration
+        texts (list of str): Phrases d'entraînement
+        labels (list of str): Intentions correspondantes
+
+    Returns:
+        Pipeline: Modèle entraîné (sans cache)
+    """
+    model = clone(estimator).set_params(**_clone_params(params))
+    model.fit(texts, labels)
+    return model.set_params(memory=None)
+
+
+def measure_candidate(model, texts, sample_size=200, repeats=3):
+    """
+    Mesure la latence par message et la taille d'un modèle entraîné.
+
+    Chaque message de l'échantillon est prédit seul (predict([texte])), comme
+    une requête isolée ; la meilleure des `repeats` mesures est retenue par
+    message.
+
+    Args:
+        model (Pipeline): Modèle entraîné
+        texts (list of str): Phrases dont l'échantillon est tiré
+        sample_size (int): Nombre de messages chronométrés
+        repeats (int): Nombre de mesures par message
+
+    Returns:
+        tuple: (latence médiane en secondes, 95e percentile en secondes,
+            taille sérialisée en octets)
+    """
+    step = max(1, len(texts) // sample_size)
+    sample = texts[::step][:sample_size]
+    latencies = []
+    for text in sample:
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            model.predict([text])
+            best = min(best, time.perf_counter() - start)
+        latencies.append(best)
+    p50, p95 = np.percentile(latencies, [50, 95])
+    return float(p50), float(p95), len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def pareto_front(rows, maximize=('accuracy',), minimize=('latency_p50_us', 'model_size_bytes')):
+    """
+    Marque les configurations non dominées (champ 'pareto').
+
+    Args:
+        rows (list of dict): Résultats
+        maximize (tuple): Colonnes à maximiser
+        minimize (tuple): Colonnes à minimiser
+    """
+    def key(row):
+        return [row[column] for column in maximize] + [-row[column] for column in minimize]
+
+    keys = [np.array(key(row)) for row in rows]
+    for row, own in zip(rows, keys):
+        row['pareto'] = not any(np.all(other >= own) and np.any(other > own) for other in keys)
+
+
+def _describe(params):
+    """Représentation JSON lisible des paramètres (les estimateurs par leur repr)."""
+    return json.dumps({
+        name: repr(value) if isinstance(value, BaseEstimator) else value
+        for name, value in sorted(params.items())
+    }, default=repr, ensure_ascii=False)
+
+
+def run_search(texts, labels, param_grid=None, strategy='grid', n_splits=5, n_jobs=-1,
+               cache_dir=None, random_state=42):
+    """
+    Lance la recherche puis mesure latence et taille de chaque configuration.
+
+    Args:
+        texts (list of str): Phrases d'entraînement
+        labels (list of str): Intentions correspondantes
+        param_grid (list of dict): Grille (None : default_param_grid())
+        strategy (str): 'grid' ou 'halving'
+        n_splits (int): Nombre de plis stratifiés
+        n_jobs (int): Nombre de processus (-1 : tous les cœurs)
+        cache_dir (str): Dossier de cache du vectoriseur (None : dossier temporaire)
+        random_state (int): Graine des découpages
+
+    Returns:
+        tuple: (objet de recherche entraîné, lignes de résultats triées par rang)
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Stratégie inconnue: {strategy!r} (disponibles: {list(STRATEGIES)})")
+    if cache_dir is None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            return run_search(texts, labels, param_grid, strategy, n_splits, n_jobs, tmp_dir, random_state)
+
+    estimator = base_pipeline(cache_dir)
+    cv = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    search = _make_search(estimator, param_grid or default_param_grid(), strategy, cv, n_jobs, random_state)
+    logger.info("[HyperparameterSearch] Recherche '%s' sur %d exemples...", strategy, len(texts))
+    search.fit(texts, labels)
+
+    results = search.cv_results_
+    if strategy == 'halving':
+        # Ne garder que la dernière itération atteinte par chaque configuration
+        last = {}
+        for index, params in enumerate(results['params']):
+            last[_describe(params)] = index
+        indices = sorted(last.values())
+    else:
+        indices = range(len(results['params']))
+
+    # Réentraînements en parallèle ; latences mesurées ensuite une configuration
+    # à la fois, pour ne pas chronométrer des processus en concurrence
+    indices = list(indices)
+    logger.info("[HyperparameterSearch] Réentraînement de %d configurations...", len(indices))
+    models = Parallel(n_jobs=n_jobs)(
+        delayed(fit_candidate)(estimator, results['params'][index], texts, labels) for index in indices)
+    rows = []
+    for index, model in zip(indices, models):
+        p50, p95, size = measure_candidate(model, texts)
+        rows.append({
+            'accuracy': float(results['mean_test_score'][index]),
+            'accuracy_std': float(results['std_test_score'][index]),
+            'fit_time_s': float(results['mean_fit_time'][index]),
+            'latency_p50_us': p50 * 1e6,
+            'latency_p95_us': p95 * 1e6,
+            'model_size_bytes': size,
+            'params': results['params'][index],
+        })
+    pareto_front(rows)
+    rows.sort(key=lambda row: (-row['accuracy'], row['latency_p50_us']))
+    for rank, row in enumerate(rows, start=1):
+        row['rank'] = rank
+    logger.info("[HyperparameterSearch] %d configurations évaluées, %d sur le front de Pareto",
+                len(rows), sum(row['pareto'] for row in rows))
+    return search, rows
+
+
+def write_results(rows, path):
+    """
+    Écrit le tableau de résultats au format CSV.
+
+    Args:
+        rows (list of dict): Résultats de run_search
+        path (str): Fichier CSV de sortie
+    """
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=RESULT_COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(dict(row, params=_describe(row['params'])))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recherche d'hyperparamètres pour IntentClassifier")
+    parser.add_argument('--dataset', default='dataset.yaml')
+    parser.add_argument('--strategy', choices=STRATEGIES, default='grid')
+    parser.add_argument('--n-splits', type=int, default=5)
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    parser.add_argument('--cache-dir', default=None, help="Cache du vectoriseur (défaut: dossier temporaire)")
+    parser.add_argument('--output', default='search_results.csv')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    from rendu3 import load_training_data
+
+    texts, labels = load_training_data(args.dataset)
+    _, rows = run_search(texts, labels, strategy=args.strategy, n_splits=args.n_splits,
+                         n_jobs=args.n_jobs, cache_dir=args.cache_dir)
+    write_results(rows, args.output)
+
+    print(f"\n📊 {len(rows)} configurations, résultats dans '{args.output}'")
+    print("-" * 80)
+    print("Front de Pareto (exactitude / latence / taille) :")
+    for row in rows:
+        if row['pareto']:
+            print(f"  #{row['rank']:<4} acc={row['accuracy']:.3f}  {row['latency_p50_us']:8.1f} µs/msg (p95 {row['latency_p95_us']:.1f})  "
+                  f"{row['model_size_bytes'] / 1024:8.1f} Ko  {_describe(row['params'])}")
+
+
+if __name__ == "__main__":
+    main()
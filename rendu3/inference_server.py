@@ -0,0 +1,448 @@
+"""
+inference_server
+================
+
+Serveur HTTP asynchrone (asyncio) exposant le pipeline d'intentions rendu3.
+
+Endpoints :
+- POST /classify : {"text": "..."} ou {"texts": [...]} → intention, confiance et top-k
+- POST /analyze : {"text": "..."} → analyse linguistique complète (NLPProcessor)
+- GET /ready : 200 quand le modèle est chargé, 503 sinon
+- GET /health : 200 tant que le serveur répond
+- GET /metrics : mesures du module instrumentation (texte Prometheus,
+  ou JSON avec ?format=json)
+
+Les appels aux modèles (CPU) sont exécutés dans des pools de threads
+bornés, un pour la classification et un pour /analyze. Les requêtes
+/classify arrivant à quelques millisecondes d'intervalle sont regroupées
+(micro-batching) et partagent un seul appel à
+IntentClassifier.classify_batch, donc un seul predict_proba ; jusqu'à
+--workers lots sont traités en parallèle.
+
+Dépendances :
+- asyncio (bibliothèque standard)
+- TextPreprocessor, intent_classifier, nlp_processor
+
+Exemple d'utilisation :
+    $ python inference_server.py --port 8080
+    $ curl -X POST localhost:8080/classify -d '{"text": "Bonjour !"}'
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import instrumentation
+
+logger = logging.getLogger(__name__)
+
+# Taille maximale acceptée pour le corps d'une requête
+MAX_BODY_SIZE = 1024 * 1024
+
+
+class MicroBatcher:
+    """
+    Regroupe les messages soumis dans un court intervalle en un seul lot.
+
+    Attributs:
+        func (callable): Fonction appelée sur une liste de messages et
+            retournant une liste de résultats dans le même ordre.
+        max_batch_size (int): Taille maximale d'un lot.
+        max_delay (float): Attente maximale (secondes) avant l'envoi d'un lot.
+    """
+
+    def __init__(self, func, executor, max_batch_size=64, max_delay=0.005, max_pending=4096, max_concurrency=1):
+        """
+        Initialise le micro-batcher.
+
+        Args:
+            func (callable): Traitement d'un lot (exécuté dans `executor`)
+            executor (Executor): Pool d'exécution des traitements
+            max_batch_size (int): Taille maximale d'un lot
+            max_delay (float): Attente maximale en secondes après le premier message
+            max_pending (int): Nombre maximal de messages en attente (contre-pression)
+            max_concurrency (int): Nombre maximal de lots traités simultanément
+                (en général le nombre de threads de `executor`)
+        """
+        self.func = func
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.max_concurrency = max_concurrency
+        self._queue = asyncio.Queue(maxsize=max_pending)
+        self._slots = None
+        self._task = None
+        self._running = set()
+        self.batches = 0
+        self.items = 0
+
+    def start(self):
+        """Démarre la tâche de regroupement."""
+        if self._task is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Arrête la tâche de regroupement."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._running):
+            task.cancel()
+        await asyncio.gather(*self._running, return_exceptions=True)
+
+    async def submit(self, item):
+        """
+        Soumet un message et attend son résultat.
+
+        Args:
+            item: Message à traiter
+
+        Returns:
+            Le résultat de `func` pour ce message
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Un lot n'est formé que lorsqu'un worker est libre : pendant que
+            # tous sont occupés, les messages s'accumulent et le lot suivant grossit
+            await self._slots.acquire()
+            try:
+                batch = [await self._queue.get()]
+            except asyncio.CancelledError:
+                self._slots.release()
+                raise
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self.batches += 1
+            self.items += len(batch)
+            task = loop.create_task(self._dispatch(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _dispatch(self, batch):
+        """Traite un lot dans l'executor et libère son emplacement."""
+        try:
+            items = [item for item, _ in batch]
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(self.executor, self.func, items)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+
+
+class InferenceService:
+    """
+    État du service : modèles chargés, pool d'exécution et micro-batcher.
+    """
+
+    def __init__(self, dataset_path='dataset.yaml', model_path=None, workers=2,
+                 max_batch_size=64, max_delay=0.005, top_k=3, enable_nlp=True, nlp_workers=1):
+        """
+        Initialise le service (les modèles sont chargés par start()).
+
+        Args:
+            dataset_path (str): Dataset YAML utilisé si le modèle doit être entraîné
+            model_path (str): Fichier de modèle (None : chemin par défaut de rendu3)
+            workers (int): Nombre de threads (et de micro-lots simultanés) pour la classification
+            max_batch_size (int): Taille maximale d'un micro-lot
+            max_delay (float): Attente maximale d'un micro-lot en secondes
+            top_k (int): Nombre d'intentions candidates retournées
+            enable_nlp (bool): Activer /analyze (chargement de spaCy)
+            nlp_workers (int): Nombre de threads réservés à /analyze, pour que
+                les analyses spaCy lentes ne bloquent pas la classification
+        """
+        self.dataset_path = dataset_path
+        self.model_path = model_path
+        self.top_k = top_k
+        self.enable_nlp = enable_nlp
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inference")
+        self.nlp_executor = ThreadPoolExecutor(max_workers=nlp_workers, thread_name_prefix="nlp")
+        self.batcher = MicroBatcher(self._classify_batch, self.executor, max_batch_size=max_batch_size,
+                                    max_delay=max_delay, max_concurrency=workers)
+        self.preprocessor = None
+        self.classifier = None
+        self.nlp = None
+        self.nlp_error = None
+        self.load_error = None
+        self.load_time = None
+        self.started_at = time.time()
+
+    @property
+    def ready(self):
+        return self.classifier is not None
+
+    async def start(self):
+        """Démarre le micro-batcher et lance le chargement des modèles en arrière-plan."""
+        self.batcher.start()
+        asyncio.get_running_loop().create_task(self._load_models())
+
+    async def stop(self):
+        await self.batcher.stop()
+        self.executor.shutdown(wait=False)
+        self.nlp_executor.shutdown(wait=False)
+
+    async def _load_models(self):
+        loop = asyncio.get_running_loop()
+        try:
+            self.preprocessor, self.classifier, self.load_time = await loop.run_in_executor(
+                self.executor, self._load_classifier)
+            logger.info("[InferenceService] Modèle d'intentions prêt (%.2f s)", self.load_time)
+        except Exception as e:
+            self.load_error = repr(e)
+            logger.exception("[InferenceService] Échec du chargement du modèle")
+            return
+        if self.enable_nlp:
+            try:
+                self.nlp = await loop.run_in_executor(self.nlp_executor, self._load_nlp)
+                logger.info("[InferenceService] Analyse NLP prête")
+            except Exception as e:
+                self.nlp_error = repr(e)
+                logger.warning("[InferenceService] Analyse NLP indisponible: %s", e)
+
+    def _load_classifier(self):
+        from rendu3 import MODEL_PATH, load_or_train, load_training_data
+        from TextPreprocessor import TextPreprocessor
+
+        start = time.perf_counter()
+        texts, labels = load_training_data(self.dataset_path)
+        classifier = load_or_train(texts, labels, self.model_path or MODEL_PATH)
+        preprocessor = TextPreprocessor(download_resources=False)
+        return preprocessor, classifier, time.perf_counter() - start
+
+    def _load_nlp(self):
+        from nlp_processor import NLPProcessor
+        return NLPProcessor()
+
+    def _classify_batch(self, texts):
+        with instrumentation.request('server.classify_batch'):
+            instrumentation.count('server.batches')
+            return self.classifier.classify_batch(self.preprocessor.normalize_batch(texts), top_k=self.top_k)
+
+    async def classify(self, texts):
+        return await asyncio.gather(*(self.batcher.submit(text) for text in texts))
+
+    async def analyze(self, text):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.nlp_executor, self.nlp.full_analysis, text, False)
+
+    def readiness(self):
+        return {
+            'ready': self.ready,
+            'model_loaded': self.classifier is not None,
+            'model_load_seconds': self.load_time,
+            'model_error': self.load_error,
+            'nlp_loaded': self.nlp is not None,
+            'nlp_error': self.nlp_error,
+            'batches': self.batcher.batches,
+            'batched_items': self.batcher.items,
+            'uptime_seconds': time.time() - self.started_at
+        }
+
+
+class HTTPError(Exception):
+    """Erreur HTTP renvoyée au client."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _parse_json(body):
+    try:
+        payload = json.loads(body or b'{}')
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Corps JSON invalide")
+    if not isinstance(payload, dict):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Un objet JSON est attendu")
+    return payload
+
+
+async def handle_request(service, method, path, body):
+    """
+    Traite une requête et retourne (statut, objet JSON).
+
+    Args:
+        service (InferenceService): Service d'inférence
+        method (str): Méthode HTTP
+        path (str): Chemin demandé
+        body (bytes): Corps de la requête
+    """
+    path, _, query = path.partition('?')
+    if path == '/health' and method == 'GET':
+        return HTTPStatus.OK, {'status': 'ok'}
+    if path == '/metrics' and method == 'GET':
+        if 'format=json' in query.split('&'):
+            return HTTPStatus.OK, instrumentation.snapshot()
+        return HTTPStatus.OK, instrumentation.export_prometheus()
+    if path == '/ready' and method == 'GET':
+        status = HTTPStatus.OK if service.ready else HTTPStatus.SERVICE_UNAVAILABLE
+        return status, service.readiness()
+    if path == '/classify' and method == 'POST':
+        if not service.ready:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Modèle en cours de chargement")
+        payload = _parse_json(body)
+        if isinstance(payload.get('text'), str):
+            return HTTPStatus.OK, (await service.classify([payload['text']]))[0]
+        texts = payload.get('texts')
+        if isinstance(texts, list) and all(isinstance(text, str) for text in texts):
+            return HTTPStatus.OK, {'results': await service.classify(texts)}
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Champ 'text' (str) ou 'texts' (list of str) attendu")
+    if path == '/analyze' and method == 'POST':
+        if service.nlp is None:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, service.nlp_error or "Analyse NLP indisponible")
+        payload = _parse_json(body)
+        if not isinstance(payload.get('text'), str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Champ 'text' (str) attendu")
+        return HTTPStatus.OK, await service.analyze(payload['text'])
+    if path in ('/health', '/metrics', '/ready', '/classify', '/analyze'):
+        raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Méthode non autorisée")
+    raise HTTPError(HTTPStatus.NOT_FOUND, "Ressource inconnue")
+
+
+async def _write_response(writer, status, payload, keep_alive):
+    if isinstance(payload, str):
+        # Texte brut (format d'exposition Prometheus)
+        body = payload.encode('utf-8')
+        content_type = "text/plain; version=0.0.4; charset=utf-8"
+    else:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        content_type = "application/json; charset=utf-8"
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode('ascii') + body)
+    await writer.drain()
+
+
+async def handle_connection(service, reader, writer):
+    """Boucle HTTP/1.1 (keep-alive) d'une connexion client."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, path, version = request_line.decode('latin-1').split()
+            except ValueError:
+                await _write_response(writer, HTTPStatus.BAD_REQUEST, {'error': "Requête invalide"}, False)
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            keep_alive = (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close')
+            try:
+                length = int(headers.get('content-length', 0) or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                await _write_response(writer, HTTPStatus.BAD_REQUEST, {'error': "Content-Length invalide"}, False)
+                break
+            if length > MAX_BODY_SIZE:
+                await _write_response(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                      {'error': "Corps de requête trop volumineux"}, False)
+                break
+            body = await reader.readexactly(length) if length else b''
+            try:
+                status, payload = await handle_request(service, method.upper(), path, body)
+            except HTTPError as e:
+                status, payload = e.status, {'error': e.message}
+            except Exception as e:
+                logger.exception("[InferenceServer] Erreur lors du traitement de %s %s", method, path)
+                status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': repr(e)}
+            await _write_response(writer, status, payload, keep_alive)
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host='127.0.0.1', port=8080, **service_options):
+    """
+    Lance le serveur jusqu'à interruption.
+
+    Args:
+        host (str): Adresse d'écoute
+        port (int): Port d'écoute
+        **service_options: Options de InferenceService
+    """
+    service = InferenceService(**service_options)
+    await service.start()
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(service, reader, writer), host, port)
+    logger.info("[InferenceServer] En écoute sur http://%s:%d", host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur HTTP d'inférence du chatbot (rendu3)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--dataset', default='dataset.yaml')
+    parser.add_argument('--model', default=None, help="Fichier de modèle (défaut: models/intent_classifier.joblib)")
+    parser.add_argument('--workers', type=int, default=2, help="Threads (et micro-lots simultanés) pour la classification")
+    parser.add_argument('--nlp-workers', type=int, default=1, help="Threads réservés à /analyze")
+    parser.add_argument('--max-batch', type=int, default=64, help="Taille maximale d'un micro-lot")
+    parser.add_argument('--max-delay-ms', type=float, default=5.0, help="Attente maximale d'un micro-lot")
+    parser.add_argument('--no-nlp', action='store_true', help="Ne pas charger spaCy (/analyze désactivé)")
+    parser.add_argument('--metrics', action='store_true', help="Activer les mesures exposées par /metrics")
+    parser.add_argument('--profile-slowest', type=int, default=0,
+                        help="Conserver le profil cProfile des N requêtes les plus lentes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.metrics or args.profile_slowest:
+        instrumentation.enable(profile_slowest=args.profile_slowest)
+    try:
+        asyncio.run(serve(args.host, args.port,
+                          dataset_path=args.dataset,
+                          model_path=args.model,
+                          workers=args.workers,
+                          nlp_workers=args.nlp_workers,
+                          max_batch_size=args.max_batch,
+                          max_delay=args.max_delay_ms / 1000.0,
+                          enable_nlp=not args.no_nlp))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
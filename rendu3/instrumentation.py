@@ -0,0 +1,324 @@
+"""
+instrumentation
+===============
+
+Mesures légères (durées et compteurs) du pipeline rendu3.
+
+Ce module fournit des spans (gestionnaires de contexte chronométrant une
+étape) et des compteurs, utilisés par TextPreprocessor, NLPProcessor,
+IntentClassifier et classify_intent_with_preprocessing. Les mesures sont
+désactivées par défaut : span() retourne alors un contexte vide partagé
+et count() ne fait rien, le coût se limite à un appel de fonction.
+
+Une fois activées, les mesures sont agrégées par nom (nombre, total,
+maximum, histogramme) et exportables au format texte Prometheus ou JSON.
+Avec profile_slowest=N, les requêtes (request()) sont profilées avec
+cProfile, une à la fois : une requête qui démarre pendant qu'une autre
+est profilée (autre thread ou requête imbriquée) est seulement
+chronométrée. Les profils des N requêtes les plus lentes sont conservés.
+
+Activation par variables d'environnement (lues à l'import) :
+- RENDU3_INSTRUMENTATION=1
+- RENDU3_PROFILE_SLOWEST=N
+
+Dépendances :
+- cProfile, pstats (bibliothèque standard)
+
+Exemple d'utilisation :
+    >>> instrumentation.enable(profile_slowest=5)
+    >>> with instrumentation.request('classify_intent'):
+    ...     with instrumentation.span('preprocess.normalize'):
+    ...         ...
+    >>> print(instrumentation.export_prometheus())
+    >>> instrumentation.slowest_profiles()[0]['profile']
+"""
+
+import bisect
+import cProfile
+import heapq
+import io
+import itertools
+import json
+import os
+import pstats
+import threading
+import time
+
+# Variables d'environnement lues à l'import
+ENABLE_ENV = "RENDU3_INSTRUMENTATION"
+PROFILE_ENV = "RENDU3_PROFILE_SLOWEST"
+
+# Bornes (secondes) de l'histogramme exporté au format Prometheus
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+_lock = threading.Lock()
+# Un seul profileur cProfile peut être actif à la fois (Python >= 3.12) :
+# une seule requête est profilée à la fois, les autres sont seulement chronométrées
+_profile_lock = threading.Lock()
+_enabled = False
+_profile_slowest = 0
+_spans = {}
+_counters = {}
+# Tas (durée, numéro, nom, profil) des requêtes les plus lentes
+_slowest = []
+_sequence = itertools.count()
+
+
+class _NullSpan:
+    """Contexte vide retourné quand les mesures sont désactivées."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _SpanStats:
+    """Agrégat des durées d'un span."""
+
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+        self.buckets[bisect.bisect_left(BUCKETS, duration)] += 1
+
+
+def _record(name, duration):
+    with _lock:
+        stats = _spans.get(name)
+        if stats is None:
+            stats = _spans[name] = _SpanStats()
+        stats.add(duration)
+
+
+class _Span:
+    """Span actif : chronomètre le bloc et enregistre sa durée."""
+
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        _record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _Request(_Span):
+    """Span de requête, éventuellement profilé avec cProfile."""
+
+    __slots__ = ('profiler', 'keep')
+
+    def __enter__(self):
+        self.profiler = None
+        # Lu une seule fois : disable() peut remettre _profile_slowest à 0 pendant la requête
+        self.keep = _profile_slowest
+        if self.keep and _profile_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Un autre profileur (hors de ce module) est déjà actif
+                _profile_lock.release()
+            else:
+                self.profiler = profiler
+        return super().__enter__()
+
+    def __exit__(self, *exc_info):
+        duration = time.perf_counter() - self.start
+        _record(self.name, duration)
+        if self.profiler is not None:
+            self.profiler.disable()
+            _profile_lock.release()
+            entry = (duration, next(_sequence), self.name, self.profiler)
+            # _lock protège aussi le tas contre reset(), qui peut le vider entre-temps
+            with _lock:
+                if len(_slowest) < self.keep:
+                    heapq.heappush(_slowest, entry)
+                elif _slowest and duration > _slowest[0][0]:
+                    heapq.heapreplace(_slowest, entry)
+        return False
+
+
+def enable(profile_slowest=0):
+    """
+    Active les mesures.
+
+    Args:
+        profile_slowest (int): Nombre de requêtes les plus lentes dont le
+            profil cProfile est conservé (0 : pas de profilage)
+    """
+    global _enabled, _profile_slowest
+    _profile_slowest = max(0, int(profile_slowest))
+    _enabled = True
+
+
+def disable():
+    """Désactive les mesures (les agrégats existants sont conservés)."""
+    global _enabled, _profile_slowest
+    _enabled = False
+    _profile_slowest = 0
+
+
+def is_enabled():
+    """Indique si les mesures sont actives."""
+    return _enabled
+
+
+def reset():
+    """Efface les agrégats, compteurs et profils."""
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _slowest.clear()
+
+
+def span(name):
+    """
+    Retourne un contexte qui chronomètre une étape.
+
+    Args:
+        name (str): Nom de l'étape (ex. 'preprocess.stem')
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def request(name):
+    """
+    Retourne un contexte qui chronomètre une requête complète, et la
+    profile si profile_slowest est actif.
+
+    Args:
+        name (str): Nom de la requête (ex. 'classify_intent')
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Request(name)
+
+
+def count(name, value=1):
+    """
+    Incrémente un compteur.
+
+    Args:
+        name (str): Nom du compteur
+        value (int): Incrément
+    """
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def snapshot():
+    """
+    Retourne l'état courant des mesures.
+
+    Returns:
+        dict: {'spans': {nom: {count, total_seconds, mean_seconds, max_seconds}},
+            'counters': {nom: valeur}}
+    """
+    with _lock:
+        spans = {
+            name: {
+                'count': stats.count,
+                'total_seconds': stats.total,
+                'mean_seconds': stats.total / stats.count if stats.count else 0.0,
+                'max_seconds': stats.max,
+            }
+            for name, stats in sorted(_spans.items())
+        }
+        counters = dict(sorted(_counters.items()))
+    return {'spans': spans, 'counters': counters}
+
+
+def export_json(indent=2):
+    """Exporte les mesures au format JSON."""
+    return json.dumps(snapshot(), indent=indent, ensure_ascii=False)
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def export_prometheus(prefix='rendu3'):
+    """
+    Exporte les mesures au format texte Prometheus.
+
+    Args:
+        prefix (str): Préfixe des noms de métriques
+
+    Returns:
+        str: Histogramme {prefix}_span_seconds et compteur {prefix}_events_total
+    """
+    lines = [
+        f"# HELP {prefix}_span_seconds Durée des étapes du pipeline.",
+        f"# TYPE {prefix}_span_seconds histogram",
+    ]
+    with _lock:
+        for name, stats in sorted(_spans.items()):
+            label = _label(name)
+            cumulative = 0
+            for bound, bucket in zip(BUCKETS, stats.buckets):
+                cumulative += bucket
+                lines.append(f'{prefix}_span_seconds_bucket{{span="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_span_seconds_bucket{{span="{label}",le="+Inf"}} {stats.count}')
+            lines.append(f'{prefix}_span_seconds_sum{{span="{label}"}} {stats.total}')
+            lines.append(f'{prefix}_span_seconds_count{{span="{label}"}} {stats.count}')
+        lines.append(f"# HELP {prefix}_events_total Compteurs du pipeline.")
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        for name, value in sorted(_counters.items()):
+            lines.append(f'{prefix}_events_total{{name="{_label(name)}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def slowest_profiles(limit=25, sort='cumulative'):
+    """
+    Retourne les profils des requêtes les plus lentes, de la plus lente à la plus rapide.
+
+    Args:
+        limit (int): Nombre de fonctions affichées par profil
+        sort (str): Critère de tri de pstats
+
+    Returns:
+        list of dict: {'name', 'duration_seconds', 'profile'} (profil au format texte pstats)
+    """
+    with _lock:
+        entries = sorted(_slowest, reverse=True)
+    profiles = []
+    for duration, _, name, profiler in entries:
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats(sort).print_stats(limit)
+        profiles.append({'name': name, 'duration_seconds': duration, 'profile': stream.getvalue()})
+    return profiles
+
+
+def _enable_from_environment():
+    """Active les mesures si ENABLE_ENV ou PROFILE_ENV est défini."""
+    slowest = int(os.environ.get(PROFILE_ENV, 0) or 0)
+    if os.environ.get(ENABLE_ENV, '').lower() in ('1', 'true', 'yes') or slowest:
+        enable(profile_slowest=slowest)
+
+
+_enable_from_environment()
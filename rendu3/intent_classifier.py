@@ -6,22 +6,190 @@ Module de classification d'intentions pour chatbot français.
 
 Ce module fournit la classe IntentClassifier, qui encapsule un pipeline scikit-learn (TF-IDF + SVM) pour entraîner et prédire l'intention d'un message utilisateur en français.
 
+Le classificateur final est configurable (CLASSIFIER_BACKENDS) :
+- 'svc' : SVC linéaire avec probabilités de Platt (historique) ;
+- 'linear_svc' : LinearSVC calibré (sigmoïde), bien plus rapide à entraîner et à prédire ;
+- 'sgd' : SGDClassifier (régression logistique) ;
+- 'naive_bayes' : MultinomialNB.
+Tous fournissent predict_proba, la confiance reste donc une probabilité.
+
+La vectorisation est elle aussi configurable :
+- 'tfidf' : TfidfVectorizer (vocabulaire appris, réentraînement complet) ;
+- 'hashing' : HashingVectorizer sans état suivi d'un TF-IDF incrémental
+  optionnel. Avec un backend supportant partial_fit ('sgd', 'naive_bayes'),
+  partial_train intègre de nouveaux exemples au modèle sans tout
+  réentraîner, et la mémoire ne dépend plus de la taille du vocabulaire.
+  Les poids idf sont figés après le premier entraînement : les recalculer
+  (update_idf=True) modifie la représentation de tous les textes, alors
+  que les poids du classificateur ont été appris avec les anciens idf.
+
+Le modèle entraîné peut être sauvegardé (save) puis rechargé (load) avec une
+empreinte du dataset et de la configuration, ce qui évite de réentraîner à
+chaque démarrage. Le chargement utilise le memory-mapping de joblib : les
+tableaux numpy du modèle sont partagés entre processus.
+
+Pour traiter plusieurs messages, predict_batch et classify_batch
+vectorisent tous les textes en une seule matrice creuse et calculent
+intention, top-k et confiance en une seule passe.
+
+enable_cache place un cache LRU/TTL devant predict, predict_proba, leurs
+versions batch (seuls les messages absents du cache sont calculés) et
+classify_batch : la clé est le texte normalisé (même normalisation que
+TextPreprocessor.normalize_text), la prédiction est calculée sur le message
+reçu, et le cache est vidé automatiquement à chaque entraînement ou
+rechargement du modèle.
+
 Dépendances :
 - scikit-learn
+- joblib
+- numpy
+- instrumentation
 
 Exemple d'utilisation :
     >>> clf = IntentClassifier()
     >>> clf.train(["Bonjour"], ["salutation"])
     >>> clf.predict("Salut")
+    >>> clf.save("models/intent_classifier.joblib")
+    >>> clf = IntentClassifier.load("models/intent_classifier.joblib")
 """
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
+import copy
+import hashlib
+import json
+import logging
+import os
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+import sklearn
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
 from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import normalize
 from sklearn.svm import SVC
 
+import instrumentation
+from prediction_cache import MISSING, PredictionCache
+from text_normalizer import TextNormalizer
+
+logger = logging.getLogger(__name__)
+
+# Version du format des fichiers de modèle écrits par IntentClassifier.save
+MODEL_FORMAT_VERSION = 1
+
+
+def _svc_backend():
+    # Probabilités de Platt : validation croisée interne à l'entraînement
+    return SVC(kernel='linear', probability=True)
+
+
+# Les backends optionnels importent leur module scikit-learn à la demande :
+# sklearn.calibration entraîne model_selection, inutile au backend par défaut.
+
+def _linear_svc_backend():
+    from sklearn.calibration import CalibratedClassifierCV
+    from sklearn.svm import LinearSVC
+    # Un seul LinearSVC entraîné sur toutes les données (ensemble=False),
+    # la calibration sigmoïde est apprise par validation croisée à 3 plis
+    return CalibratedClassifierCV(LinearSVC(), method='sigmoid', cv=3, ensemble=False)
+
+
+def _sgd_backend():
+    from sklearn.linear_model import SGDClassifier
+    return SGDClassifier(loss='log_loss', alpha=1e-4, max_iter=1000, tol=1e-3, random_state=42)
+
+
+def _naive_bayes_backend():
+    from sklearn.naive_bayes import MultinomialNB
+    return MultinomialNB(alpha=0.1)
+
+
+# Classificateurs disponibles pour IntentClassifier(backend=...)
+CLASSIFIER_BACKENDS = {
+    'svc': _svc_backend,
+    'linear_svc': _linear_svc_backend,
+    'sgd': _sgd_backend,
+    'naive_bayes': _naive_bayes_backend,
+}
+
+# Backends dont predict() retourne toujours la classe de plus forte probabilité.
+# Pour 'svc', les probabilités de Platt sont apprises par une validation croisée
+# séparée et leur argmax peut différer de predict().
+PROBA_ARGMAX_BACKENDS = frozenset({'linear_svc', 'sgd', 'naive_bayes'})
+
+
+def dataset_fingerprint(texts, labels):
+    """
+    Calcule l'empreinte SHA-256 d'un jeu d'entraînement.
+
+    Args:
+        texts (list of str): Phrases d'entraînement
+        labels (list of str): Intentions correspondantes
+
+    Returns:
+        str: Empreinte hexadécimale
+    """
+    digest = hashlib.sha256()
+    for text, label in zip(texts, labels):
+        digest.update(label.encode('utf-8'))
+        digest.update(b'\x1f')
+        digest.update(text.encode('utf-8'))
+        digest.update(b'\x1e')
+    return digest.hexdigest()
+
+
+# Vectorisations disponibles pour IntentClassifier(vectorizer=...)
+VECTORIZERS = ('tfidf', 'hashing')
+
+
+class IncrementalTfidfTransformer(TransformerMixin, BaseEstimator):
+    """
+    Pondération TF-IDF dont les fréquences documentaires peuvent être
+    mises à jour par lots (partial_fit), à la suite d'un HashingVectorizer.
+    
+    La formule est celle de TfidfTransformer (idf lissé puis normalisation).
+    La matrice reçue par partial_fit n'est pas modifiée.
+    """
+    
+    def __init__(self, norm='l2', smooth_idf=True):
+        self.norm = norm
+        self.smooth_idf = smooth_idf
+    
+    def fit(self, X, y=None):
+        for attribute in ('n_samples_', 'document_frequency_', 'idf_'):
+            self.__dict__.pop(attribute, None)
+        return self.partial_fit(X)
+    
+    def partial_fit(self, X, y=None):
+        # Copie : sum_duplicates modifie la matrice en place
+        X = sp.csr_matrix(X, copy=True)
+        X.sum_duplicates()
+        if not hasattr(self, 'document_frequency_'):
+            self.n_samples_ = 0
+            self.document_frequency_ = np.zeros(X.shape[1], dtype=np.int64)
+        self.document_frequency_ += np.bincount(X.indices, minlength=X.shape[1])
+        self.n_samples_ += X.shape[0]
+        smooth = int(self.smooth_idf)
+        self.idf_ = np.log((self.n_samples_ + smooth) / (self.document_frequency_ + smooth)) + 1.0
+        return self
+    
+    def transform(self, X):
+        X = sp.csr_matrix(X, dtype=np.float64, copy=True)
+        X.data *= self.idf_[X.indices]
+        if self.norm:
+            X = normalize(X, norm=self.norm, copy=False)
+        return X
+
+
 class IntentClassifier:
-    def __init__(self):
+    def __init__(self, backend='svc', vectorizer='tfidf', n_features=2 ** 18, use_idf=True):
+        if backend not in CLASSIFIER_BACKENDS:
+            raise ValueError(f"Backend inconnu: '{backend}' (disponibles: {sorted(CLASSIFIER_BACKENDS)})")
+        if vectorizer not in VECTORIZERS:
+            raise ValueError(f"Vectorisation inconnue: '{vectorizer}' (disponibles: {list(VECTORIZERS)})")
+        self.backend = backend
+        self.vectorizer = vectorizer
         # Liste des mots vides français
         french_stop_words = [
             'le', 'de', 'un', 'à', 'être', 'et', 'en', 'avoir', 'que', 'pour',
@@ -44,27 +212,425 @@ class IntentClassifier:
             'aurez', 'auront', 'aurait', 'aurais', 'aurions', 'auriez', 'auraient'
         ]
         
-        self.pipeline = Pipeline([
-            ('tfidf', TfidfVectorizer(
-                stop_words=french_stop_words,
-                ngram_range=(1, 2),
-                max_features=5000
-            )),
-            ('classifier', SVC(
-                kernel='linear',
-                probability=True
-            ))
+        if vectorizer == 'tfidf':
+            steps = [
+                ('tfidf', TfidfVectorizer(
+                    stop_words=french_stop_words,
+                    ngram_range=(1, 2),
+                    max_features=5000
+                ))
+            ]
+        else:
+            # Sans état : pas de vocabulaire à apprendre ni à garder en mémoire
+            steps = [
+                ('hashing', HashingVectorizer(
+                    stop_words=french_stop_words,
+                    ngram_range=(1, 2),
+                    n_features=n_features,
+                    alternate_sign=False,
+                    norm=None if use_idf else 'l2'
+                ))
+            ]
+            if use_idf:
+                steps.append(('tfidf', IncrementalTfidfTransformer()))
+        
+        self.pipeline = Pipeline(steps + [
+            ('classifier', CLASSIFIER_BACKENDS[backend]())
         ])
+        # Empreinte du dataset utilisé pour le dernier entraînement
+        self.dataset_hash = None
+        # Vrai si les tableaux du modèle sont en memory-mapping (lecture seule)
+        self._memory_mapped = False
+        # Cache de prédictions (désactivé par défaut, voir enable_cache)
+        self.cache = None
+        self._cache_normalizer = None
+    
+    def enable_cache(self, maxsize=1024, ttl=None, fold_accents=False):
+        """
+        Active le cache de prédictions.
+        
+        Les messages sont normalisés (minuscules, ponctuation, espaces) pour
+        construire la clé ; la prédiction est calculée sur le message reçu,
+        comme sans cache. Les messages de même clé partagent une prédiction.
+        
+        Args:
+            maxsize (int): Nombre maximal d'entrées en cache
+            ttl (float): Durée de vie d'une entrée en secondes (None : illimitée)
+            fold_accents (bool): Ignorer les accents dans la clé
+        
+        Returns:
+            PredictionCache: Le cache créé (statistiques via cache.stats())
+        """
+        self.cache = PredictionCache(maxsize=maxsize, ttl=ttl)
+        self._cache_normalizer = TextNormalizer(fold_accents=fold_accents)
+        return self.cache
+    
+    def disable_cache(self):
+        """Désactive le cache de prédictions."""
+        self.cache = None
+        self._cache_normalizer = None
+    
+    def _invalidate_cache(self):
+        """Vide le cache après une modification du modèle."""
+        if self.cache is not None:
+            self.cache.clear()
+    
+    @property
+    def is_fitted(self):
+        """Indique si le pipeline a été entraîné (ou chargé)."""
+        return hasattr(self.pipeline.steps[-1][1], 'classes_')
+    
+    def config_hash(self):
+        """
+        Calcule l'empreinte de la configuration du pipeline (hyperparamètres).
+        
+        Returns:
+            str: Empreinte hexadécimale
+        """
+        params = {
+            name: value for name, value in self.pipeline.get_params(deep=True).items()
+            if name not in ('steps', 'memory', 'verbose') and not isinstance(value, BaseEstimator)
+        }
+        encoded = json.dumps(params, sort_keys=True, default=repr)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
     
     def train(self, texts, labels):
-        print(f"[IntentClassifier] Entraînement sur {len(texts)} exemples...")
-        self.pipeline.fit(texts, labels)
-        print("[IntentClassifier] Entraînement terminé.")
+        logger.info("[IntentClassifier] Entraînement sur %d exemples...", len(texts))
+        with instrumentation.span('classifier.train'):
+            self.pipeline.fit(texts, labels)
+        self.dataset_hash = dataset_fingerprint(texts, labels)
+        self._memory_mapped = False
+        self._invalidate_cache()
+        logger.info("[IntentClassifier] Entraînement terminé.")
+    
+    @property
+    def supports_partial_fit(self):
+        """Indique si partial_train est possible (vectorisation 'hashing' et backend incrémental)."""
+        return self.vectorizer == 'hashing' and hasattr(self.pipeline.steps[-1][1], 'partial_fit')
+    
+    def partial_train(self, texts, labels, classes=None, update_idf=False):
+        """
+        Intègre de nouveaux exemples au modèle sans réentraînement complet.
+        
+        Args:
+            texts (list of str): Nouvelles phrases
+            labels (list of str): Intentions correspondantes
+            classes (list of str): Toutes les intentions possibles ; nécessaire
+                au premier appel si le lot ne les contient pas toutes
+            update_idf (bool): Mettre à jour les fréquences documentaires avec
+                ce lot. Par défaut, les idf du premier entraînement sont
+                conservés : les recalculer change la pondération de tous les
+                textes, et les poids déjà appris par le classificateur (sous
+                les anciens idf) dérivent. À réserver aux corpus dont le
+                vocabulaire évolue, idéalement suivi d'un réentraînement complet.
+        
+        Raises:
+            ValueError: Si la configuration ne permet pas l'apprentissage
+                incrémental, ou si une intention est inconnue du modèle
+        """
+        if not self.supports_partial_fit:
+            raise ValueError("L'apprentissage incrémental nécessite vectorizer='hashing' "
+                             "et un backend avec partial_fit ('sgd' ou 'naive_bayes')")
+        logger.info("[IntentClassifier] Apprentissage incrémental sur %d exemples...", len(texts))
+        if self._memory_mapped:
+            # Les tableaux chargés en lecture seule sont copiés avant modification
+            self.pipeline = copy.deepcopy(self.pipeline)
+            self._memory_mapped = False
+        features = self.pipeline.named_steps['hashing'].transform(texts)
+        if 'tfidf' in self.pipeline.named_steps:
+            tfidf = self.pipeline.named_steps['tfidf']
+            if update_idf or not hasattr(tfidf, 'idf_'):
+                tfidf.partial_fit(features)
+            features = tfidf.transform(features)
+        estimator = self.pipeline.steps[-1][1]
+        if hasattr(estimator, 'classes_'):
+            unknown = set(labels).difference(estimator.classes_)
+            if unknown:
+                raise ValueError(f"Intentions inconnues du modèle: {sorted(unknown)} "
+                                 "(un réentraînement complet est nécessaire)")
+            estimator.partial_fit(features, labels)
+        else:
+            estimator.partial_fit(features, labels, classes=np.unique(labels if classes is None else classes))
+        # L'empreinte enchaîne celle du modèle précédent et celle du nouveau lot
+        previous = self.dataset_hash or ''
+        self.dataset_hash = hashlib.sha256(
+            (previous + dataset_fingerprint(texts, labels)).encode('utf-8')).hexdigest()
+        self._invalidate_cache()
+        logger.info("[IntentClassifier] Apprentissage incrémental terminé.")
+    
+    def save(self, path):
+        """
+        Sauvegarde le pipeline entraîné avec ses métadonnées.
+        
+        Le fichier n'est pas compressé afin de pouvoir être chargé en
+        memory-mapping.
+        
+        Args:
+            path (str): Chemin du fichier de modèle
+        """
+        if not self.is_fitted:
+            raise ValueError("Le classificateur doit être entraîné avant d'être sauvegardé")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        artefact = {
+            'format_version': MODEL_FORMAT_VERSION,
+            'sklearn_version': sklearn.__version__,
+            'backend': self.backend,
+            'vectorizer': self.vectorizer,
+            'dataset_hash': self.dataset_hash,
+            'config_hash': self.config_hash(),
+            'pipeline': self.pipeline
+        }
+        joblib.dump(artefact, path)
+        logger.info("[IntentClassifier] Modèle sauvegardé dans '%s'", path)
+    
+    @classmethod
+    def load(cls, path, dataset_hash=None, config_hash=None, mmap_mode='r'):
+        """
+        Charge un modèle sauvegardé par save.
+        
+        Args:
+            path (str): Chemin du fichier de modèle
+            dataset_hash (str): Empreinte attendue du dataset (None : pas de vérification)
+            config_hash (str): Empreinte attendue de la configuration (None : pas de vérification)
+            mmap_mode (str): Mode de memory-mapping joblib ('r' : tableaux
+                partagés en lecture seule entre processus, None : copie en mémoire)
+        
+        Returns:
+            IntentClassifier: Classificateur prêt à prédire
+        
+        Raises:
+            FileNotFoundError: Si le fichier n'existe pas
+            ValueError: Si le format ou les empreintes ne correspondent pas
+        """
+        artefact = joblib.load(path, mmap_mode=mmap_mode)
+        if artefact.get('format_version') != MODEL_FORMAT_VERSION:
+            raise ValueError(f"Format de modèle non supporté: {artefact.get('format_version')}")
+        if dataset_hash is not None and artefact['dataset_hash'] != dataset_hash:
+            raise ValueError("Le modèle a été entraîné sur un autre dataset")
+        if config_hash is not None and artefact['config_hash'] != config_hash:
+            raise ValueError("Le modèle a été entraîné avec une autre configuration")
+        if artefact['sklearn_version'] != sklearn.__version__:
+            logger.warning("[IntentClassifier] Modèle créé avec scikit-learn %s (installé: %s)",
+                           artefact['sklearn_version'], sklearn.__version__)
+        classifier = cls(backend=artefact['backend'], vectorizer=artefact['vectorizer'])
+        classifier.pipeline = artefact['pipeline']
+        classifier.dataset_hash = artefact['dataset_hash']
+        classifier._memory_mapped = mmap_mode is not None
+        logger.info("[IntentClassifier] Modèle chargé depuis '%s'", path)
+        return classifier
+    
+    def reload(self, path, **kwargs):
+        """
+        Remplace le modèle courant par un modèle sauvegardé, en conservant
+        la configuration du cache (qui est vidé).
+        
+        Args:
+            path (str): Chemin du fichier de modèle
+            **kwargs: Arguments de load (dataset_hash, config_hash, mmap_mode)
+        """
+        loaded = type(self).load(path, **kwargs)
+        self.backend = loaded.backend
+        self.vectorizer = loaded.vectorizer
+        self.pipeline = loaded.pipeline
+        self.dataset_hash = loaded.dataset_hash
+        self._memory_mapped = loaded._memory_mapped
+        self._invalidate_cache()
+
+    def _cached(self, kind, text, compute):
+        """Retourne compute([texte]) depuis le cache (clé : texte normalisé) si possible."""
+        key = (kind, self._cache_normalizer.normalize(text))
+        value = self.cache.get(key)
+        if value is MISSING:
+            instrumentation.count('classifier.cache_misses')
+            value = compute([text])
+            self.cache.put(key, value)
+        else:
+            instrumentation.count('classifier.cache_hits')
+        return value.copy()
+
+    def _cached_batch(self, kind, texts, compute):
+        """
+        Retourne compute(textes) ligne par ligne depuis le cache (clé : texte
+        normalisé) : seuls les messages absents sont calculés, en un seul lot.
+        """
+        normalized_texts = self._cache_normalizer.normalize_many(texts)
+        rows = [None] * len(normalized_texts)
+        missing = {}
+        for position, normalized in enumerate(normalized_texts):
+            value = self.cache.get((kind, normalized))
+            if value is MISSING:
+                missing.setdefault(normalized, []).append(position)
+            else:
+                rows[position] = value
+        misses = sum(map(len, missing.values()))
+        instrumentation.count('classifier.cache_hits', len(rows) - misses)
+        instrumentation.count('classifier.cache_misses', misses)
+        if missing:
+            # Un message par clé absente, calculé tel que reçu
+            computed = compute([texts[positions[0]] for positions in missing.values()])
+            for index, normalized in enumerate(missing):
+                # Même forme que les entrées de predict / predict_proba : (1,) ou (1, n_classes)
+                value = computed[index:index + 1].copy()
+                self.cache.put((kind, normalized), value)
+                for position in missing[normalized]:
+                    rows[position] = value
+        return np.concatenate(rows)
 
     def predict(self, text):
-        print(f"[IntentClassifier] Prédiction pour: '{text}'")
-        return self.pipeline.predict([text])
+        logger.debug("[IntentClassifier] Prédiction pour: '%s'", text)
+        with instrumentation.span('classifier.predict'):
+            if self.cache is not None:
+                return self._cached('predict', text, self.pipeline.predict)
+            return self.pipeline.predict([text])
 
     def predict_proba(self, text):
-        print(f"[IntentClassifier] Probabilités pour: '{text}'")
-        return self.pipeline.predict_proba([text])
\ No newline at end of file
+        logger.debug("[IntentClassifier] Probabilités pour: '%s'", text)
+        with instrumentation.span('classifier.predict_proba'):
+            if self.cache is not None:
+                return self._cached('predict_proba', text, self.pipeline.predict_proba)
+            return self.pipeline.predict_proba([text])
+    
+    @property
+    def predicts_proba_argmax(self):
+        """Indique si l'intention prédite est toujours la classe la plus probable."""
+        return self.backend in PROBA_ARGMAX_BACKENDS
+    
+    @property
+    def classes_(self):
+        """Intentions connues du classificateur, dans l'ordre des colonnes de probabilités."""
+        return self.pipeline.steps[-1][1].classes_
+    
+    def transform(self, texts):
+        """
+        Vectorise des textes (toutes les étapes du pipeline sauf le classificateur).
+        
+        Args:
+            texts (list of str): Messages à vectoriser
+        
+        Returns:
+            scipy.sparse matrix: Matrice des caractéristiques
+        """
+        with instrumentation.span('classifier.vectorize'):
+            return self.pipeline[:-1].transform(texts)
+    
+    def predict_batch(self, texts):
+        """
+        Prédit l'intention de plusieurs messages en une seule vectorisation.
+        
+        Args:
+            texts (list of str): Messages à classer
+        
+        Returns:
+            numpy.ndarray: Intentions prédites
+        """
+        logger.debug("[IntentClassifier] Prédiction batch pour %d messages", len(texts))
+        if self.cache is not None and len(texts):
+            return self._cached_batch('predict', texts, self._predict_batch)
+        return self._predict_batch(texts)
+
+    def _predict_batch(self, texts):
+        features = self.transform(texts)
+        with instrumentation.span('classifier.score'):
+            return self.pipeline.steps[-1][1].predict(features)
+    
+    def predict_proba_batch(self, texts):
+        """
+        Calcule les probabilités de plusieurs messages en une seule vectorisation.
+        
+        Args:
+            texts (list of str): Messages à classer
+        
+        Returns:
+            numpy.ndarray: Probabilités (une ligne par message, colonnes dans l'ordre de classes_)
+        """
+        logger.debug("[IntentClassifier] Probabilités batch pour %d messages", len(texts))
+        if self.cache is not None and len(texts):
+            return self._cached_batch('predict_proba', texts, self._predict_proba_batch)
+        return self._predict_proba_batch(texts)
+
+    def _predict_proba_batch(self, texts):
+        features = self.transform(texts)
+        with instrumentation.span('classifier.score'):
+            return self.pipeline.steps[-1][1].predict_proba(features)
+    
+    def classify_batch(self, texts, top_k=3):
+        """
+        Classe plusieurs messages : intention, confiance et top-k intentions
+        sont issus d'une seule vectorisation. L'intention est celle de
+        predict() ; la confiance est sa probabilité.
+        
+        Args:
+            texts (list of str): Messages à classer
+            top_k (int): Nombre d'intentions candidates retournées (au moins 1)
+        
+        Returns:
+            list of dict: Pour chaque message, {'intent', 'confidence', 'top_k'}
+                où top_k est une liste de (intention, probabilité)
+        
+        Raises:
+            ValueError: Si top_k est inférieur à 1
+        """
+        if top_k < 1:
+            raise ValueError(f"top_k doit être au moins 1 (reçu : {top_k})")
+        if len(texts) == 0:
+            return []
+        instrumentation.count('classifier.messages', len(texts))
+        if self.cache is None:
+            return self._classify(texts, top_k)
+        
+        # Seuls les messages absents du cache sont classés (en un seul lot)
+        results = [None] * len(texts)
+        missing = {}
+        for position, normalized in enumerate(self._cache_normalizer.normalize_many(texts)):
+            value = self.cache.get(('classify', top_k, normalized))
+            if value is MISSING:
+                missing.setdefault(normalized, []).append(position)
+            else:
+                results[position] = self._result_dict(value)
+        instrumentation.count('classifier.cache_hits', len(texts) - sum(map(len, missing.values())))
+        instrumentation.count('classifier.cache_misses', sum(map(len, missing.values())))
+        if missing:
+            # Un message par clé absente, classé tel que reçu (comme sans cache)
+            computed = self._classify([texts[positions[0]] for positions in missing.values()], top_k)
+            for normalized, result in zip(missing, computed):
+                # Entrée immuable : chaque appel reçoit ses propres dict et liste top_k
+                value = (result['intent'], result['confidence'], tuple(result['top_k']))
+                self.cache.put(('classify', top_k, normalized), value)
+                for position in missing[normalized]:
+                    results[position] = self._result_dict(value)
+        return results
+    
+    @staticmethod
+    def _result_dict(value):
+        """Construit le résultat de classify_batch depuis une entrée du cache."""
+        intent, confidence, top_k = value
+        return {'intent': intent, 'confidence': confidence, 'top_k': list(top_k)}
+    
+    def _classify(self, texts, top_k):
+        """Calcule intention, confiance et top-k sans passer par le cache."""
+        # Les résultats sont mis en cache par classify_batch : pas de cache par ligne ici
+        features = self.transform(texts)
+        estimator = self.pipeline.steps[-1][1]
+        with instrumentation.span('classifier.score'):
+            probabilities = estimator.predict_proba(features)
+            # Avec 'svc', l'intention reste celle de predict() (voir PROBA_ARGMAX_BACKENDS)
+            predicted = None if self.predicts_proba_argmax else estimator.predict(features)
+        classes = self.classes_
+        k = min(top_k, len(classes))
+        ranking = np.argsort(-probabilities, axis=1)[:, :k]
+        results = []
+        for index, (row, indices) in enumerate(zip(probabilities, ranking)):
+            candidates = [(str(classes[i]), float(row[i])) for i in indices]
+            if predicted is None:
+                intent, confidence = candidates[0]
+            else:
+                intent = str(predicted[index])
+                confidence = float(row[np.flatnonzero(classes == predicted[index])[0]])
+            results.append({
+                'intent': intent,
+                'confidence': confidence,
+                'top_k': candidates
+            })
+        return results
\ No newline at end of file
@@ -0,0 +1,222 @@
+"""
+model_registry
+==============
+
+Registre partagé (au niveau du processus) des ressources linguistiques.
+
+Ce module charge une seule fois par processus les pipelines spaCy, les
+stemmers et les listes de mots vides NLTK, puis renvoie toujours la même
+instance. Le chargement est paresseux et protégé par un verrou, ce qui
+permet de créer plusieurs NLPProcessor ou TextPreprocessor sans payer
+plusieurs fois le coût de chargement.
+
+Pour les workers lancés via un fork server, configure_forkserver_preload()
+demande au processus parent du fork server de précharger les ressources :
+les processus enfants les partagent alors en copy-on-write.
+
+Dépendances :
+- spacy (chargé à la demande)
+- nltk (chargé à la demande)
+
+Exemple d'utilisation :
+    >>> nlp = get_spacy_model("fr_core_news_sm")
+    >>> stemmer = get_stemmer("french")
+    >>> stop_words = get_stopwords("french")
+"""
+
+import gc
+import json
+import logging
+import multiprocessing
+import os
+import threading
+
+# Variable d'environnement lue à l'import pour précharger les ressources
+PRELOAD_ENV = "RENDU3_PRELOAD"
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.RLock()
+_spacy_models = {}
+_stemmers = {}
+_stopwords = {}
+_nltk_resources_checked = False
+
+
+def get_spacy_model(model_name="fr_core_news_sm", exclude=()):
+    """
+    Retourne le pipeline spaCy partagé pour un modèle.
+
+    Args:
+        model_name (str): Nom du modèle spaCy
+        exclude (iterable of str): Composants à ne pas charger
+
+    Returns:
+        spacy.language.Language: Pipeline chargé
+
+    Raises:
+        OSError: Si le modèle n'est pas installé
+    """
+    key = (model_name, tuple(sorted(exclude)))
+    nlp = _spacy_models.get(key)
+    if nlp is None:
+        with _lock:
+            nlp = _spacy_models.get(key)
+            if nlp is None:
+                import spacy
+                logger.info("[ModelRegistry] Chargement du modèle spaCy '%s' (exclus: %s)...", model_name, list(key[1]))
+                nlp = spacy.load(model_name, exclude=list(key[1]))
+                _spacy_models[key] = nlp
+    return nlp
+
+
+def ensure_nltk_resources():
+    """
+    Télécharge les ressources NLTK nécessaires (tokenizer, stopwords),
+    une seule fois par processus.
+    """
+    global _nltk_resources_checked
+    if _nltk_resources_checked:
+        return
+    with _lock:
+        if _nltk_resources_checked:
+            return
+        import nltk
+        resources = {
+            'punkt': 'tokenizers/punkt',
+            'stopwords': 'corpora/stopwords',
+        }
+        for resource, path in resources.items():
+            try:
+                nltk.data.find(path)
+            except LookupError:
+                logger.info("Téléchargement de la ressource '%s'...", resource)
+                nltk.download(resource)
+        _nltk_resources_checked = True
+
+
+def get_stemmer(language="french"):
+    """
+    Retourne le SnowballStemmer partagé pour une langue.
+
+    Args:
+        language (str): Langue du stemmer
+
+    Returns:
+        SnowballStemmer: Stemmer NLTK
+    """
+    stemmer = _stemmers.get(language)
+    if stemmer is None:
+        with _lock:
+            stemmer = _stemmers.get(language)
+            if stemmer is None:
+                from nltk.stem import SnowballStemmer
+                stemmer = SnowballStemmer(language)
+                _stemmers[language] = stemmer
+    return stemmer
+
+
+def get_stopwords(language="french"):
+    """
+    Retourne l'ensemble partagé (immuable) des mots vides d'une langue.
+
+    Args:
+        language (str): Langue des mots vides
+
+    Returns:
+        frozenset: Mots vides
+
+    Raises:
+        LookupError: Si la ressource NLTK n'est pas disponible
+    """
+    stop_words = _stopwords.get(language)
+    if stop_words is None:
+        with _lock:
+            stop_words = _stopwords.get(language)
+            if stop_words is None:
+                from nltk.corpus import stopwords
+                stop_words = frozenset(stopwords.words(language))
+                _stopwords[language] = stop_words
+    return stop_words
+
+
+def preload(spacy_models=(), languages=(), download_resources=True, analyses=None):
+    """
+    Charge immédiatement les ressources indiquées.
+
+    À appeler dans le processus parent avant de créer des workers (fork) :
+    les objets chargés sont ensuite gelés (gc.freeze) pour limiter les
+    copies de pages mémoire dans les processus enfants.
+
+    Un pipeline spaCy est partagé par (modèle, composants exclus) : pour que
+    les NLPProcessor créés avec analyses=... le trouvent déjà chargé, passer
+    les mêmes combinaisons d'analyses (ou les paires (modèle, exclus)).
+
+    Args:
+        spacy_models (iterable): Modèles spaCy à charger : noms, ou paires
+            (nom, composants exclus)
+        languages (iterable of str): Langues NLTK (stemmer et mots vides)
+        download_resources (bool): Télécharger les ressources NLTK si nécessaire
+        analyses (iterable of iterable of str): Combinaisons d'analyses des
+            NLPProcessor à servir (ex. [['pos'], ['pos', 'syntax', 'entities']]) ;
+            chaque modèle nommé est chargé avec les exclusions correspondantes.
+            None : pipeline complet uniquement.
+    """
+    languages = list(languages)
+    if languages and download_resources:
+        ensure_nltk_resources()
+    excludes = [()]
+    if analyses is not None:
+        # Import local : nlp_processor importe ce module
+        from nlp_processor import NLPProcessor
+        excludes = [NLPProcessor._unused_components(combination) for combination in analyses]
+    for entry in spacy_models:
+        if isinstance(entry, str):
+            for exclude in excludes:
+                get_spacy_model(entry, exclude)
+        else:
+            model_name, exclude = entry
+            get_spacy_model(model_name, exclude)
+    for language in languages:
+        get_stemmer(language)
+        try:
+            get_stopwords(language)
+        except LookupError:
+            logger.warning("Attention: Stop words pour '%s' non disponibles", language)
+    gc.freeze()
+
+
+def configure_forkserver_preload(spacy_models=(), languages=(), analyses=None):
+    """
+    Demande au fork server de multiprocessing de précharger les ressources.
+
+    Doit être appelé avant le démarrage du fork server (premier Pool ou
+    Process créé avec le contexte 'forkserver'). Le fork server importe ce
+    module, qui lit la variable PRELOAD_ENV et charge les ressources une
+    seule fois ; chaque worker hérite ensuite des modèles déjà chargés.
+
+    Args:
+        spacy_models (iterable): Modèles spaCy à charger (voir preload)
+        languages (iterable of str): Langues NLTK (stemmer et mots vides)
+        analyses (iterable of iterable of str): Combinaisons d'analyses (voir preload)
+    """
+    os.environ[PRELOAD_ENV] = json.dumps({
+        'spacy_models': [entry if isinstance(entry, str) else [entry[0], list(entry[1])]
+                         for entry in spacy_models],
+        'languages': list(languages),
+        'analyses': None if analyses is None else [list(combination) for combination in analyses],
+    })
+    multiprocessing.set_forkserver_preload([__name__])
+
+
+def _preload_from_environment():
+    """Précharge les ressources décrites dans la variable PRELOAD_ENV."""
+    config = os.environ.get(PRELOAD_ENV)
+    if not config:
+        return
+    config = json.loads(config)
+    preload(config.get('spacy_models', ()), config.get('languages', ()),
+            analyses=config.get('analyses'))
+
+
+_preload_from_environment()
@@ -8,14 +8,27 @@ Ce module fournit la classe NLPProcessor, qui permet d'effectuer l'analyse morph
 
 Dépendances :
 - spacy
+- instrumentation
 
 Exemple d'utilisation :
     >>> nlp = NLPProcessor()
     >>> result = nlp.full_analysis("Bonjour, je m'appelle Paul.")
+    >>> nlp = NLPProcessor(lazy=True)  # spaCy n'est chargé qu'à la première analyse
 """
 
-import spacy
-from typing import Dict, List, Any
+from __future__ import annotations
+
+import logging
+
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Any, Optional, Sequence, Union
+
+import instrumentation
+from model_registry import get_spacy_model
+
+if TYPE_CHECKING:
+    from spacy.tokens import Doc
+
+logger = logging.getLogger(__name__)
 
 class NLPProcessor:
     """
@@ -23,36 +36,208 @@ class NLPProcessor:
     
     Cette classe fournit des méthodes pour l'analyse morpho-syntaxique,
     la reconnaissance d'entités nommées et l'analyse des dépendances syntaxiques.
+    
+    Chaque analyse déclare les composants spaCy dont elle a besoin
+    (ANALYSIS_COMPONENTS) : les autres composants sont désactivés
+    automatiquement lors de l'analyse.
     """
     
-    def __init__(self, model_name="fr_core_news_sm"):
-        print(f"[NLPProcessor] Chargement du modèle spaCy '{model_name}'...")
+    # Composants spaCy nécessaires à chaque analyse. Les composants partagés
+    # (tok2vec) sont ajoutés automatiquement quand un composant requis les écoute.
+    ANALYSIS_COMPONENTS = {
+        'pos': ('tagger', 'morphologizer', 'attribute_ruler', 'lemmatizer'),
+        'syntax': ('parser', 'senter', 'sentencizer'),
+        'entities': ('ner', 'entity_ruler'),
+    }
+    
+    # Annotations (Doc.has_annotation) produites par chaque analyse : un Doc
+    # reçu par parse() sans ces annotations est réanalysé
+    ANALYSIS_ANNOTATIONS = {
+        'pos': ('POS',),
+        'syntax': ('DEP',),
+        'entities': ('ENT_IOB',),
+    }
+    
+    # Composants capables de produire chaque annotation : une annotation
+    # qu'aucun composant du pipeline ne produit n'est pas attendue sur le Doc
+    ANNOTATION_COMPONENTS = {
+        'POS': ('morphologizer', 'attribute_ruler'),
+        'DEP': ('parser',),
+        'ENT_IOB': ('ner', 'entity_ruler'),
+    }
+    
+    def __init__(self, model_name="fr_core_news_sm", analyses: Optional[Sequence[str]] = None,
+                 exclude: Sequence[str] = (), lazy: bool = False):
         """
         Initialise le processeur NLP.
         
         Args:
             model_name (str): Nom du modèle spaCy à charger
+            analyses (list of str): Analyses utilisées par cette instance
+                ('pos', 'syntax', 'entities'). Les composants inutiles ne sont
+                pas chargés, ce qui réduit la latence et la mémoire.
+                None charge le pipeline complet.
+            exclude (list of str): Composants supplémentaires à ne pas charger
+            lazy (bool): Différer l'import de spaCy et le chargement du modèle
+                jusqu'à la première analyse
+        
+        Le pipeline est obtenu via model_registry : plusieurs instances
+        utilisant le même modèle partagent un seul pipeline chargé.
         """
+        self.model_name = model_name
+        self._exclude = set(exclude)
+        if analyses is not None:
+            self._exclude.update(self._unused_components(analyses))
+        self._disabled_cache = {}
+        self._nlp = None
+        if not lazy:
+            self._load_model()
+    
+    @property
+    def nlp(self):
+        """Pipeline spaCy, chargé à la première utilisation si lazy=True."""
+        if self._nlp is None:
+            self._load_model()
+        return self._nlp
+    
+    def _load_model(self):
+        """Charge le pipeline spaCy via model_registry."""
+        logger.info("[NLPProcessor] Chargement du modèle spaCy '%s'...", self.model_name)
         try:
-            self.nlp = spacy.load(model_name)
-            print(f"✅ Modèle spaCy '{model_name}' chargé avec succès")
+            self._nlp = get_spacy_model(self.model_name, self._exclude)
+            logger.info("✅ Modèle spaCy '%s' chargé avec succès", self.model_name)
         except OSError:
-            print(f"❌ Erreur: Le modèle '{model_name}' n'est pas installé")
-            print("💡 Installez-le avec: python -m spacy download fr_core_news_sm")
+            logger.error("❌ Erreur: Le modèle '%s' n'est pas installé", self.model_name)
+            logger.error("💡 Installez-le avec: python -m spacy download %s", self.model_name)
             raise
     
-    def analyze_pos(self, text: str) -> Dict[str, Any]:
-        print(f"[NLPProcessor] Analyse POS pour: '{text}'")
+    @classmethod
+    def _unused_components(cls, analyses: Iterable[str]) -> List[str]:
+        """
+        Liste les composants connus qui ne servent à aucune des analyses.
+        
+        Args:
+            analyses (iterable of str): Analyses utilisées
+            
+        Returns:
+            list: Noms des composants à exclure au chargement
+        """
+        wanted = set()
+        for analysis in analyses:
+            wanted.update(cls.ANALYSIS_COMPONENTS[analysis])
+        known = set()
+        for components in cls.ANALYSIS_COMPONENTS.values():
+            known.update(components)
+        return sorted(known - wanted)
+    
+    def _disabled_components(self, analyses: Iterable[str]) -> List[str]:
+        """
+        Calcule les composants du pipeline à désactiver pour des analyses.
+        
+        Args:
+            analyses (iterable of str): Analyses demandées
+            
+        Returns:
+            list: Noms des composants à désactiver
+        """
+        key = frozenset(analyses)
+        disabled = self._disabled_cache.get(key)
+        if disabled is None:
+            wanted = set()
+            for analysis in key:
+                wanted.update(self.ANALYSIS_COMPONENTS[analysis])
+            # Garder les composants partagés (tok2vec) écoutés par un composant requis
+            for name, component in self.nlp.pipeline:
+                listeners = getattr(component, 'listening_components', None)
+                if listeners and wanted.intersection(listeners):
+                    wanted.add(name)
+            disabled = [name for name in self.nlp.pipe_names if name not in wanted]
+            self._disabled_cache[key] = disabled
+        return disabled
+    
+    def parse(self, text: Union[str, Doc], analyses: Optional[Iterable[str]] = None) -> Doc:
+        """
+        Analyse le texte avec le pipeline spaCy une seule fois.
+        
+        Le Doc retourné peut être passé directement à analyze_pos,
+        extract_entities, analyze_dependencies ou full_analysis pour
+        éviter de relancer le pipeline.
+        
+        Args:
+            text (str | Doc): Le texte à analyser, ou un Doc déjà analysé.
+                Un Doc est retourné tel quel s'il porte les annotations des
+                analyses demandées, sinon son texte est réanalysé.
+            analyses (iterable of str): Analyses prévues sur le Doc. Seuls
+                les composants nécessaires sont exécutés. None exécute
+                tout le pipeline.
+            
+        Returns:
+            Doc: Document spaCy
+        """
+        if not isinstance(text, str):
+            missing = self._missing_annotations(text, analyses)
+            if not missing:
+                return text
+            logger.debug("[NLPProcessor] Doc sans annotations %s, nouvelle analyse", missing)
+            text = text.text
+        instrumentation.count('nlp.docs')
+        with instrumentation.span('nlp.parse'):
+            if analyses is None:
+                return self.nlp(text)
+            return self.nlp(text, disable=self._disabled_components(analyses))
+    
+    def _missing_annotations(self, doc: Doc, analyses: Optional[Iterable[str]]) -> List[str]:
+        """
+        Liste les annotations nécessaires aux analyses absentes d'un Doc.
+        
+        Un Doc vide, ou une annotation qu'aucun composant du pipeline ne
+        produit, ne provoque pas de nouvelle analyse : elle ne l'ajouterait pas.
+        
+        Args:
+            doc (Doc): Document spaCy reçu
+            analyses (iterable of str): Analyses demandées (None : toutes)
+            
+        Returns:
+            list: Annotations manquantes (ex. ['DEP'])
+        """
+        if len(doc) == 0:
+            return []
+        if analyses is None:
+            analyses = self.ANALYSIS_ANNOTATIONS
+        missing = []
+        for analysis in analyses:
+            for annotation in self.ANALYSIS_ANNOTATIONS[analysis]:
+                if not doc.has_annotation(annotation) and annotation not in missing:
+                    missing.append(annotation)
+        if missing:
+            pipe_names = set(self.nlp.pipe_names)
+            missing = [annotation for annotation in missing
+                       if pipe_names.intersection(self.ANNOTATION_COMPONENTS[annotation])]
+        return missing
+    
+    def analyze_pos(self, text: Union[str, Doc], with_syntax: bool = True,
+                    with_entities: bool = True) -> Dict[str, Any]:
         """
         Analyse les parties du discours et retourne les entités nommées.
         
         Args:
-            text (str): Le texte à analyser
+            text (str | Doc): Le texte à analyser, ou un Doc déjà analysé
+            with_syntax (bool): Exécuter aussi le parser (dépendances et
+                nombre de phrases)
+            with_entities (bool): Exécuter aussi la reconnaissance d'entités.
+                Avec with_syntax=False, l'analyse se limite au tagger et au
+                lemmatiseur, suffisant pour la classification d'intentions.
             
         Returns:
             dict: Dictionnaire contenant l'analyse POS et les entités
         """
-        doc = self.nlp(text)
+        logger.debug("[NLPProcessor] Analyse POS pour: '%s'", text)
+        analyses = ['pos']
+        if with_syntax:
+            analyses.append('syntax')
+        if with_entities:
+            analyses.append('entities')
+        doc = self.parse(text, analyses)
         
         # Analyse des parties du discours
         pos_analysis = []
@@ -84,22 +269,22 @@ class NLPProcessor:
             'entities': entities,
             'doc_info': {
                 'length': len(doc),
-                'sentences': len(list(doc.sents))
+                'sentences': len(list(doc.sents)) if doc.has_annotation("SENT_START") else None
             }
         }
     
-    def extract_entities(self, text: str) -> Dict[str, List[Dict]]:
-        print(f"[NLPProcessor] Extraction des entités pour: '{text}'")
+    def extract_entities(self, text: Union[str, Doc]) -> Dict[str, List[Dict]]:
         """
         Extraire personnes, lieux, organisations, etc.
         
         Args:
-            text (str): Le texte à analyser
+            text (str | Doc): Le texte à analyser, ou un Doc déjà analysé
             
         Returns:
             dict: Dictionnaire des entités par catégorie
         """
-        doc = self.nlp(text)
+        logger.debug("[NLPProcessor] Extraction des entités pour: '%s'", text)
+        doc = self.parse(text, ('entities',))
         
         entities_by_type = {
             'PERSON': [],      # Personnes
@@ -128,18 +313,18 @@ class NLPProcessor:
         # Supprimer les catégories vides
         return {k: v for k, v in entities_by_type.items() if v}
     
-    def analyze_dependencies(self, text: str) -> Dict[str, Any]:
-        print(f"[NLPProcessor] Analyse des dépendances pour: '{text}'")
+    def analyze_dependencies(self, text: Union[str, Doc]) -> Dict[str, Any]:
         """
         Analyser la structure syntaxique.
         
         Args:
-            text (str): Le texte à analyser
+            text (str | Doc): Le texte à analyser, ou un Doc déjà analysé
             
         Returns:
             dict: Dictionnaire contenant l'analyse des dépendances
         """
-        doc = self.nlp(text)
+        logger.debug("[NLPProcessor] Analyse des dépendances pour: '%s'", text)
+        doc = self.parse(text, ('pos', 'syntax'))
         
         dependencies = []
         for token in doc:
@@ -207,26 +392,32 @@ class NLPProcessor:
             'children': [self._get_subtree(child) for child in token.children]
         }
     
-    def full_analysis(self, text: str, verbose: bool = True) -> Dict[str, Any]:
-        print(f"[NLPProcessor] Analyse complète pour: '{text}'")
+    def full_analysis(self, text: Union[str, Doc], verbose: bool = True) -> Dict[str, Any]:
         """
         Analyse complète d'un texte.
         
+        Le pipeline spaCy n'est exécuté qu'une seule fois : les trois
+        analyses lisent le même Doc.
+        
         Args:
-            text (str): Le texte à analyser
+            text (str | Doc): Le texte à analyser, ou un Doc déjà analysé
             verbose (bool): Afficher les détails
             
         Returns:
             dict: Analyse complète
         """
+        logger.debug("[NLPProcessor] Analyse complète pour: '%s'", text)
+        doc = self.parse(text)
+        text = doc.text
+        
         if verbose:
             print(f"\n📝 Analyse du texte: '{text}'")
             print("=" * 60)
         
-        # Analyses
-        pos_result = self.analyze_pos(text)
-        entities_result = self.extract_entities(text)
-        dependencies_result = self.analyze_dependencies(text)
+        # Analyses (sur le même Doc)
+        pos_result = self.analyze_pos(doc)
+        entities_result = self.extract_entities(doc)
+        dependencies_result = self.analyze_dependencies(doc)
         
         if verbose:
             self._print_analysis_results(pos_result, entities_result, dependencies_result)
@@ -238,6 +429,27 @@ class NLPProcessor:
             'dependencies': dependencies_result
         }
     
+    def analyze_many(self, texts: Iterable[str], batch_size: int = 64,
+                     n_process: int = 1) -> Iterator[Dict[str, Any]]:
+        """
+        Analyse complète d'un flux de textes via nlp.pipe.
+        
+        Les résultats sont produits au fur et à mesure, dans l'ordre
+        d'entrée, sans construire la liste complète en mémoire.
+        
+        Args:
+            texts (iterable of str): Les textes à analyser
+            batch_size (int): Nombre de textes par lot envoyé à spaCy
+            n_process (int): Nombre de processus utilisés par spaCy
+            
+        Yields:
+            dict: Analyse complète (même format que full_analysis)
+        """
+        docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+        for doc in docs:
+            instrumentation.count('nlp.docs')
+            yield self.full_analysis(doc, verbose=False)
+    
     def _print_analysis_results(self, pos_result, entities_result, dependencies_result):
         """Affiche les résultats d'analyse de manière formatée."""
         
@@ -274,6 +486,7 @@ class NLPProcessor:
 
 # Tests et exemples d'utilisation
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("🧠 Module NLP Processor - Analyse linguistique avec spaCy")
     print("=" * 70)
     
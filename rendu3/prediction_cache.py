@@ -0,0 +1,133 @@
+"""
+prediction_cache
+================
+
+Cache LRU avec expiration (TTL) pour les prédictions du chatbot.
+
+Ce module fournit la classe PredictionCache, utilisée par
+IntentClassifier.enable_cache : les messages fréquents ("bonjour",
+"merci au revoir", "le menu") ne repassent pas par TF-IDF et le
+classificateur. Le cache est protégé par un verrou et expose ses
+statistiques (taux de succès, évictions, expirations).
+
+Dépendances :
+- collections
+- threading
+
+Exemple d'utilisation :
+    >>> cache = PredictionCache(maxsize=1024, ttl=300)
+    >>> cache.put("bonjour", "salutation")
+    >>> cache.get("bonjour")
+    'salutation'
+    >>> cache.stats()['hit_ratio']
+    1.0
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+# Valeur sentinelle retournée par get() en cas d'absence
+MISSING = object()
+
+
+class PredictionCache:
+    """
+    Cache LRU borné avec durée de vie optionnelle des entrées.
+
+    Attributs:
+        maxsize (int): Nombre maximal d'entrées.
+        ttl (float): Durée de vie d'une entrée en secondes (None : illimitée).
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, clock=time.monotonic):
+        """
+        Initialise le cache.
+
+        Args:
+            maxsize (int): Nombre maximal d'entrées
+            ttl (float): Durée de vie d'une entrée en secondes (None : illimitée)
+            clock (callable): Horloge utilisée pour le TTL
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize doit être strictement positif")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key, default=MISSING):
+        """
+        Retourne la valeur associée à une clé et la marque comme récente.
+
+        Args:
+            key: Clé recherchée
+            default: Valeur retournée si la clé est absente ou expirée
+
+        Returns:
+            La valeur en cache, ou `default`
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """
+        Ajoute ou remplace une entrée, en évinçant la plus ancienne si nécessaire.
+
+        Args:
+            key: Clé de l'entrée
+            value: Valeur à mettre en cache
+        """
+        expires_at = None if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Vide le cache (par exemple après un réentraînement du modèle)."""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """
+        Retourne les statistiques du cache.
+
+        Returns:
+            dict: hits, misses, hit_ratio, size, maxsize, evictions,
+                expirations, invalidations
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
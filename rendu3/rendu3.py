@@ -6,78 +6,199 @@ Script principal pour l'orchestration du pipeline de classification d'intentions
 
 Ce script charge le dataset YAML, initialise les modules de prétraitement, classification, NLP et évaluation, et exécute les tests principaux.
 
+Les données d'entraînement sont lues depuis dataset.r3ds, version compilée
+et memory-mappée de dataset.yaml (voir dataset_store) : le YAML reste la
+source éditable et n'est recompilé que lorsqu'il change.
+
+Le classificateur entraîné est sauvegardé dans models/ : au démarrage suivant,
+il est rechargé au lieu d'être réentraîné tant que le dataset et la
+configuration n'ont pas changé.
+
+Les modules lourds (nltk, spaCy, évaluateur et model_selection de
+scikit-learn, yaml) sont importés à la demande : un processus qui ne fait
+que classer des messages ne charge ni spaCy ni NLTK. Les classes restent
+accessibles comme attributs du module (rendu3.NLPProcessor, …) via
+__getattr__. benchmarks/import_time.py vérifie le budget de démarrage.
+
 Dépendances :
 - yaml
+- dataset_store
 - intent_classifier
 - TextPreprocessor
 - nlp_processor
 - IntentClassifierEvaluator
+- instrumentation
 
 Exemple d'utilisation :
     $ python rendu3.py
 """
 
-from TextPreprocessor import TextPreprocessor
-from nlp_processor import NLPProcessor
-from intent_classifier import IntentClassifier
-from IntentClassifierEvaluator import IntentClassifierEvaluator
-import yaml
+import importlib
+import instrumentation
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+MODEL_PATH = os.path.join('models', 'intent_classifier.joblib')
+
+# Attributs importés à la première utilisation : nom -> module
+_LAZY_ATTRIBUTES = {
+    'TextPreprocessor': 'TextPreprocessor',
+    'NLPProcessor': 'nlp_processor',
+    'IntentClassifier': 'intent_classifier',
+    'dataset_fingerprint': 'intent_classifier',
+    'IntentClassifierEvaluator': 'IntentClassifierEvaluator',
+}
 
-def readFile():
-    with open('dataset.yaml', 'r', encoding='utf-8') as file:
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+def readFile(path='dataset.yaml'):
+    import yaml
+    with open(path, 'r', encoding='utf-8') as file:
         try:
             data = yaml.safe_load(file)
-            print("📂 Contenu du fichier YAML:")
-            print(yaml.dump(data, default_flow_style=False, allow_unicode=True))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📂 Contenu du fichier YAML:\n%s", yaml.dump(data, default_flow_style=False, allow_unicode=True))
             return data
         except yaml.YAMLError as e:
-            print(f"Erreur lors de la lecture du fichier YAML: {e}")
+            logger.error("Erreur lors de la lecture du fichier YAML: %s", e)
             return None
 
-def classify_intent_with_preprocessing(message, preprocessor, classifier):
+def dataset_to_training_data(dataset):
+    """
+    Convertit le contenu du dataset YAML en listes d'entraînement.
+    Args:
+        dataset (dict): Contenu du fichier YAML.
+    Returns:
+        tuple: (textes, labels)
+    """
+    texts = []
+    labels = []
+    if dataset and 'intentions' in dataset:
+        for intention, examples in dataset['intentions'].items():
+            for example in examples:
+                texts.append(example)
+                labels.append(intention)
+    return texts, labels
+
+def load_training_data(path='dataset.yaml', compiled=None):
+    """
+    Charge les données d'entraînement depuis la version compilée du dataset.
+    Le fichier compilé est (re)créé si la source YAML a changé ; si le YAML
+    est absent, le fichier compilé est utilisé tel quel.
+    Args:
+        path (str): Dataset YAML source.
+        compiled (str): Fichier compilé (défaut : même nom, extension .r3ds).
+    Returns:
+        tuple: (textes, labels)
+    """
+    from dataset_store import CompiledDataset, DatasetFormatError, compile_dataset, compiled_path
+    compiled = compiled or compiled_path(path)
+    dataset = None
+    try:
+        dataset = CompiledDataset(compiled)
+        if os.path.exists(path) and dataset.is_stale(path):
+            dataset.close()
+            dataset = None
+    except (FileNotFoundError, DatasetFormatError):
+        pass
+    if dataset is None:
+        logger.info("Compilation du dataset '%s' vers '%s'...", path, compiled)
+        try:
+            compile_dataset(path, compiled)
+        except PermissionError as e:
+            logger.warning("Dataset compilé non enregistré (%s), lecture du YAML", e)
+            return dataset_to_training_data(readFile(path))
+        dataset = CompiledDataset(compiled)
+    with dataset:
+        return dataset.texts(), dataset.labels()
+
+def load_or_train(texts, labels, model_path=MODEL_PATH):
+    """
+    Charge le modèle sauvegardé s'il correspond au dataset et à la
+    configuration courante, sinon entraîne un nouveau modèle et le sauvegarde.
+    Args:
+        texts (list of str): Phrases d'entraînement.
+        labels (list of str): Intentions correspondantes.
+        model_path (str): Chemin du fichier de modèle.
+    Returns:
+        IntentClassifier: Classificateur prêt à prédire.
+    """
+    from intent_classifier import IntentClassifier, dataset_fingerprint
+    classifier = IntentClassifier()
+    try:
+        return IntentClassifier.load(model_path,
+                                     dataset_hash=dataset_fingerprint(texts, labels),
+                                     config_hash=classifier.config_hash())
+    except (FileNotFoundError, ValueError) as e:
+        logger.info("Modèle sauvegardé indisponible (%s), entraînement...", e)
+    classifier.train(texts, labels)
+    classifier.save(model_path)
+    return classifier
+
+def classify_intent_with_preprocessing(message, preprocessor, classifier, fast_path=None):
     """
     Applique le préprocessing puis la classification d'intention.
     Args:
         message (str): Le message utilisateur à analyser.
         preprocessor (TextPreprocessor): Instance du préprocesseur.
         classifier (IntentClassifier): Instance du classificateur.
+        fast_path: Moteur de règles optionnel (ex. KeywordEngine de rendu2),
+            consulté avant le modèle : tout objet dont match(message) retourne
+            une intention ou None. Une intention connue du classificateur est
+            retournée directement, avec une probabilité de 1.
     Returns:
         tuple: (intention prédite, probabilités)
     """
-    processed_message = preprocessor.normalize_text(message)
-    intent = classifier.predict(processed_message)
-    confidence = classifier.predict_proba(processed_message)
+    with instrumentation.request('classify_intent'):
+        if fast_path is not None:
+            with instrumentation.span('classify_intent.fast_path'):
+                matched = fast_path.match(message)
+            if matched is not None and matched in classifier.classes_:
+                instrumentation.count('classify_intent.fast_path_hits')
+                confidence = (classifier.classes_ == matched).astype(float)[None, :]
+                return classifier.classes_[confidence.argmax(axis=1)], confidence
+        with instrumentation.span('classify_intent.preprocess'):
+            processed_message = preprocessor.normalize_text(message)
+        # Probabilités mises en cache si enable_cache est actif. L'intention en est
+        # déduite seulement si elle coïncide toujours avec predict() (pas avec 'svc')
+        with instrumentation.span('classify_intent.classify'):
+            confidence = classifier.predict_proba(processed_message)
+            if classifier.predicts_proba_argmax:
+                intent = classifier.classes_[confidence.argmax(axis=1)]
+            else:
+                intent = classifier.predict(processed_message)
     return intent, confidence
 
 # Tests et exemples d'utilisation
 if __name__ == "__main__":
-    # Charger et afficher le dataset
-    dataset = readFile()
-    print("✅ Fichier YAML lu avec succès!")
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # Charger le dataset (version compilée de dataset.yaml)
+    texts, labels = load_training_data()
+    print("✅ Dataset chargé avec succès!")
     
     print("\n🤖 Classe IntentClassifier - Module de Classification d'Intentions")
     print("=" * 60)
-    classifier = IntentClassifier()
     
     print("📦 Préparation des données d'entraînement...")
-    # for intent_data in dataset:
-    #     intent = intent_data['intent']
-    #     examples = intent_data['examples']
-    #     classifier.train(intent, examples)
-    
-    # Préparer les données d'entraînement à partir du dataset YAML
-    texts = []
-    labels = []
-    if dataset and 'intentions' in dataset:
-        for intention, examples in dataset['intentions'].items():
-            for example in examples:
-                texts.append(example)
-                labels.append(intention)
 
     if len(texts) > 0:
+        # Charger le modèle sauvegardé (ou l'entraîner au premier lancement)
+        classifier = load_or_train(texts, labels)
+        from IntentClassifierEvaluator import IntentClassifierEvaluator
         # Utilisation de la classe d'évaluation
         evaluator = IntentClassifierEvaluator(classifier, texts, labels)
         evaluator.evaluate()
-        evaluator.test_obligatoires()
+        evaluator.test_obligatoires(retrain=False)
     else:
         print("❌ Aucune donnée d'entraînement trouvée dans le dataset!")
\ No newline at end of file
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Les modules de rendu3 sont importés à plat (comme depuis rendu3/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
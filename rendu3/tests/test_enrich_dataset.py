@@ -0,0 +1,13 @@
+from enrich_dataset import TemplateSpace
+
+
+def test_template_ending_with_slot_renders_every_slot():
+    pools = {'first_name': ['Ana', 'Bruno'], 'qty': ['1', '2'], 'plat': ['regina'], 'time': ['12:00', '19:30']}
+    space = TemplateSpace(["Bonjour {first_name}", "Commande de {qty} {plat} à {time}"], [""], pools)
+
+    phrases = [space[i] for i in range(len(space))]
+
+    assert phrases[:2] == ["Bonjour Ana", "Bonjour Bruno"]
+    for phrase in phrases[2:]:
+        assert any(phrase.endswith(f"à {time}") for time in pools['time'])
+    assert len(set(phrases)) == len(space)
@@ -0,0 +1,13 @@
+import instrumentation
+
+
+def test_request_survives_disable_and_reset_while_profiled():
+    instrumentation.enable(profile_slowest=2)
+    try:
+        request = instrumentation.request('classify_intent')
+        with request:
+            instrumentation.disable()
+            instrumentation.reset()
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
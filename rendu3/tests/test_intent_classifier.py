@@ -0,0 +1,56 @@
+import pytest
+
+from intent_classifier import IntentClassifier
+
+TEXTS = ["bonjour", "salut", "je veux une pizza", "commander une pizza",
+         "vos horaires", "vous ouvrez quand", "le menu", "la carte"] * 3
+LABELS = ["salutation", "salutation", "commande", "commande",
+          "horaires", "horaires", "menu", "menu"] * 3
+
+
+@pytest.fixture(scope='module')
+def classifier():
+    classifier = IntentClassifier(backend='svc')
+    classifier.train(TEXTS, LABELS)
+    return classifier
+
+
+def test_classify_batch_intent_matches_predict(classifier):
+    messages = ["bonjour pizza", "la carte svp", "ouvert dimanche"]
+
+    results = classifier.classify_batch(messages, top_k=2)
+
+    assert [result['intent'] for result in results] == list(classifier.predict_batch(messages))
+    assert all(len(result['top_k']) == 2 for result in results)
+
+
+@pytest.mark.parametrize('top_k', [0, -1])
+def test_classify_batch_rejects_top_k_below_one(classifier, top_k):
+    with pytest.raises(ValueError):
+        classifier.classify_batch(["bonjour"], top_k=top_k)
+
+
+def test_cached_classify_batch_returns_independent_results(classifier):
+    classifier.enable_cache()
+    try:
+        first = classifier.classify_batch(["Bonjour !"])
+        first[0]['top_k'].append(('modifié', 1.0))
+        second = classifier.classify_batch(["bonjour"])
+    finally:
+        classifier.disable_cache()
+
+    assert ('modifié', 1.0) not in second[0]['top_k']
+
+
+def test_cache_predicts_on_the_received_text(classifier):
+    messages = ["Je veux une PIZZA !", "Vos horaires ?"]
+    expected_proba = classifier.predict_proba_batch(messages)
+    expected = classifier.classify_batch(messages)
+
+    classifier.enable_cache()
+    try:
+        assert (classifier.predict_proba_batch(messages) == expected_proba).all()
+        assert (classifier.predict_proba(messages[0]) == expected_proba[:1]).all()
+        assert classifier.classify_batch(messages) == expected
+    finally:
+        classifier.disable_cache()
@@ -0,0 +1,20 @@
+import gc
+
+import model_registry
+from nlp_processor import NLPProcessor
+
+
+def test_preload_warms_the_pipelines_used_by_analyses(monkeypatch):
+    loaded = []
+    monkeypatch.setattr(model_registry, 'get_spacy_model',
+                        lambda name, exclude=(): loaded.append((name, tuple(exclude))))
+
+    model_registry.preload(['fr_core_news_sm', ('fr_core_news_md', ['ner'])],
+                           analyses=[['pos'], ['pos', 'syntax', 'entities']])
+    gc.unfreeze()
+
+    assert loaded == [
+        ('fr_core_news_sm', tuple(NLPProcessor._unused_components(['pos']))),
+        ('fr_core_news_sm', ()),
+        ('fr_core_news_md', ('ner',)),
+    ]
@@ -0,0 +1,31 @@
+import spacy
+
+from nlp_processor import NLPProcessor
+
+
+def make_processor(nlp):
+    processor = NLPProcessor(lazy=True)
+    processor._nlp = nlp
+    return processor
+
+
+def test_parse_keeps_doc_when_pipeline_cannot_add_annotations():
+    nlp = spacy.blank('fr')
+    nlp.add_pipe('sentencizer')
+    processor = make_processor(nlp)
+    doc = processor.parse("Je voudrais une pizza")
+
+    assert processor.parse(doc) is doc
+    assert processor.parse(doc, analyses=['syntax']) is doc
+
+
+def test_parse_reparses_doc_missing_producible_annotation():
+    nlp = spacy.blank('fr')
+    processor = make_processor(nlp)
+    doc = nlp("Je voudrais une pizza à Paris")
+    nlp.add_pipe('entity_ruler').add_patterns([{'label': 'LOC', 'pattern': 'Paris'}])
+
+    parsed = processor.parse(doc, analyses=['entities'])
+
+    assert parsed is not doc
+    assert [ent.text for ent in parsed.ents] == ['Paris']
@@ -0,0 +1,126 @@
+"""
+text_normalizer
+===============
+
+Normalisation rapide de texte pour chatbot français.
+
+Ce module fournit la classe TextNormalizer, utilisée par
+TextPreprocessor.normalize_text. La table de traduction est construite
+une seule fois et mise en cache : chaque caractère n'est classé
+(ponctuation, espace, accent) qu'à sa première apparition, puis
+str.translate applique la table en C.
+
+Règles appliquées :
+- conversion en minuscules ;
+- suppression de la ponctuation ASCII et Unicode (guillemets « », apostrophe ’, …) ;
+- remplacement de tous les espaces Unicode (espace insécable, …) par un espace ;
+- suppression des espaces multiples et en début/fin de texte ;
+- (optionnel) suppression des accents.
+
+Dépendances :
+- unicodedata
+- string
+
+Exemple d'utilisation :
+    >>> normalizer = TextNormalizer()
+    >>> normalizer.normalize("« Bonjour »,\\u00a0je voudrais l’addition !")
+    'bonjour je voudrais laddition'
+"""
+
+import string
+import unicodedata
+
+# Séparateur utilisé par normalize_many : ni ponctuation, ni espace,
+# il survit à la traduction et permet de normaliser un lot en un seul appel.
+_BATCH_SEPARATOR = '\x00'
+
+
+class _TranslationTable(dict):
+    """
+    Table de traduction pour str.translate, remplie à la demande.
+
+    Les points de code inconnus sont classés une seule fois (__missing__),
+    les appels suivants se résument à une recherche dans le dictionnaire.
+    """
+
+    def __init__(self, fold_accents=False):
+        super().__init__()
+        self.fold_accents = fold_accents
+
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        category = unicodedata.category(char)
+        if category.startswith('P') or char in string.punctuation:
+            value = None
+        elif char.isspace():
+            value = ' '
+        elif self.fold_accents and category == 'Mn':
+            value = None
+        else:
+            value = codepoint
+        self[codepoint] = value
+        return value
+
+
+class TextNormalizer:
+    """
+    Normaliseur de texte précompilé.
+
+    Attributs:
+        fold_accents (bool): Supprimer les accents (é → e, ç → c).
+    """
+
+    # Tables partagées entre toutes les instances (une par mode)
+    _tables = {
+        False: _TranslationTable(fold_accents=False),
+        True: _TranslationTable(fold_accents=True),
+    }
+
+    def __init__(self, fold_accents=False):
+        """
+        Initialise le normaliseur.
+
+        Args:
+            fold_accents (bool): Supprimer les accents
+        """
+        self.fold_accents = fold_accents
+        self._table = self._tables[fold_accents]
+
+    def normalize(self, text):
+        """
+        Normalise un texte.
+
+        Args:
+            text (str): Le texte à normaliser
+
+        Returns:
+            str: Le texte normalisé
+        """
+        text = text.lower()
+        if self.fold_accents:
+            text = unicodedata.normalize('NFD', text)
+        return ' '.join(text.translate(self._table).split())
+
+    def normalize_many(self, texts):
+        """
+        Normalise une liste de textes.
+
+        Les textes sont concaténés pour n'appeler lower, normalize et
+        translate qu'une seule fois sur l'ensemble du lot.
+
+        Args:
+            texts (list of str): Les textes à normaliser
+
+        Returns:
+            list of str: Les textes normalisés, dans le même ordre
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        if any(_BATCH_SEPARATOR in text for text in texts):
+            return [self.normalize(text) for text in texts]
+        blob = _BATCH_SEPARATOR.join(texts).lower()
+        if self.fold_accents:
+            blob = unicodedata.normalize('NFD', blob)
+        blob = blob.translate(self._table)
+        return [' '.join(part.split()) for part in blob.split(_BATCH_SEPARATOR)]